@@ -91,13 +91,19 @@ class Component(ComponentTemplate):
 		for item in self.items:
 			item._display_outline = False
 
-	def set_csv_content(self, row: dict):
+	def set_csv_content(self, row: dict, plan=None):
 		"""
-		Apply CSV row values
+		Apply CSV row values. `plan` is a list of (item index, field) pairs from
+		BindingMap; without one every item is matched by name.
 		"""
 		if row:
-			for item in self.items:
-				content = row.get(item.name)
-				if content is not None:
-				    item.content = conten         
+			if plan is None:
+				plan = [(i, item.name) for i, item in enumerate(self.items)]
+			items = self.items
+			for i, name in plan:
+				content = row.get(name)
+				item = items[i]
+				# Unchanged values are skipped so their cached renders survive.
+				if content is not None and content != item.content:
+					item.content = content
 		return self
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Tuple, Any, TYPE_CHECKING
 import uuid
 
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QStyle
-from PySide6.QtCore import Qt, QRectF, QPointF, QSizeF, Signal
+from PySide6.QtCore import Qt, QRectF, QPointF, QSizeF, Signal, QTimer
 from PySide6.QtGui import QPainter, QPixmap, QColor, QImage, QPen, QBrush, QTransform, QPainterPath
 
 from prototypyside.config import DISPLAY_MODE_FLAGS
@@ -49,10 +49,14 @@ class LayoutSlot(QGraphicsObject):
         self._ldpi = registry.settings.ldpi
 
         self._content = None  # Component clone / instance assigned into this slot
+        # Serialized content kept as-is until the slot is painted, selected or exported
+        self._pending_content: Optional[Dict[str, Any]] = None
+        self._hydration_scheduled = False
 
         # Visual & state flags
         self._display_mode = DISPLAY_MODE_FLAGS.get("stretch").get("aspect")
         self._hovered = False
+        self._drop_target = False   # a component drag is over this slot
         self._rotation = 0
 
         # Cache for GUI raster
@@ -100,6 +104,8 @@ class LayoutSlot(QGraphicsObject):
         self.invalidate_cache()
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
+        if change == QGraphicsItem.ItemSelectedHasChanged and value:
+            self.hydrate()
         if change == QGraphicsItem.ItemPositionChange and value != self.pos():
             signals_blocked = self.signalsBlocked()
             self.blockSignals(True)
@@ -120,6 +126,16 @@ class LayoutSlot(QGraphicsObject):
     def registry(self):
         return self._registry
 
+    @property
+    def drop_target(self) -> bool:
+        return self._drop_target
+
+    @drop_target.setter
+    def drop_target(self, value: bool):
+        if bool(value) != self._drop_target:
+            self._drop_target = bool(value)
+            self.update()
+
     @property
     def ctx(self) -> RenderContext:
         return self._ctx
@@ -139,12 +155,16 @@ class LayoutSlot(QGraphicsObject):
     def geometry(self, new_geom: UnitStrGeometry):
         if self._geometry == new_geom:
             return
-        self.prepareGeometryChange()
+        # A pure move keeps the cached raster; only a new size re-renders it.
+        resized = self._geometry.size_tuple("in") != new_geom.size_tuple("in")
+        if resized:
+            self.prepareGeometryChange()
         self._geometry = new_geom
         super().setPos(self._geometry.to(self.ctx.unit, dpi=self.ctx.dpi).pos)
-        self._sync_child_geometry()
-        self.invalidate_cache()
-        self.update()
+        if resized:
+            self._sync_child_geometry()
+            self.invalidate_cache()
+            self.update()
 
     @property
     def row(self): return self._row
@@ -189,10 +209,13 @@ class LayoutSlot(QGraphicsObject):
     # ---------------- content management ---------------- #
     @property
     def content(self):
+        if self._pending_content is not None:
+            self.hydrate()
         return self._content
 
     @content.setter
     def content(self, obj):
+        self._pending_content = None
         # Clear
         if obj is None:
             if self._content:
@@ -244,9 +267,66 @@ class LayoutSlot(QGraphicsObject):
         if self._content:
             self.registry.deregister(self._content.pid)
         self._content = None
+        self._pending_content = None
         self.invalidate_cache()
         self.update()
 
+    # ---------------- lazy hydration ---------------- #
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self._pending_content is None
+
+    @property
+    def has_content(self) -> bool:
+        """True if the slot holds content, hydrated or not. Never hydrates."""
+        return self._content is not None or self._pending_content is not None
+
+    @property
+    def pending_content(self) -> Optional[Dict[str, Any]]:
+        return self._pending_content
+
+    def set_pending_content(self, data: Optional[Dict[str, Any]]):
+        """
+        Keep the serialized component dict without building its object tree.
+        It is rehydrated through the registry on first paint, selection or export.
+        """
+        self._content = None
+        self._pending_content = data if isinstance(data, dict) else None
+        self.invalidate_cache()
+
+    def _deferred_hydrate(self):
+        self._hydration_scheduled = False
+        if not self.is_hydrated:
+            self.hydrate()
+            self.update()
+
+    def hydrate(self):
+        data = self._pending_content
+        if data is None:
+            return self._content
+        self._pending_content = None
+        self.content = self._registry.from_dict(data)
+        return self._content
+
+    def _peek_content(self, key: str):
+        if self._pending_content is not None:
+            return self._pending_content.get(key)
+        return getattr(self._content, key, None) if self._content else None
+
+    @property
+    def content_pid(self) -> Optional[str]:
+        return self._peek_content("pid")
+
+    @property
+    def content_tpid(self) -> Optional[str]:
+        return self._peek_content("tpid")
+
+    @property
+    def content_csv_path(self):
+        path = self._peek_content("csv_path")
+        return path if path not in ("None", "") else None
+
     # ---------------- caching ---------------- #
 
     def invalidate_cache(self):
@@ -254,7 +334,8 @@ class LayoutSlot(QGraphicsObject):
 
     @property
     def image(self) -> Optional[QImage]:
-        if self._cache_image is None and self._content:
+        if self._cache_image is None and self.has_content:
+            self.hydrate()
             self._cache_image = self._render_to_image()
         return self._cache_image
 
@@ -278,7 +359,7 @@ class LayoutSlot(QGraphicsObject):
         return self.registry.clone(self)
 
     def to_dict(self):
-        content_data = None
+        content_data = self._pending_content
         if self._content and hasattr(self._content, "to_dict"):
             content_data = self._content.to_dict()
             for item in content_data.get("items", []):
@@ -322,7 +403,7 @@ class LayoutSlot(QGraphicsObject):
             pen.setCosmetic(True)
             pen.setWidthF(1.0)
             painter.setPen(pen)
-            if self.isSelected():
+            if self.isSelected() or self._drop_target:
                 painter.setBrush(QColor(0, 195, 255, 70))
             elif option.state & QStyle.State_MouseOver:
                 painter.setBrush(QColor(0, 195, 255, 35))
@@ -331,7 +412,13 @@ class LayoutSlot(QGraphicsObject):
             painter.drawRect(r)
             painter.restore()
 
-        if not self._content:
+        if not self.has_content:
+            return
+        if not self.is_hydrated:
+            # Never build the component tree mid-paint; hydrate on the next event loop turn.
+            if not self._hydration_scheduled:
+                self._hydration_scheduled = True
+                QTimer.singleShot(0, self._deferred_hydrate)
             return
 
         # GUI/RASTER: parent draws a raster; child suppressed (ItemHasNoContents=True)
@@ -1,10 +1,11 @@
+from math import floor
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple, Any, Union, TYPE_CHECKING
 from enum import IntEnum
 
 from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QStyleOptionGraphicsItem
 from PySide6.QtCore import Qt, QRectF, QPointF, QSizeF, Signal
-from PySide6.QtGui import QPainter, QColor, QImage, QPen, QBrush
+from PySide6.QtGui import QPainter, QColor, QImage, QPen, QBrush, QTransform
 
 from prototypyside.models.layout_slot import LayoutSlot
 from prototypyside.utils.units.unit_str import UnitStr
@@ -12,11 +13,12 @@ from prototypyside.utils.units.unit_str_geometry import UnitStrGeometry
 from prototypyside.services.proto_class import ProtoClass
 from prototypyside.utils.units.unit_str_helpers import geometry_with_px_rect, geometry_with_px_pos
  
-from prototypyside.services.pagination.page_manager import PRINT_POLICIES
+from prototypyside.services.pagination.print_policy import PAGINATION_MODES, POLICIES, PRINT_POLICIES, grid_cells
 from prototypyside.models.component_template import ComponentTemplate
 from prototypyside.services.proto_registry import ProtoRegistry
 from prototypyside.utils.valid_path import ValidPath
 from prototypyside.utils.graphics_item_helpers import rotate_by
+from prototypyside.utils.spatial_index import SpatialIndex
 from prototypyside.utils.render_context import RenderContext, RenderMode, RenderRoute, TabMode
 
 
@@ -55,6 +57,12 @@ class LayoutTemplate(QGraphicsObject):
         self._name = name
         self._file_path = ValidPath.file(file_path, must_exist=True)
         self._items: list[LayoutSlot] = []
+        # Slot hit-testing (get_item_at_position): grid arithmetic or a spatial
+        # index, rebuilt lazily after the slots move; plus the inverse scene transform.
+        self._hit_grid: Optional[Tuple[float, ...]] = None
+        self._hit_index: Optional[SpatialIndex] = None
+        self._hit_xform: Optional[QTransform] = None
+        self._hit_inverse = QTransform()
         if self._file_path:
             self._name = self._file_path
             self._name = registry.validate_name(proto, name)
@@ -71,6 +79,16 @@ class LayoutTemplate(QGraphicsObject):
         self._orientation = pol.get("orientation", "portrait")
         self._is_landscape = False
         self._duplex_print = pol.get("duplex_print", False)
+        self._item_rotation = list(pol.get("item_rotation", []))
+        self._pagination_mode = pol.get("pagination_mode", "grid")
+        self._pack_rotation = True     # packed mode may turn items 90° to fit more
+        self._tile_overlap = pol.get("tile_overlap", UnitStr("0.25in", dpi=self._ctx.dpi))
+        self._back_pid = None          # ComponentTemplate printed behind every slot (duplex backs)
+        # Export-time marks (services/pagination/print_marks)
+        self._crop_marks = bool(pol.get("crop_marks", False))
+        self._cut_lines = False
+        self._registration_marks = False
+        self._flip_edge = pol.get("flip_edge", "long")
         self._whitespace = pol.get(
             "whitespace", [
                 UnitStr("0.25in", dpi=self._ctx.dpi),  # top
@@ -81,7 +99,10 @@ class LayoutTemplate(QGraphicsObject):
                 UnitStr("0.0in", dpi=self._ctx.dpi)    # spacing_y
             ]
         )
-        self.setGrid()
+        # Rehydrated layouts receive their serialized slots from the registry;
+        # building a default grid here would only be thrown away.
+        if not rehydrated:
+            self.setGrid()
 
         self._content = None
         self.first_pass = True
@@ -120,11 +141,13 @@ class LayoutTemplate(QGraphicsObject):
         self._ctx = new
         for slot in self.items:
             slot.ctx = new
-            comp = slot.content
+            # Unhydrated slots pick up the context when their component is built.
+            comp = slot.content if slot.is_hydrated else None
             if comp:
                 comp.ctx = new
                 for item in comp.items:
                     item.ctx = new
+        self.invalidate_hit_test()
         self.update()
 
     @property
@@ -133,32 +156,23 @@ class LayoutTemplate(QGraphicsObject):
     
     @polkey.setter
     def polkey(self, pol):
-        if pol == self._polkey or pol not in PRINT_POLICIES:
+        policy = POLICIES.get(pol)
+        if pol == self._polkey or policy is None:
             return
         self._polkey = pol
-        policy = PRINT_POLICIES[pol]
-
-        # Apply via property setters so signals fire consistently:
-        if "geometry" in policy and policy["geometry"] is not None:
-            self._geometry = policy["geometry"]
-        if "rows" in policy:
-            self._rows = int(policy["rows"])
-        if "columns" in policy:
-            self._columns = int(policy["columns"])
-        if "whitespace" in policy:
-            self._whitespace = policy["whitespace"]
-        if "orientation" in policy:
-            self.orientation = bool(policy["orientation"])
-        # if "duplex_print" in policy:
-        #     self._duplex_print = bool(policy["duplex_print"])
-        # if "page_size" in policy:
-        #     self._page_size = policy["page_size"]
-        # if "item_rotation" in policy:
-        #     self._item_rotation = list(policy["item_rotation"])
+        self.prepareGeometryChange()
+        self._geometry = policy.page_geometry()
+        self._whitespace = policy.whitespace_list()
+        regrid = (policy.rows, policy.columns) != (self._rows, self._columns)
+        self._rows = policy.rows
+        self._columns = policy.columns
+        self._pagination_mode = policy.pagination_mode
 
         self.policyChanged.emit()
-        # rows/columns may have changed; ensure grid dims up to date:
-        self.setGrid()
+        # A new slot count rebuilds the grid; otherwise the existing slots are
+        # only moved or resized in place (updateGrid diffs against them).
+        if regrid:
+            self.setGrid()
         self.updateGrid()
 
     @property
@@ -253,7 +267,8 @@ class LayoutTemplate(QGraphicsObject):
             if hasattr(slot, "setParentItem") and slot.parentItem() is not self:
                 slot.setParentItem(self)
 
-        # 3) Invalidate page cache (optional)
+        # 3) Invalidate page and hit-test caches
+        self.invalidate_hit_test()
         self.update()
 
     @property
@@ -278,6 +293,79 @@ class LayoutTemplate(QGraphicsObject):
         if v != self.duplex_print:
             self._duplex_print = v
             self.policyChanged.emit()
+
+    @property
+    def pagination_mode(self) -> str: return self._pagination_mode
+
+    @pagination_mode.setter
+    def pagination_mode(self, mode: str):
+        if mode in PAGINATION_MODES and mode != self._pagination_mode:
+            self._pagination_mode = mode
+            self.policyChanged.emit()
+
+    @property
+    def crop_marks(self) -> bool: return self._crop_marks
+
+    @crop_marks.setter
+    def crop_marks(self, v: bool):
+        if bool(v) != self._crop_marks:
+            self._crop_marks = bool(v)
+            self.policyChanged.emit()
+
+    @property
+    def cut_lines(self) -> bool: return self._cut_lines
+
+    @cut_lines.setter
+    def cut_lines(self, v: bool):
+        if bool(v) != self._cut_lines:
+            self._cut_lines = bool(v)
+            self.policyChanged.emit()
+
+    @property
+    def registration_marks(self) -> bool: return self._registration_marks
+
+    @registration_marks.setter
+    def registration_marks(self, v: bool):
+        if bool(v) != self._registration_marks:
+            self._registration_marks = bool(v)
+            self.policyChanged.emit()
+
+    @property
+    def back_pid(self) -> Optional[str]: return self._back_pid
+
+    @back_pid.setter
+    def back_pid(self, pid: Optional[str]):
+        pid = pid or None
+        if pid != self._back_pid:
+            self._back_pid = pid
+            self.policyChanged.emit()
+
+    @property
+    def flip_edge(self) -> str: return self._flip_edge
+
+    @flip_edge.setter
+    def flip_edge(self, edge: str):
+        if edge in ("long", "short") and edge != self._flip_edge:
+            self._flip_edge = edge
+            self.policyChanged.emit()
+
+    @property
+    def tile_overlap(self) -> UnitStr: return self._tile_overlap
+
+    @tile_overlap.setter
+    def tile_overlap(self, value: UnitStr):
+        if value != self._tile_overlap:
+            self._tile_overlap = value
+            self.policyChanged.emit()
+
+    @property
+    def pack_rotation(self) -> bool: return self._pack_rotation
+
+    @pack_rotation.setter
+    def pack_rotation(self, v: bool):
+        if bool(v) != self._pack_rotation:
+            self._pack_rotation = bool(v)
+            self.policyChanged.emit()
     @property
     def whitespace(self) -> List[UnitStr]: return self._whitespace
 
@@ -409,8 +497,8 @@ class LayoutTemplate(QGraphicsObject):
         existing = list(self._items)
         existing.sort(key=row_major_key)
 
-        with_content = [it for it in existing if getattr(it, "_content", None)]
-        empties      = [it for it in existing if not getattr(it, "_content", None)]
+        with_content = [it for it in existing if it.has_content]
+        empties      = [it for it in existing if not it.has_content]
         survivors    = (with_content + empties)[:total_new]   # keep, in stable order
 
         # For fast membership checks and later cleanup
@@ -455,17 +543,14 @@ class LayoutTemplate(QGraphicsObject):
 
         # --- finalize ------------------------------------------------------------
         self._items = new_items
+        self.invalidate_hit_test()
         self.update()
         self.template_changed.emit()
 
     def updateGrid(self) -> None:
-        top, bottom, left, right, spacing_x, spacing_y = self.whitespace_in_units()
         page_rect_in = self.geometry.to(self.ctx.unit, dpi=self.ctx.dpi).rect
-        total_w, total_h = page_rect_in.width(), page_rect_in.height()
-        avail_w = total_w - left - right - (self._columns - 1) * spacing_x
-        avail_h = total_h - top  - bottom - (self._rows    - 1) * spacing_y
-        cell_w = max(avail_w / self._columns, 0.0) if self._columns else 0.0
-        cell_h = max(avail_h / self._rows,    0.0) if self._rows else 0.0
+        cell_w, cell_h, cells = grid_cells(page_rect_in.width(), page_rect_in.height(),
+                                           self._rows, self._columns, tuple(self.whitespace_in_units()))
 
         scene = self.scene()
         if self.first_pass and scene:
@@ -478,29 +563,29 @@ class LayoutTemplate(QGraphicsObject):
                 slot.update()
             self.first_pass = False
 
-        # print(f"On updateGrid call:\nTemplate {self.pid} has scene: {bool(self.scene())}\nTemplate dimensions:{self.geometry.to(self.ctx.unit, dpi=self.ctx.dpirect}\n")
-        # Update every slot’s geometry from flat list
-
+        # Diff the new grid against the slots: unchanged slots are skipped, moved
+        # slots only get a new position (keeping their cached raster), and only
+        # resized slots re-render (see LayoutSlot.geometry).
+        unit, dpi = self.ctx.unit, self.ctx.dpi
+        eps = 1e-6
+        changed = False
         for r in range(self._rows):
             for c in range(self._columns):
                 slot = self._items[self._idx(r, c)]
-                x = left + c * (cell_w + spacing_x)
-                y = top  + r * (cell_h + spacing_y)
-                slot.geometry = UnitStrGeometry(width=cell_w, height=cell_h, x=x, y=y, unit=self.ctx.unit, dpi=self.ctx.dpi)
+                x, y, _w, _h = cells[self._idx(r, c)]
                 slot.row = r
                 slot.column = c
-                pos = slot.geometry.to(self.ctx.unit, dpi=self.ctx.dpi).pos
-                slot.setPos(pos)
-
-                # print(f" - Slot {slot.pid} has scene: {slot.scene()}\n   - slot grid location: {r, c}\n   - position set to {slot.pos()}")
-                slot.invalidate_cache()
-                # if slot.parentItem() is not self:
-                #     slot.setParentItem(self)
-                # if slot.scene():
-                #     scene = self.scene()
-                #     scene.addItem(slot)
-
-        self.update()
+                cx, cy = slot.geometry.pos_tuple(unit, dpi)
+                cw, ch = slot.geometry.size_tuple(unit, dpi)
+                if (abs(cx - x) < eps and abs(cy - y) < eps
+                        and abs(cw - cell_w) < eps and abs(ch - cell_h) < eps):
+                    continue
+                slot.geometry = UnitStrGeometry(width=cell_w, height=cell_h, x=x, y=y, unit=unit, dpi=dpi)
+                changed = True
+
+        if changed:
+            self.invalidate_hit_test()
+            self.update()
         self.template_changed.emit()
 
     def get_whitespace(self):
@@ -515,28 +600,76 @@ class LayoutTemplate(QGraphicsObject):
         return self._items[self._idx(row, col)].geometry.to(self.ctx.unit, dpi=self.ctx.dpi).size
 
 
-    def get_item_at_position(self, scene_pos: QPointF) -> Optional["LayoutSlot"]:
+    def invalidate_hit_test(self) -> None:
+        """Drop the slot lookup tables; the next get_item_at_position() rebuilds them."""
+        self._hit_grid = None
+        self._hit_index = None
+
+    def _build_hit_test(self) -> None:
         """
-        Given a scene-coordinate point, return the LayoutSlot whose rect contains it,
-        or None if no item matches.
+        When every slot sits where updateGrid() puts it, store the grid as
+        (left, top, pitch_x, pitch_y, cell_w, cell_h) and find slots by
+        arithmetic; otherwise (rehydrated or hand-placed slots) index the slot
+        rects in a SpatialIndex.
         """
+        rects = []
+        for slot in self._items:
+            g = slot.geometry.to(self.ctx.unit, dpi=self.ctx.dpi)
+            pos, size = g.pos, g.size
+            rects.append((pos.x(), pos.y(), size.width(), size.height()))
 
-        for row in range(self.rows):
-            for col in range(self.columns):
-                item = self.slots[row][col]
-                rect = item.geometry.to(self.ctx.unit, dpi=self.ctx.dpi).rect
-                pos = item.geometry.to(self.ctx.unit, dpi=self.ctx.dpi).pos
-                x, y = pos.x(), pos.y()
-                w, h = rect.width(), rect.height()
-                item_rect = QRectF(x, y, w, h)
-                if item_rect.contains(scene_pos):
-                    return self.slots[row][col]
+        top, bottom, left, right, spacing_x, spacing_y = self.whitespace_in_units()
+        if rects and len(rects) == self._rows * self._columns:
+            _x, _y, cell_w, cell_h = rects[0]
+            pitch_x, pitch_y = cell_w + spacing_x, cell_h + spacing_y
+            eps = 0.01
+            on_grid = cell_w > 0 and cell_h > 0 and all(
+                abs(x - (left + (i % self._columns) * pitch_x)) < eps
+                and abs(y - (top + (i // self._columns) * pitch_y)) < eps
+                and abs(w - cell_w) < eps and abs(h - cell_h) < eps
+                for i, (x, y, w, h) in enumerate(rects)
+            )
+            if on_grid:
+                self._hit_grid = (left, top, pitch_x, pitch_y, cell_w, cell_h)
+                return
+        self._hit_index = SpatialIndex.build(enumerate(rects))
+
+    def _scene_to_local(self, scene_pos: QPointF) -> QPointF:
+        xform = self.sceneTransform()
+        if xform != self._hit_xform:
+            self._hit_xform = xform
+            self._hit_inverse, _ok = xform.inverted()
+        return self._hit_inverse.map(scene_pos)
 
-        return None
+    def get_item_at_position(self, scene_pos: QPointF) -> Optional["LayoutSlot"]:
+        """
+        Given a scene-coordinate point, return the LayoutSlot whose rect contains it,
+        or None if no item matches. Constant time on a regular grid.
+        """
+        if not self._items:
+            return None
+        if self._hit_grid is None and self._hit_index is None:
+            self._build_hit_test()
+        p = self._scene_to_local(scene_pos)
+        x, y = p.x(), p.y()
+
+        if self._hit_grid is not None:
+            left, top, pitch_x, pitch_y, cell_w, cell_h = self._hit_grid
+            c = floor((x - left) / pitch_x)
+            r = floor((y - top) / pitch_y)
+            if not self._in_bounds(r, c):
+                return None
+            # Points in the spacing between cells hit nothing.
+            if x - left - c * pitch_x > cell_w or y - top - r * pitch_y > cell_h:
+                return None
+            return self._items[self._idx(r, c)]
+
+        hits = self._hit_index.at(x, y)
+        return self._items[hits[0]] if hits else None
 
     def get_slot_by_content_pid(self, pid):
         for slot in self.items:
-            if slot.content and getattr(slot.content, "pid", None) == pid:
+            if slot.content_pid == pid:
                 return slot
         return None
 
@@ -569,7 +702,7 @@ class LayoutTemplate(QGraphicsObject):
 
             updated_count = 0
             for slot in self.items:  # flattens rows → slots
-                if hasattr(slot.content, 'tpid') and slot.content.tpid == source_pid:
+                if slot.content_tpid == source_pid:
                     # --- START REPAIR ---
                     # Keep a reference to the old content before replacing it.
                     old_content = slot.content        
@@ -607,6 +740,14 @@ class LayoutTemplate(QGraphicsObject):
             "columns": self._columns,
             "whitespace": [w.to_dict() for w in self.whitespace],
             "orientation": self._orientation,
+            "pagination_mode": self._pagination_mode,
+            "pack_rotation": self._pack_rotation,
+            "tile_overlap": self._tile_overlap.to_dict(),
+            "back_pid": self._back_pid,
+            "flip_edge": self._flip_edge,
+            "crop_marks": self._crop_marks,
+            "cut_lines": self._cut_lines,
+            "registration_marks": self._registration_marks,
             "content": self._content,
             "items": items,
         }
@@ -618,6 +759,8 @@ class LayoutTemplate(QGraphicsObject):
             raise ValueError(f"Invalid or missing pid for LayoutTemplate: {serial_pid!r}")
 
         geom = UnitStrGeometry.from_dict(data.get("geometry", None))
+        # Serialized slots are rehydrated by the registry, so no grid is built here.
+        has_items = bool(data.get("items"))
         # Do NOT pass geometry=... to __init__; your __init__ doesn't accept it.
         inst = cls(
             proto=pc.LT,
@@ -625,6 +768,7 @@ class LayoutTemplate(QGraphicsObject):
             registry=registry,
             pagination_policy=data.get("pagination_policy"),
             name=data.get("name"),
+            rehydrated=has_items,
         )
 
         # Apply geometry directly to the backing field to avoid triggering updateGrid()
@@ -645,6 +789,17 @@ class LayoutTemplate(QGraphicsObject):
         inst._rows = int(data.get("rows", 3))
         inst._columns = int(data.get("columns", 3))
         inst._orientation = bool(data.get("orientation", False))
+        if data.get("pagination_mode") in PAGINATION_MODES:
+            inst._pagination_mode = data["pagination_mode"]
+        inst._pack_rotation = bool(data.get("pack_rotation", True))
+        if data.get("tile_overlap"):
+            inst._tile_overlap = UnitStr.from_dict(data["tile_overlap"])
+        inst._back_pid = data.get("back_pid") or None
+        if data.get("flip_edge") in ("long", "short"):
+            inst._flip_edge = data["flip_edge"]
+        inst._crop_marks = bool(data.get("crop_marks", inst._crop_marks))
+        inst._cut_lines = bool(data.get("cut_lines", False))
+        inst._registration_marks = bool(data.get("registration_marks", False))
 
         # Whitespace: use provided 6-tuple if present; otherwise keep whatever policy set earlier
         ws_in = data.get("whitespace")
@@ -653,8 +808,9 @@ class LayoutTemplate(QGraphicsObject):
             if len(ws_vals) == 6:
                 inst._whitespace = ws_vals  # set private to avoid early updateGrid()
 
-        inst.setGrid(registry=registry, rows=inst._rows, columns=inst._columns)
-        inst.updateGrid()
+        if not has_items:
+            inst.setGrid(registry=registry, rows=inst._rows, columns=inst._columns)
+            inst.updateGrid()
         return inst
 
     def paint(self, painter: QPainter, option, widget=None):
@@ -1,12 +1,52 @@
 # models/page_models.py
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Tuple
 from PySide6.QtCore import QRectF
+from PySide6.QtGui import QTransform
+
+
+@dataclass(frozen=True)
+class SlotPlacement:
+    index: int
+    row: int
+    column: int
+    rect_px: QRectF                 # slot rect on the page, px at the planning dpi
+    angle: float                    # per-slot rotation (deg), about the slot centre
+    content_pid: Optional[str]      # what the slot holds; read without hydrating it
+    content_tpid: Optional[str]
+
+    def transform(self) -> QTransform:
+        """Slot-local rotation about its centre (identity when angle is 0)."""
+        t = QTransform()
+        if self.angle:
+            c = self.rect_px.center()
+            t.translate(c.x(), c.y())
+            t.rotate(self.angle)
+            t.translate(-c.x(), -c.y())
+        return t
+
 
 @dataclass(frozen=True)
 class Page:
     index: int
     angle: float       # absolute page rotation deg
     rect_px: QRectF    # page rect in px (after UnitStrGeometry->px)
-    slot_angles: List[float]  # final, per-slot absolute angles (deg)
-    # GUI: we’ll also return a root QGraphicsItem from PageManager.mount()
+    slot_angles: Tuple[float, ...]  # final, per-slot absolute angles (deg)
+    slots: Tuple[SlotPlacement, ...] = ()
+    rows: Tuple[Optional[int], ...] = ()   # merge source row per slot (None: unbound/exhausted)
+    side: str = "front"                    # "back" for the reverse of a duplex sheet
+    landscape: bool = False
+
+    @property
+    def is_back(self) -> bool:
+        return self.side == "back"
+
+    def transform(self) -> QTransform:
+        """Page rotation about the page centre."""
+        t = QTransform()
+        if self.angle:
+            c = self.rect_px.center()
+            t.translate(c.x(), c.y())
+            t.rotate(self.angle)
+            t.translate(-c.x(), -c.y())
+        return t
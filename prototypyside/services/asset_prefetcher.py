@@ -0,0 +1,137 @@
+# prototypyside/services/asset_prefetcher.py
+"""
+Parallel image prefetch for export.
+
+Before any page is painted, every image element on the planned pages is
+resolved, deduplicated by its RenderCache key and decoded + scaled on a thread
+pool. Results are inserted into the cache on the calling thread, so the paint
+pass only does cache hits. Export decodes through QImageReader/QImage, which
+is safe off the GUI thread; other contexts fall back to decoding inline.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prototypyside.services.proto_class import ProtoClass
+from prototypyside.services.proto_paint import ProtoPaint, ImageScaleMode, zero
+from prototypyside.utils.valid_path import ValidPath
+
+pc = ProtoClass
+
+
+@dataclass(frozen=True)
+class PrefetchJob:
+    key: Tuple
+    path: Path
+    geom: object        # UnitStrGeometry, bleed already applied
+    aspect_mode: object
+    xform_mode: object
+
+
+@dataclass
+class PrefetchReport:
+    requested: int = 0                  # image elements seen on the pages
+    unique: int = 0                     # distinct cache keys among them
+    decoded: int = 0
+    cached: int = 0                     # already in the cache (e.g. seeded by a project)
+    missing: Dict[str, List[int]] = field(default_factory=dict)    # content → 1-based pages
+    failed: List[str] = field(default_factory=list)                # existed but did not decode
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.failed
+
+    def summary(self, limit: int = 10) -> str:
+        lines = []
+        for content, pages in list(self.missing.items())[:limit]:
+            shown = ", ".join(str(p) for p in pages[:5]) + ("…" if len(pages) > 5 else "")
+            lines.append(f"missing: {content} (page {shown})")
+        for path in self.failed[:limit]:
+            lines.append(f"unreadable: {path}")
+        extra = len(self.missing) + len(self.failed) - len(lines)
+        if extra > 0:
+            lines.append(f"…and {extra} more")
+        return "\n".join(lines)
+
+
+class AssetPrefetcher:
+    def __init__(self, ctx, max_workers: Optional[int] = None):
+        self.ctx = ctx
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def collect(self, pages: Iterable) -> Tuple[List[PrefetchJob], PrefetchReport]:
+        """Walk the pages' image elements; returns the unique uncached jobs."""
+        ctx = self.ctx
+        cache = getattr(ctx, "cache", None)
+        report = PrefetchReport()
+        jobs: Dict[Tuple, PrefetchJob] = {}
+        seen = set()
+        for n, page in enumerate(pages, start=1):
+            for slot in page.items:
+                comp = getattr(slot, "content", None)
+                if comp is None:
+                    continue
+                for item in comp.items:
+                    if not pc.isproto(item, pc.IE) or not item.content:
+                        continue
+                    report.requested += 1
+                    path = ValidPath.file(item.content, must_exist=True)
+                    if not path:
+                        pages_missing = report.missing.setdefault(str(item.content), [])
+                        if not pages_missing or pages_missing[-1] != n:
+                            pages_missing.append(n)
+                        continue
+                    # Mirror ProtoPaint.paint_image so the keys match at paint time.
+                    geom = item.geometry
+                    if item.bleed > zero and item.include_bleed:
+                        geom = geom.outset(item.bleed, item.bleed)
+                    aspect_mode, xform_mode = ImageScaleMode.resolve(
+                        item.aspect, getattr(item, "xform", None))
+                    key = cache.image_key(
+                        source=path,
+                        target_size=ProtoPaint._target_size_px(geom, ctx),
+                        aspect_mode=aspect_mode,
+                        transform_mode=xform_mode,
+                        ctx=ctx,
+                    ) if cache is not None else None
+                    if key is None or key in seen:
+                        continue
+                    seen.add(key)
+                    if cache.has_image(key):
+                        report.cached += 1
+                        continue
+                    jobs[key] = PrefetchJob(key, path, geom, aspect_mode, xform_mode)
+        report.unique = len(seen)
+        return list(jobs.values()), report
+
+    def _decode(self, job: PrefetchJob):
+        return ProtoPaint._generate_scaled_image(
+            job.path, job.geom, self.ctx, job.aspect_mode, job.xform_mode)
+
+    def run(self, pages: Iterable) -> PrefetchReport:
+        jobs, report = self.collect(pages)
+        if not jobs:
+            return report
+        cache = self.ctx.cache
+        if self.ctx.is_export and self.max_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+                results = pool.map(self._decode, jobs)
+                # Results arrive in job order; insertion happens here, on the caller's thread.
+                for job, image in zip(jobs, results):
+                    self._store(cache, job, image, report)
+        else:
+            for job in jobs:
+                self._store(cache, job, self._decode(job), report)
+        return report
+
+    @staticmethod
+    def _store(cache, job: PrefetchJob, image, report: PrefetchReport) -> None:
+        if image is None:
+            report.failed.append(str(job.path))
+            return
+        cache.image(job.key, lambda: image)
+        report.decoded += 1
@@ -0,0 +1,257 @@
+# prototypyside/services/autosave_journal.py
+"""
+Journaled autosave.
+
+Each tab gets an AutosaveJournal that listens to its undo stack. Every step
+produces a small record holding only the top-level items the affected commands
+touched (plus the template's item order), which a shared background writer
+appends to `<pid>.journal.jsonl`. Every so often the journal is compacted: the
+full template is written to `<pid>.snapshot.json` and the journal restarts.
+
+Recovery replays the journal onto the snapshot by pid.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, QStandardPaths, Slot
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def autosave_dir() -> Path:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    path = Path(base or Path.home() / ".prototypyside") / "autosave"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class JournalWriter:
+    """Single background thread that owns all autosave file I/O."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else autosave_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave-journal", daemon=True)
+        self._thread.start()
+
+    def snapshot_path(self, pid: str) -> Path:
+        return self.directory / f"{pid}{SNAPSHOT_SUFFIX}"
+
+    def journal_path(self, pid: str) -> Path:
+        return self.directory / f"{pid}{JOURNAL_SUFFIX}"
+
+    # ---------------------------
+    # GUI-thread API (enqueue only)
+    # ---------------------------
+    def append(self, pid: str, record: Dict[str, Any]) -> None:
+        self._queue.put(("append", pid, record))
+
+    def snapshot(self, pid: str, data: Dict[str, Any], seq: int) -> None:
+        self._queue.put(("snapshot", pid, {"seq": seq, "saved": time.time(), "data": data}))
+
+    def discard(self, pid: str) -> None:
+        self._queue.put(("discard", pid, None))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        done = threading.Event()
+        self._queue.put(("flush", None, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    # ---------------------------
+    # Worker
+    # ---------------------------
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            op, pid, payload = job
+            try:
+                if op == "append":
+                    with self.journal_path(pid).open("a", encoding="utf-8") as fh:
+                        fh.write(json.dumps(payload, separators=(",", ":")) + "\n")
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                elif op == "snapshot":
+                    target = self.snapshot_path(pid)
+                    tmp = target.with_suffix(".tmp")
+                    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+                    tmp.replace(target)
+                    # Records queued after this snapshot are behind us in the queue.
+                    self.journal_path(pid).unlink(missing_ok=True)
+                elif op == "discard":
+                    self.snapshot_path(pid).unlink(missing_ok=True)
+                    self.journal_path(pid).unlink(missing_ok=True)
+                elif op == "flush":
+                    payload.set()
+            except OSError as e:
+                print(f"[AUTOSAVE] {op} failed for {pid}: {e}")
+
+    # ---------------------------
+    # Recovery
+    # ---------------------------
+    def recoverable(self) -> List[str]:
+        return sorted(p.name[: -len(SNAPSHOT_SUFFIX)] for p in self.directory.glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def recover(self, pid: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the last journaled state of a template as a to_dict() payload."""
+        try:
+            snap = json.loads(self.snapshot_path(pid).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        data = snap.get("data") or {}
+        base_seq = snap.get("seq", 0)
+        items = {d.get("pid"): d for d in data.get("items", []) if isinstance(d, dict)}
+        order = [d.get("pid") for d in data.get("items", []) if isinstance(d, dict)]
+
+        journal = self.journal_path(pid)
+        if journal.exists():
+            with journal.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from a crash mid-write
+                    if rec.get("seq", 0) <= base_seq:
+                        continue
+                    items.update(rec.get("objects", {}))
+                    order = rec.get("order", order)
+
+        data["items"] = [items[p] for p in order if p in items]
+        return data
+
+
+class AutosaveJournal(QObject):
+    """Turns one tab's undo stream into journal records."""
+
+    def __init__(self, writer: JournalWriter, template, undo_stack, compact_every: int = 200, parent=None):
+        super().__init__(parent)
+        self.writer = writer
+        self.template = template
+        self.undo_stack = undo_stack
+        self.compact_every = compact_every
+        self._seq = 0
+        self._since_snapshot = 0
+        self._has_snapshot = False
+        self._last_index = undo_stack.index()
+        undo_stack.indexChanged.connect(self.on_index_changed)
+
+    @property
+    def pid(self) -> str:
+        return self.template.pid
+
+    @property
+    def dirty(self) -> bool:
+        return self._since_snapshot > 0
+
+    @property
+    def seq(self) -> int:
+        """Bumped on every journaled change; compare to tell whether edits happened since."""
+        return self._seq
+
+    @Slot(int)
+    def on_index_changed(self, index: int) -> None:
+        lo, hi = sorted((self._last_index, index))
+        self._last_index = index
+        commands = [self.undo_stack.command(i) for i in range(lo, hi)]
+        self.record(c for c in commands if c is not None)
+
+    def record(self, commands: Iterable[Any]) -> None:
+        if not self._has_snapshot:
+            self.compact()
+            return
+
+        touched: Set[Any] = set()
+        template_changed = False
+        for cmd in commands:
+            for obj in self._touched_objects(cmd):
+                if obj is self.template:
+                    template_changed = True
+                else:
+                    top = self._top_level(obj)
+                    # Objects no longer in the tree were removed; "order" records that.
+                    if top is not None:
+                        touched.add(top)
+
+        # Template-level edits carry the whole tree; cheaper to just re-snapshot.
+        if template_changed:
+            self.compact()
+            return
+
+        self._seq += 1
+        self.writer.append(self.pid, {
+            "seq": self._seq,
+            "t": time.time(),
+            "order": [it.pid for it in self.template.items],
+            "objects": {obj.pid: obj.to_dict() for obj in touched},
+        })
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        self._seq += 1
+        self.writer.snapshot(self.pid, self.template.to_dict(), self._seq)
+        self._has_snapshot = True
+        self._since_snapshot = 0
+
+    def discard(self) -> None:
+        """Forget journaled state, e.g. after an explicit save or a clean close."""
+        self.writer.discard(self.pid)
+        self._has_snapshot = False
+        self._since_snapshot = 0
+
+    def detach(self) -> None:
+        try:
+            self.undo_stack.indexChanged.disconnect(self.on_index_changed)
+        except (RuntimeError, TypeError):
+            pass
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+    def _touched_objects(self, cmd) -> Iterable[Any]:
+        """Proto objects a command holds, found by walking its attributes."""
+        stack = list(vars(cmd).values())
+        seen = set()
+        while stack:
+            val = stack.pop()
+            if id(val) in seen:
+                continue
+            seen.add(id(val))
+            if isinstance(val, dict):
+                stack.extend(val.keys())
+                stack.extend(val.values())
+            elif isinstance(val, (list, tuple, set)):
+                stack.extend(val)
+            elif hasattr(val, "pid") and hasattr(val, "to_dict"):
+                yield val
+
+    def _top_level(self, obj) -> Optional[Any]:
+        """Map an object to the template item that contains it, if any."""
+        items = {it.pid: it for it in self.template.items}
+        cur = obj
+        while cur is not None:
+            pid = getattr(cur, "pid", None)
+            if pid in items:
+                return items[pid]
+            cur = cur.parentItem() if hasattr(cur, "parentItem") else None
+        # Slot contents are not parented to their slot.
+        pid = getattr(obj, "pid", None)
+        for slot in items.values():
+            if getattr(slot, "content_pid", None) == pid:
+                return slot
+        return None
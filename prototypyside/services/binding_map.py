@@ -0,0 +1,194 @@
+# prototypyside/services/binding_map.py
+"""
+Template → @field binding analysis, computed once per template.
+
+TemplateBindings records, for one template, which element indices (and pids)
+bind each @field. BindingMap caches them by template pid; components look up
+their template's entry through `tpid`, since clones keep the template's item
+order. Renames arrive through each element's nameChanged and move just that
+element between fields; adding or removing elements (template_changed) drops
+the entry so the next lookup rebuilds it.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+def _is_field(name: Any) -> bool:
+    return isinstance(name, str) and name.startswith("@")
+
+
+@dataclass
+class TemplateBindings:
+    pid: str
+    item_count: int
+    fields: Dict[str, List[int]] = field(default_factory=dict)      # @name → element indices
+    pids: Dict[str, List[str]] = field(default_factory=dict)        # @name → element pids
+    own_field: Optional[str] = None                                 # the template's own @name
+    _names: Dict[str, str] = field(default_factory=dict, repr=False)    # element pid → name
+    _index: Dict[str, int] = field(default_factory=dict, repr=False)    # element pid → index
+    _columns: Dict[int, Dict[str, int]] = field(default_factory=dict, repr=False)
+    _compare: Dict[int, Dict[str, str]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, template: Any, pid: Optional[str] = None) -> "TemplateBindings":
+        items = list(getattr(template, "items", None) or [])
+        tb = cls(pid=pid or getattr(template, "pid", ""), item_count=len(items))
+        for n, item in enumerate(items):
+            ipid = getattr(item, "pid", None) or str(n)
+            tb._index[ipid] = n
+            tb._add(ipid, getattr(item, "name", None))
+        name = getattr(template, "name", None)
+        tb.own_field = name if _is_field(name) else None
+        return tb
+
+    def _add(self, ipid: str, name: Any) -> None:
+        self._names[ipid] = name
+        if _is_field(name):
+            idxs = self.fields.setdefault(name, [])
+            at = bisect_left(idxs, self._index[ipid])
+            idxs.insert(at, self._index[ipid])
+            self.pids.setdefault(name, []).insert(at, ipid)
+
+    def _discard(self, ipid: str) -> None:
+        name = self._names.pop(ipid, None)
+        if not _is_field(name):
+            return
+        idx = self._index[ipid]
+        self.fields[name].remove(idx)
+        self.pids[name].remove(ipid)
+        if not self.fields[name]:
+            del self.fields[name]
+            del self.pids[name]
+
+    def rename(self, ipid: str, name: Any) -> bool:
+        """Move element `ipid` to its new name. False if the element is unknown."""
+        if ipid not in self._index:
+            return False
+        if self._names.get(ipid) != name:
+            self._discard(ipid)
+            self._add(ipid, name)
+            self._columns.clear()
+            self._compare.clear()
+        return True
+
+    # ---------------------------
+    # Derived views
+    # ---------------------------
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Every @name in the template (elements and the template itself)."""
+        names = set(self.fields)
+        if self.own_field:
+            names.add(self.own_field)
+        return frozenset(names)
+
+    def matches(self, obj: Any) -> bool:
+        """Cheap check that `obj` (a template or one of its clones) still fits this entry."""
+        items = getattr(obj, "items", None) or []
+        if len(items) != self.item_count:
+            return False
+        return all(items[i].name == name for name, idxs in self.fields.items() for i in idxs)
+
+    def columns(self, source: Any) -> Dict[str, int]:
+        """@field → column index in `source.headers`, for fields the source provides."""
+        key = id(source)
+        cols = self._columns.get(key)
+        if cols is None:
+            where = {h: n for n, h in enumerate(source.headers)}
+            cols = {f: where[f] for f in self.fields if f in where}
+            self._columns[key] = cols
+        return cols
+
+    def plan(self, source: Any = None) -> List[Tuple[int, str]]:
+        """(element index, field) pairs to assign per row; only fields `source` has, if given."""
+        wanted = self.columns(source) if source is not None else self.fields
+        return [(i, f) for f, idxs in self.fields.items() if f in wanted for i in idxs]
+
+    def compare(self, source: Any) -> Dict[str, str]:
+        """Same result as CSVData.compare_template_bindings, cached per source."""
+        key = id(source)
+        out = self._compare.get(key)
+        if out is None:
+            out = source.compare_template_bindings(None, tokens=self.tokens)
+            self._compare[key] = out
+        return out
+
+    def forget(self, source: Any) -> None:
+        self._columns.pop(id(source), None)
+        self._compare.pop(id(source), None)
+
+
+class BindingMap:
+    def __init__(self):
+        self._by_pid: Dict[str, TemplateBindings] = {}
+        self._watched: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # export jobs may look up bindings off the GUI thread
+
+    @staticmethod
+    def key_for(obj: Any) -> Optional[str]:
+        return getattr(obj, "tpid", None) or getattr(obj, "pid", None)
+
+    def get(self, obj: Any) -> Optional[TemplateBindings]:
+        """Bindings for a template or component; None for objects without a pid."""
+        key = self.key_for(obj)
+        if not key:
+            return None
+        with self._lock:
+            return self._get(obj, key)
+
+    def _get(self, obj: Any, key: str) -> TemplateBindings:
+        tb = self._by_pid.get(key)
+        if tb is not None and tb.matches(obj):
+            return tb
+        if tb is not None and getattr(obj, "pid", None) != key:
+            # A clone that drifted from its template: analyse it without caching.
+            return TemplateBindings.build(obj, key)
+        tb = TemplateBindings.build(obj, key)
+        self._by_pid[key] = tb
+        if getattr(obj, "pid", None) == key:
+            self._watch(obj)
+        return tb
+
+    def plan_for(self, obj: Any, source: Any = None) -> Optional[List[Tuple[int, str]]]:
+        tb = self.get(obj)
+        return tb.plan(source) if tb is not None else None
+
+    def invalidate(self, pid: Optional[str] = None) -> None:
+        with self._lock:
+            if pid is None:
+                self._by_pid.clear()
+            else:
+                self._by_pid.pop(pid, None)
+
+    def forget_source(self, source: Any) -> None:
+        for tb in self._by_pid.values():
+            tb.forget(source)
+
+    # ---------------------------
+    # Signals
+    # ---------------------------
+    def _watch(self, template: Any) -> None:
+        pid = template.pid
+        watched = self._watched.get(pid)
+        if watched is None:
+            watched = self._watched[pid] = set()
+            for name in ("template_changed", "template_name_changed"):
+                signal = getattr(template, name, None)
+                if signal is not None:
+                    signal.connect(lambda pid=pid: self.invalidate(pid))
+        for item in getattr(template, "items", None) or []:
+            ipid = getattr(item, "pid", None)
+            signal = getattr(item, "nameChanged", None)
+            if ipid is None or signal is None or ipid in watched:
+                continue
+            watched.add(ipid)
+            signal.connect(lambda name, pid=pid, ipid=ipid: self._on_rename(pid, ipid, name))
+
+    def _on_rename(self, pid: str, ipid: str, name: str) -> None:
+        tb = self._by_pid.get(pid)
+        if tb is not None and not tb.rename(ipid, name):
+            self.invalidate(pid)
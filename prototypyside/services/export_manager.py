@@ -19,6 +19,15 @@ from prototypyside.services.proto_class import ProtoClass
 from prototypyside.services.proto_paint import ProtoPaint
 from prototypyside.utils.render_context import RenderContext, RenderMode, RenderRoute, TabMode
 from prototypyside.services.render_cache import RenderCache
+from prototypyside.services.pagination.page_planner import PagePlanner
+from prototypyside.services.pagination.page_manager import PageManager
+from prototypyside.services.asset_prefetcher import AssetPrefetcher
+from prototypyside.services.pagination.bin_packer import PackItem, pack
+from prototypyside.services.pagination.hex_packer import hex_pack
+from prototypyside.services.pagination.tiler import TilePlan
+from prototypyside.services.pagination.duplex import BackRenderer
+from prototypyside.services.pagination.print_marks import PrintMarks
+from prototypyside.utils.spatial_index import SpatialIndex
 
 pc = ProtoClass
 
@@ -26,48 +35,122 @@ class ExportManager:
     def __init__(self, root_registry, merge_manager):
         self.root_registry = root_registry
         self.merge_manager = merge_manager
+        self._export_registry = None
+        self.planner = None
+        self.descriptors = []  # Page descriptors (models.page_model) for the last paginate()
+        self.job = None  # MergeJob: this export's own cursors over the merge sources
+        self.project = None  # open ProjectPackage, if any; supplies pre-scaled images
+        self.prefetch_report = None
+        self.pack_report = None  # PackResult of the last packed export
+        self.tile_plans = []     # TilePlan per board of the last tiled export
 
-    def paginate(self, layout, copies: int = 1):
+    def paginate(self, layout, copies: int = 1, page_range=None):
+        """
+        Build export page clones. `page_range` (any iterable of page indices)
+        limits the output to those pages; rows are assigned by a PagePlanner, so
+        page N never depends on pages 0..N-1 having been produced.
+        """
         pages = []
-        registry = layout.registry
+        export_layout, _ctx = self._begin(layout, copies)
+        planner, job = self.planner, self.job
+        # Descriptors in points (px at 72 dpi): orientation, slot angles and rows per page.
+        self.descriptors = PageManager().plan(layout, planner=planner, page_range=page_range, dpi=72)
+
+        for desc in self.descriptors:
+            page = self._page_clone(export_layout, _ctx)
+            if planner.has_merge:
+                job.set_csv_content_for_page(page, planner, desc.index)
+            pages.append(page)
+
+        return pages
+
+    def frame(self, layout, copies: int = 1, dpi: int = 300):
+        """
+        A single unmerged page clone, for callers that bind rows into one page
+        repeatedly (see PagePreview). self.planner and self.job are set as in paginate().
+        """
+        export_layout, _ctx = self._begin(layout, copies, dpi=dpi)
+        return self._page_clone(export_layout, _ctx)
+
+    def bind_plans(self, frame):
+        """
+        Per bound slot of `frame`: the (element index, field) pairs to assign for
+        each row, and the frame's own values for those elements (to restore).
+        """
+        plans, defaults = {}, {}
+        bindings = self.job.bindings
+        for s, slot in enumerate(frame.items):
+            source = self.planner.source(s)
+            comp = slot.content
+            if source is None or comp is None:
+                continue
+            tb = bindings.get(comp)
+            if tb is None:
+                continue
+            if source._projection is None:
+                source.project_for(comp, tb.tokens)
+            plan = tb.plan(source)
+            plans[s] = plan
+            defaults[s] = {f: comp.items[i].content for i, f in plan}
+        return plans, defaults
+
+    def _begin(self, layout, copies: int = 1, dpi: int = 300):
         _ctx = RenderContext(
             route=RenderRoute.COMPOSITE,
             tab_mode=TabMode.LAYOUT,
             mode=RenderMode.EXPORT,
-            dpi=300,
+            dpi=dpi,
             unit="pt",
         )
         _ctx.cache = RenderCache(_ctx)
+        if self.project is not None:
+            self.project.seed_render_cache(_ctx.cache, _ctx)
         settings = AppSettings(_ctx)
-        _registry = ProtoRegistry(root=self.root_registry, 
-            settings=settings, 
-            parent=self.root_registry
-        )
+        # Not parented to the root registry: export clones must not outlive the export.
+        _registry = ProtoRegistry(root=self.root_registry, settings=settings)
+        self.release()
+        self._export_registry = _registry
         export_layout = _registry.clone(layout)
 
-        slots_per_page = len(layout.items)
-        total_rows = self.merge_manager.count_all_rows(layout)  # 0 if no CSV bound
-        has_csv = total_rows > 0
-
-        if has_csv:
-            # copies = repeat the whole run copies times
-            total_slots_needed = copies * total_rows
-            page_count = max(1, math.ceil(total_slots_needed / slots_per_page))
-        else:
-            # no CSV → clone exactly `copies` pages
-            page_count = max(1, copies)
-
-        for _ in range(page_count):
-            page = _registry.clone(export_layout)
-            self.no_autorender(page, True)
-            self.normalize_positions(page, page.ctx)
-            # Setting page.ctx sets context for everything on the page
-            page.ctx = _ctx
-            if has_csv:
-                self.merge_manager.set_csv_content_for_next_page(page)
-            pages.append(page)
+        # A private view of the sources: other exports and the GUI keep their own positions.
+        self.job = self.merge_manager.job()
+        # no CSV → the planner yields exactly `copies` pages
+        self.planner = PagePlanner(layout, self.job, copies=copies)
+        return export_layout, _ctx
 
-        return pages
+    def _page_clone(self, export_layout, ctx):
+        page = self._export_registry.clone(export_layout)
+        self.no_autorender(page, True)
+        self.normalize_positions(page, page.ctx)
+        # Setting page.ctx sets context for everything on the page
+        page.ctx = ctx
+        return page
+
+    def grid_trims(self, page):
+        """Trim rects (pt) of the cards on a normalized page clone, in slot order."""
+        trims = []
+        for slot in page.items:
+            comp = slot.content
+            if comp is None:
+                continue
+            pos = slot.pos()
+            size = comp.geometry.to("pt", dpi=page.ctx.dpi).size
+            trims.append((pos.x(), pos.y(), size.width(), size.height()))
+        return trims
+
+    def changed_pages(self, layout, copies: int = 1, diffs=None):
+        """
+        Pages whose merged content differs after the last source reloads
+        (MergeManager.last_diffs by default). Feed the result to export_pdf(page_range=...).
+        """
+        diffs = self.merge_manager.last_diffs if diffs is None else diffs
+        planner = PagePlanner(layout, self.merge_manager, copies=copies)
+        pages = set()
+        for key, diff in diffs.items():
+            source = self.merge_manager._map.get(key)
+            if source is not None and not diff.is_empty:
+                pages.update(planner.pages_for_rows(source, diff.rows))
+        return sorted(pages)
 
     def no_autorender(self, page, flag: bool):
         page.setFlag(QGraphicsItem.ItemHasNoContents, flag)
@@ -75,14 +158,40 @@ class ExportManager:
             slot.setFlag(QGraphicsItem.ItemHasNoContents, flag)
             comp = slot.content
             if comp:
-                comp.setFlag(QGraphicsItem.ItemHasNoContents, flag)
-                for item in comp.items:
-                    item.setFlag(QGraphicsItem.ItemHasNoContents, flag)
+                self.no_autorender_component(comp, flag)
+
+    def no_autorender_component(self, comp, flag: bool):
+        comp.setFlag(QGraphicsItem.ItemHasNoContents, flag)
+        for item in comp.items:
+            item.setFlag(QGraphicsItem.ItemHasNoContents, flag)
+
 
+    def prefetch(self, pages):
+        """Decode every image on `pages` into the export cache before painting."""
+        if not pages:
+            return None
+        self.prefetch_report = AssetPrefetcher(pages[0].ctx).run(pages)
+        return self.prefetch_report
 
-    def export_pdf(self, layout, pdf_path):
+    def export_pdf(self, layout, pdf_path, copies: int = 1, page_range=None, confirm_missing=None):
+        """
+        `confirm_missing(report)` is called when images are missing or unreadable;
+        returning False cancels the export before anything is written.
+        """
+        mode = getattr(layout, "pagination_mode", "grid")
+        if mode in ("packed", "hex"):
+            return self.export_packed(layout, pdf_path, copies=copies, page_range=page_range)
+        if mode == "tiled":
+            return self.export_tiled(layout, pdf_path, copies=copies, page_range=page_range)
         # context is set in pages
-        pages = self.paginate(layout)
+        pages = self.paginate(layout, copies=copies, page_range=page_range)
+        report = self.prefetch(pages)
+        if report is not None and not report.ok:
+            print(f"[EXPORT] image problems:\n{report.summary()}")
+            if confirm_missing is not None and not confirm_missing(report):
+                pages.clear()
+                self.release()
+                return False
 
         # Page geometry in points
         page_size_pt: QSizeF = layout.geometry.pt.size
@@ -97,18 +206,318 @@ class ExportManager:
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setRenderHint(QPainter.TextAntialiasing, True)
 
+        # Every page shares the slot grid: one trim set, one recorded mark picture.
+        marks = PrintMarks.for_layout(layout, page_size_pt.width(), page_size_pt.height())
+        trims = self.grid_trims(pages[0]) if marks is not None and pages else ()
+
+        backs = back_pages = None
+        if pages and PageManager.has_backs(layout):
+            backs = BackRenderer(self, layout, pages[0].ctx)
+            back_pages = PageManager().backs(layout, self.descriptors, dpi=72)
+
         for i, page in enumerate(pages):
             # 1) Draw this page
             # 
+            desc = self.descriptors[i]
             painter.save()
             # ensure painter origin is top-left of page in points
-            ProtoPaint.render_page(page, page.ctx, painter)
+            painter.setTransform(desc.transform(), True)
+            ProtoPaint.render_page(page, page.ctx, painter, angles=[sl.angle for sl in desc.slots])
+            # Marks share the page transform, so they follow turned (duplex back) pages.
+            if marks is not None:
+                marks.paint(painter, trims)
             painter.restore()
 
+            # 2) Its back, behind the slots that printed a card
+            if backs is not None:
+                writer.newPage()
+                printed = [s for s, slot in enumerate(page.items) if slot.content is not None]
+                backs.paint(painter, back_pages[i], printed)
+
             if i < len(pages) - 1:
                 writer.newPage()
 
         painter.end()
+        pages.clear()
+        self.release()
+        return True
+
+    # ---------------------------
+    # Packed pagination
+    # ---------------------------
+    @staticmethod
+    def _pack_size(comp, dpi):
+        """(width, height, bleed) of `comp` in pt; bleed is 0 unless it is printed."""
+        size = comp.geometry.to("pt", dpi=dpi).size
+        bleed = comp.bleed.to("pt", dpi=dpi).value if comp.include_bleed else 0.0
+        return size.width() + 2 * bleed, size.height() + 2 * bleed, bleed
+
+    def print_items(self, layout, planner):
+        """
+        What a non-grid layout prints: every card of each merge source (drawn
+        with the source's first bound slot) and `copies` of each unbound slot's
+        component, as PackItems keyed (slot index, source row or None).
+        """
+        dpi = layout.ctx.dpi
+        items = []
+        for s, slot in enumerate(layout.items):
+            comp = slot.content
+            if comp is None:
+                continue
+            b = planner.binding(s)
+            if b is not None and b.ordinal:
+                continue  # the source's first slot carries its whole run
+            w, h, _bleed = self._pack_size(comp, dpi)
+            rows = planner.run_rows(s) if b is not None else [None] * planner.copies
+            shape = getattr(comp, "shape", "rect")
+            items.extend(PackItem(w, h, key=(s, r), shape=shape) for r in rows)
+        return items
+
+    def pack(self, layout, copies: int = 1, planner=None, algorithm: str = "maxrects"):
+        """
+        Pack print_items() onto as few sheets as possible. Layouts in "hex" mode
+        close-pack by component shape, with the horizontal spacing as the gutter.
+        """
+        planner = planner or PagePlanner(layout, self.merge_manager, copies=copies)
+        dpi = layout.ctx.dpi
+        items = self.print_items(layout, planner)
+
+        size = layout.geometry.pt.size
+        ws = [v.to("pt", dpi=dpi).value for v in layout.whitespace]
+        if layout.pagination_mode == "hex":
+            self.pack_report = hex_pack(items, size.width(), size.height(), margins=tuple(ws[:4]), gutter=ws[4])
+            return items, self.pack_report
+        self.pack_report = pack(
+            items, size.width(), size.height(),
+            margins=tuple(ws[:4]), spacing=(ws[4], ws[5]),
+            algorithm=algorithm, allow_rotation=layout.pack_rotation,
+        )
+        return items, self.pack_report
+
+    def export_packed(self, layout, pdf_path, copies: int = 1, page_range=None):
+        """
+        Export with pagination_mode "packed" or "hex". One page clone is reused as the
+        frame; each packed item binds its row into its slot's component and
+        paints it at the packed position, turned 90° when the packer rotated it.
+        `page_range` selects sheets.
+        """
+        export_layout, _ctx = self._begin(layout, copies)
+        frame = self._page_clone(export_layout, _ctx)
+        items, result = self.pack(layout, copies=copies, planner=self.planner)
+        plans, _defaults = self.bind_plans(frame)
+        print(f"[EXPORT] packed: {result.summary()}")
+
+        wanted = None
+        if page_range is not None:
+            wanted = set()
+            for p in page_range:
+                wanted.update(p if isinstance(p, range) else (p,))
+
+        writer = QPdfWriter(pdf_path)
+        writer.setPageSize(QPageSize(QSizeF(result.sheet_width, result.sheet_height), QPageSize.Point))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Point)
+        writer.setResolution(72)  # 1pt = 1/72 in
+
+        painter = QPainter(writer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+
+        marks = PrintMarks.for_layout(layout, result.sheet_width, result.sheet_height)
+        first = True
+        for n, placements in enumerate(result.sheets()):
+            if wanted is not None and n not in wanted:
+                continue
+            if not first:
+                writer.newPage()
+            first = False
+            for pl in placements:
+                self.paint_item(painter, frame, plans, items[pl.index].key, pl, _ctx)
+            if marks is not None:
+                marks.paint(painter, self.packed_trims(frame, items, placements, _ctx))
+
+        painter.end()
+        self.release()
+        return True
+
+    def packed_trims(self, frame, items, placements, ctx):
+        """Trim rects (pt) of packed placements: the placed rect less its bleed."""
+        trims = []
+        for pl in placements:
+            s = items[pl.index].key[0]
+            bleed = self._pack_size(frame.items[s].content, ctx.dpi)[2]
+            trims.append((pl.x + bleed, pl.y + bleed, pl.width - 2 * bleed, pl.height - 2 * bleed))
+        return trims
+
+    def paint_item(self, painter, frame, plans, key, pl, ctx) -> bool:
+        """
+        Paint one packed item: bind row `key` = (slot index, row or None) into
+        that slot's component of `frame` and draw it at placement `pl`.
+        False when the row is query padding and nothing was drawn.
+        """
+        s, row_index = key
+        comp = frame.items[s].content
+        if row_index is not None:
+            row = self.planner.source(s).row(row_index)
+            if row is None:
+                return False
+            if s in plans:
+                comp.set_csv_content(row, plans[s])
+        _w, _h, bleed = self._pack_size(comp, ctx.dpi)
+        painter.save()
+        painter.translate(pl.x, pl.y)
+        if pl.rotated:
+            painter.translate(pl.width, 0)
+            painter.rotate(90)
+        painter.translate(bleed, bleed)
+        ProtoPaint.render_component(comp, ctx, painter)
+        painter.restore()
+        return True
+
+    # ---------------------------
+    # Tiled pagination
+    # ---------------------------
+    @staticmethod
+    def element_index(comp) -> SpatialIndex:
+        """Elements of `comp` by their rects in component coordinates (pt), in paint order."""
+        elements = sorted(comp.items, key=lambda i: i.zValue())
+        rects = []
+        for el in elements:
+            r = el.mapRectToParent(el.boundingRect())
+            rects.append((el, (r.x(), r.y(), r.width(), r.height())))
+        return SpatialIndex.build(rects)
+
+    def tile(self, layout, copies: int = 1, planner=None):
+        """print_items() and a TilePlan for each over the layout's printable area."""
+        planner = planner or PagePlanner(layout, self.merge_manager, copies=copies)
+        dpi = layout.ctx.dpi
+        items = self.print_items(layout, planner)
+        size = layout.geometry.pt.size
+        top, bottom, left, right = [v.to("pt", dpi=dpi).value for v in layout.whitespace[:4]]
+        area_w = size.width() - left - right
+        area_h = size.height() - top - bottom
+        overlap = layout.tile_overlap.to("pt", dpi=dpi).value
+        self.tile_plans = [TilePlan.for_board(it.width, it.height, area_w, area_h, overlap) for it in items]
+        return items, self.tile_plans
+
+    def export_tiled(self, layout, pdf_path, copies: int = 1, page_range=None):
+        """
+        Export with pagination_mode "tiled": each printed item is a board split
+        into overlapping tiles of the layout's printable area. A tile paints only
+        the elements its region intersects (found through a SpatialIndex), and
+        pages are written one at a time, so no board-sized raster is ever built.
+        `page_range` selects tile pages across all boards.
+        """
+        export_layout, _ctx = self._begin(layout, copies)
+        frame = self._page_clone(export_layout, _ctx)
+        items, tile_plans = self.tile(layout, planner=self.planner)
+        plans, _defaults = self.bind_plans(frame)
+
+        dpi = _ctx.dpi
+        size = layout.geometry.pt.size
+        top, _bottom, left, _right = [v.to("pt", dpi=dpi).value for v in layout.whitespace[:4]]
+
+        wanted = None
+        if page_range is not None:
+            wanted = set()
+            for p in page_range:
+                wanted.update(p if isinstance(p, range) else (p,))
+
+        writer = QPdfWriter(pdf_path)
+        writer.setPageSize(QPageSize(size, QPageSize.Point))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Point)
+        writer.setResolution(72)  # 1pt = 1/72 in
+
+        painter = QPainter(writer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+
+        marks = PrintMarks.for_layout(layout, size.width(), size.height())
+        indexes = {}
+        n, first = -1, True
+        for board, (item, plan) in enumerate(zip(items, tile_plans)):
+            s, row_index = item.key
+            comp = frame.items[s].content
+            if wanted is not None and not any(n + 1 + t in wanted for t in range(plan.count)):
+                n += plan.count
+                continue
+            if row_index is not None:
+                row = self.planner.source(s).row(row_index)
+                if row is None:
+                    n += plan.count
+                    continue  # query padding: nothing to print
+                if s in plans:
+                    comp.set_csv_content(row, plans[s])
+            index = indexes.get(s)
+            if index is None:
+                index = indexes[s] = self.element_index(comp)
+            _w, _h, bleed = self._pack_size(comp, dpi)
+
+            for tile in plan.tiles():
+                n += 1
+                if wanted is not None and n not in wanted:
+                    continue
+                if not first:
+                    writer.newPage()
+                first = False
+                painter.save()
+                painter.translate(left - tile.x, top - tile.y)
+                painter.setClipRect(QRectF(*tile.rect))
+                painter.translate(bleed, bleed)
+                elements = index.query((tile.x - bleed, tile.y - bleed, tile.width, tile.height))
+                ProtoPaint.render_component(comp, _ctx, painter, elements)
+                painter.restore()
+
+                painter.save()
+                painter.translate(left - tile.x, top - tile.y)
+                for x, y in plan.registration_points(tile):
+                    self._draw_target(painter, x, y)
+                painter.restore()
+                if marks is not None:
+                    # The board's trim in page coordinates; edges on other tiles get no marks.
+                    trim = (left - tile.x + bleed, top - tile.y + bleed, item.width - 2 * bleed, item.height - 2 * bleed)
+                    marks.paint(painter, (trim,))
+                painter.drawText(QPointF(left, max(8.0, top - 4.0)),
+                                 f"Board {board + 1} - row {tile.row + 1}, column {tile.column + 1}")
+
+        painter.end()
+        print(f"[EXPORT] tiled: {len(self.tile_plans)} board(s), {n + 1} tile page(s)")
+        self.release()
+        return True
+
+    @staticmethod
+    def _draw_target(painter, x: float, y: float, r: float = 6.0):
+        """Registration target: a circle with a crosshair, hairline black."""
+        painter.save()
+        pen = painter.pen()
+        pen.setColor(QColor(Qt.black))
+        pen.setWidthF(0.25)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(QPointF(x, y), r * 0.6, r * 0.6)
+        painter.drawLine(QPointF(x - r, y), QPointF(x + r, y))
+        painter.drawLine(QPointF(x, y - r), QPointF(x, y + r))
+        painter.restore()
+
+    def release(self) -> int:
+        """
+        Drop the registry (and every page clone it produced) from the last paginate().
+        Returns the number of cached-image bytes freed.
+        """
+        if self.job is not None:
+            self.job.close()
+            self.job = None
+        registry = self._export_registry
+        if registry is None:
+            return 0
+        self._export_registry = None
+        for pid in list(registry._store.keys()):
+            registry.deregister(pid)
+        freed = registry.collect(force=True)
+        cache = getattr(registry.settings.ctx, "cache", None)
+        if cache is not None:
+            cache.clear()
+        registry.deleteLater()
+        return freed
 
     def normalize_positions(self, page, ctx):
         # Layout page is at (0,0) — ensure that:
@@ -119,14 +528,16 @@ class ExportManager:
             gs = slot.geometry.to(ctx.unit, dpi=ctx.dpi)  # not slot._geometry
             slot.setPos(float(gs.pos.x()), float(gs.pos.y()))
             # content placement policy: put component at (0,0) inside slot
-            comp = slot.content
-            comp.setPos(0, 0)
-            comp.update()
-            # Elements
-            for el in comp.items:
-                ge = el.geometry.to(ctx.unit, dpi=ctx.dpi)
-                el.setPos(float(ge.pos.x()), float(ge.pos.y()))
-                el.update
+            self.normalize_component(slot.content, ctx)
+
+    def normalize_component(self, comp, ctx):
+        comp.setPos(0, 0)
+        comp.update()
+        # Elements
+        for el in comp.items:
+            ge = el.geometry.to(ctx.unit, dpi=ctx.dpi)
+            el.setPos(float(ge.pos.x()), float(ge.pos.y()))
+            el.update
 
 def traverse_export(p: QPainter, item, ctx: RenderContext):
     # 1) Translate to this item's scene position
@@ -2,20 +2,184 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterator, Iterable, List, Optional, Set, Union, Any
+from typing import ClassVar, Dict, FrozenSet, Iterator, Iterable, List, Optional, Set, Tuple, Union, Any
+from array import array
+from bisect import bisect_right
+import codecs
+import hashlib
 import csv
+import io
+import mmap
+import os
+import threading
+import weakref
 
 from prototypyside.utils.valid_path import ValidPath
 from prototypyside.services.proto_class import ProtoClass
+from prototypyside.services.binding_map import BindingMap
 
 pc = ProtoClass
 
+# Sources larger than this are indexed and parsed on demand instead of loaded whole.
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+# Rows with this column are merged that many times (blank/invalid → 1, 0 → skipped).
+QUANTITY_COLUMN = "@qty"
+MAX_QUANTITY = 100_000   # per row; larger values (and "inf") are clamped to it
+
+
 def _validate_path(path: Union[str, Path]) -> Path:
     return ValidPath.file(path, must_exist=True)
 
 
+def _file_stamp(path: Union[str, Path]) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) of `path`, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class QuantityIndex:
+    """
+    Prefix sums over a quantity column: logical card k (0-based) is source row
+    bisect_right(ends, k). Copies are never materialized; memory is 8 bytes/row.
+    """
+
+    def __init__(self, quantities: Iterable[int]):
+        ends = array("Q")
+        total = 0
+        for q in quantities:
+            total += max(0, q)
+            ends.append(total)
+        self._ends = ends
+
+    @classmethod
+    def from_source(cls, source: "CSVData", column: str = QUANTITY_COLUMN) -> "QuantityIndex":
+        return cls(cls.parse(source._full_row(i).get(column, "")) for i in range(source.row_count))
+
+    @staticmethod
+    def parse(value: Any) -> int:
+        if value is None or str(value).strip() == "":
+            return 1
+        try:
+            return min(MAX_QUANTITY, max(0, int(float(value))))
+        except ValueError:
+            return 1
+        except OverflowError:
+            # "inf" or too large to be a count: clamped so the prefix sums stay in range.
+            return 0 if str(value).strip().startswith("-") else MAX_QUANTITY
+
+    @property
+    def total(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def row_for(self, card: int) -> int:
+        if not 0 <= card < self.total:
+            raise IndexError(f"Card {card} out of range (0..{self.total - 1})")
+        return bisect_right(self._ends, card)
+
+    def quantity(self, row: int) -> int:
+        return self._ends[row] - (self._ends[row - 1] if row else 0)
+
+    def cards_for(self, row: int) -> range:
+        return range(self._ends[row - 1] if row else 0, self._ends[row])
+
+
+def _digest(value: Any) -> int:
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass
+class FieldDigests:
+    """One 64-bit digest per (row, @field), stored flat with a stride of len(fields)."""
+    fields: List[str]
+    values: array
+
+    @classmethod
+    def from_source(cls, source: "CSVData") -> "FieldDigests":
+        fields = list(source.at_headers)
+        values = array("Q")
+        for i in range(source.row_count):
+            row = source._full_row(i) or {}
+            values.extend(_digest(row.get(f, "")) for f in fields)
+        return cls(fields, values)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.values) // len(self.fields) if self.fields else 0
+
+    def row(self, i: int) -> Dict[str, int]:
+        n = len(self.fields)
+        return dict(zip(self.fields, self.values[i * n:(i + 1) * n]))
+
+
+@dataclass(frozen=True)
+class MergeDiff:
+    """
+    Per-row, per-@field differences between two versions of a source. Rows are
+    matched by position; rows past the shorter version are added/removed.
+    """
+    changed: Dict[int, FrozenSet[str]]
+    added: range
+    removed: range
+    fields_added: FrozenSet[str] = frozenset()
+    fields_removed: FrozenSet[str] = frozenset()
+    row_count: int = 0
+
+    @classmethod
+    def between(cls, old: FieldDigests, new: FieldDigests) -> "MergeDiff":
+        shared = [f for f in new.fields if f in old.fields]
+        o_idx = {f: n for n, f in enumerate(old.fields)}
+        n_idx = {f: n for n, f in enumerate(new.fields)}
+        o_stride, n_stride = len(old.fields), len(new.fields)
+        common = min(old.row_count, new.row_count)
+        changed: Dict[int, FrozenSet[str]] = {}
+        for i in range(common):
+            ob, nb = i * o_stride, i * n_stride
+            diff = frozenset(f for f in shared
+                             if old.values[ob + o_idx[f]] != new.values[nb + n_idx[f]])
+            if diff:
+                changed[i] = diff
+        return cls(
+            changed=changed,
+            added=range(common, new.row_count),
+            removed=range(common, old.row_count),
+            fields_added=frozenset(set(new.fields) - set(old.fields)),
+            fields_removed=frozenset(set(old.fields) - set(new.fields)),
+            row_count=new.row_count,
+        )
+
+    @classmethod
+    def everything(cls, new: "CSVData") -> "MergeDiff":
+        """Every row of `new` changed: used when the old version can no longer be read."""
+        fields = frozenset(new.at_headers)
+        n = new.row_count
+        return cls(changed={i: fields for i in range(n)}, added=range(n, n), removed=range(n, n), row_count=n)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.changed or self.added or self.removed or self.fields_added or self.fields_removed)
+
+    @property
+    def rows(self) -> Set[int]:
+        """Every row index whose merged output may differ."""
+        if self.fields_added or self.fields_removed:
+            # A column appeared or vanished: any row binding it may render differently.
+            return set(range(max(self.row_count, self.removed.stop)))
+        out = set(self.changed)
+        out.update(self.added)
+        out.update(self.removed)
+        return out
+
+
 @dataclass
 class CSVData:
+    # Sources that read rows from the file on demand (rather than holding them)
+    # cannot read their old contents once the file is rewritten in place.
+    reads_on_demand: ClassVar[bool] = False
+
     path: Union[str, Path]
 
     headers: List[str] = field(init=False, default_factory=list)
@@ -23,15 +187,22 @@ class CSVData:
     _rows: List[Dict[str, str]] = field(init=False, default_factory=list)
     _idx: int = field(init=False, default=0)
     _dialect: Optional[str] = field(init=False, default=None)
+    _projection: Optional[Set[str]] = field(init=False, default=None)
+    _quantities: Optional[QuantityIndex] = field(init=False, default=None, repr=False)
+    _digests: Optional[FieldDigests] = field(init=False, default=None, repr=False)
+    _stamp: Optional[Tuple[int, int, int]] = field(init=False, default=None, repr=False)
+    # Guards lazy state (projection, indexes) when export jobs share a source across threads.
+    _lock: Any = field(init=False, default_factory=threading.RLock, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.path = _validate_path(self.path)
+        self._stamp = _file_stamp(self.path)
         self._load_csv()
 
     # ---------------------------
     # Loading & validation
     # ---------------------------
-    def _load_csv(self) -> None:
+    def _sniff(self) -> csv.Dialect:
         with self.path.open("r", newline="", encoding="utf-8-sig") as fh:
             sample = fh.read(4096)
         if not sample.strip():
@@ -43,16 +214,21 @@ class CSVData:
             self._dialect = getattr(dialect, "_name", None)
         except Exception:
             dialect = csv.excel
+        return dialect
 
+    def _set_headers(self, fieldnames: Optional[List[str]]) -> None:
+        if not fieldnames or any(h is None or str(h).strip() == "" for h in fieldnames):
+            raise ValueError("CSV has missing or empty header names.")
+        self.headers = [str(h) for h in fieldnames]
+        self.at_headers = [h for h in self.headers if h.startswith("@")]
+
+    def _load_csv(self) -> None:
+        dialect = self._sniff()
         with self.path.open("r", newline="", encoding="utf-8-sig") as fh:
             reader = csv.DictReader(fh, dialect=dialect)
-            if not reader.fieldnames or any(h is None or str(h).strip() == "" for h in reader.fieldnames):
-                raise ValueError("CSV has missing or empty header names.")
-            self.headers = [str(h) for h in reader.fieldnames]
+            self._set_headers(reader.fieldnames)
             self._rows = [{k: (v if v is not None else "") for k, v in row.items()} for row in reader]
 
-        self.at_headers = [h for h in self.headers if h.startswith("@")]
-
     # ---------------------------
     # Properties & basic info
     # ---------------------------
@@ -62,53 +238,124 @@ class CSVData:
 
     @property
     def remaining(self) -> int:
-        return max(0, self.row_count - self._idx)
+        return max(0, self.card_count - self._idx)
+
+    @property
+    def fields(self) -> List[str]:
+        """@-columns handed to components; narrowed by project_for()."""
+        if self._projection is None:
+            return self.at_headers
+        return [h for h in self.at_headers if h in self._projection]
+
+    def project_for(self, template: Any, tokens: Optional[Iterable[str]] = None) -> None:
+        """
+        Restrict row dicts to the @-columns `template` binds (accumulates across
+        templates). `tokens` (e.g. TemplateBindings.tokens) skips walking the template.
+        """
+        names = set(tokens) if tokens is not None else self._collect_template_at_names(template)
+        with self._lock:
+            self._projection = (self._projection or set()) | names
+
+    @property
+    def quantities(self) -> Optional[QuantityIndex]:
+        """Prefix-sum index over QUANTITY_COLUMN, built on first use; None without the column."""
+        if self._quantities is None and QUANTITY_COLUMN in self.headers:
+            with self._lock:
+                if self._quantities is None:
+                    self._quantities = QuantityIndex.from_source(self)
+        return self._quantities
+
+    @property
+    def readable_as_opened(self) -> bool:
+        """
+        False when this source reads rows on demand and its file has changed
+        (inode, mtime or size) since it was opened: what it would read now is
+        no longer the version that was merged.
+        """
+        if not self.reads_on_demand or self._stamp is None:
+            return True
+        return _file_stamp(self.path) == self._stamp
+
+    @property
+    def digests(self) -> FieldDigests:
+        """Per-row, per-@field digests, built on first use (only when a reload diffs)."""
+        if self._digests is None:
+            with self._lock:
+                if self._digests is None:
+                    self._digests = FieldDigests.from_source(self)
+        return self._digests
+
+    @property
+    def card_count(self) -> int:
+        """Cards to merge: row_count expanded by the quantity column, if present."""
+        q = self.quantities
+        return q.total if q is not None else self.row_count
+
+    def cards_for(self, row: int) -> range:
+        """Logical cards produced by source row `row`."""
+        q = self.quantities
+        return q.cards_for(row) if q is not None else range(row, row + 1)
+
+    def card_row(self, card: int) -> int:
+        """Source row for logical card `card` (O(log n) with quantities)."""
+        q = self.quantities
+        return q.row_for(card) if q is not None else card
 
     def has_next(self) -> bool:
-        return self._idx < self.row_count
+        # The cursor walks cards, so quantity rows repeat without being copied.
+        return self._idx < self.card_count
 
     def reset(self) -> None:
         self._idx = 0
 
+    def _full_row(self, i: int) -> Dict[str, str]:
+        return self._rows[i]
+
+    def close(self) -> None:
+        """Release file handles; in-memory sources hold none."""
+
     # ---------------------------
     # Row access (ONLY @-columns)
     # ---------------------------
+    def row(self, i: int) -> Dict[str, str]:
+        if not 0 <= i < self.row_count:
+            raise IndexError(f"Row {i} out of range (0..{self.row_count - 1})")
+        fields = self.fields
+        if not fields:
+            return {}
+        row = self._full_row(i)
+        return {h: row.get(h, "") for h in fields}
+
     def iter_rows(self) -> Iterator[Dict[str, str]]:
-        if not self.at_headers:
-            for _ in self._rows:
-                yield {}
-            return
-        for row in self._rows:
-            yield {h: row.get(h, "") for h in self.at_headers}
+        for i in range(self.row_count):
+            yield self.row(i)
 
     def next_row(self) -> Dict[str, str]:
         if not self.has_next():
             raise StopIteration("No remaining CSV rows.")
-        row = self._rows[self._idx]
+        row = self.row(self.card_row(self._idx))
         self._idx += 1
-        if not self.at_headers:
-            return {}
-        return {h: row.get(h, "") for h in self.at_headers}
+        return row
 
     # ---------------------------
     # Full row access (if needed)
     # ---------------------------
     def iter_full_rows(self) -> Iterator[Dict[str, str]]:
-        for row in self._rows:
-            yield dict(row)
+        for i in range(self.row_count):
+            yield dict(self._full_row(i))
 
     def next_full_row(self) -> Dict[str, str]:
         if not self.has_next():
             raise StopIteration("No remaining CSV rows.")
-        row = dict(self._rows[self._idx])
+        row = dict(self._full_row(self.card_row(self._idx)))
         self._idx += 1
         return row
 
     # ---------------------------
     # Template comparison
     # ---------------------------
-    def compare_template_bindings(self, template: Any) -> Dict[str, str]:
-        element_tokens = self._collect_template_at_names(template)
+    def compare_template_bindings(self, template: Any, tokens: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        element_tokens = set(tokens) if tokens is not None else self._collect_template_at_names(template)
         csv_tokens = set(self.at_headers)
         all_tokens = element_tokens | csv_tokens
         out: Dict[str, str] = {}
@@ -140,36 +387,230 @@ class CSVData:
         return tokens
 
 
+@dataclass
+class StreamingCSVData(CSVData):
+    """
+    CSVData for very large sources. One pass over a memory map records the byte
+    offset of every row start; rows are then parsed on demand, so memory stays at
+    8 bytes per row no matter how wide the file is.
+    """
+    reads_on_demand: ClassVar[bool] = True
+
+    _offsets: array = field(init=False, default_factory=lambda: array("Q"))
+    _csv_dialect: Any = field(init=False, default=None)
+    _column_index: Dict[str, int] = field(init=False, default_factory=dict)
+    _fh: Any = field(init=False, default=None, repr=False)
+    _mm: Optional[mmap.mmap] = field(init=False, default=None, repr=False)
+
+    def _load_csv(self) -> None:
+        self._csv_dialect = self._sniff()
+        self._fh = self.path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        quote = (getattr(self._csv_dialect, "quotechar", None) or '"').encode("utf-8")
+
+        pos = 3 if mm[:3] == codecs.BOM_UTF8 else 0
+        header_end = self._record_end(mm, pos, quote)
+        header = mm[pos:header_end].decode("utf-8")
+        self._set_headers(next(csv.reader([header], dialect=self._csv_dialect), None))
+        self._column_index = {h: n for n, h in enumerate(self.headers)}
+
+        offsets = array("Q")
+        pos = header_end
+        size = len(mm)
+        while pos < size:
+            end = self._record_end(mm, pos, quote)
+            if mm[pos:end].strip():  # DictReader skips blank lines too
+                offsets.append(pos)
+            pos = end
+        offsets.append(size)  # sentinel: end of the last row
+        self._offsets = offsets
+
+    @staticmethod
+    def _record_end(mm: mmap.mmap, start: int, quote: bytes) -> int:
+        """Offset just past the newline ending the record at `start` (quoted newlines skipped)."""
+        pos, quotes = start, 0
+        size = len(mm)
+        while True:
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                return size
+            quotes += mm[pos:nl].count(quote)
+            if quotes % 2 == 0:
+                return nl + 1
+            pos = nl + 1
+
+    @property
+    def row_count(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        raw = self._mm[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+        values = next(csv.reader(io.StringIO(raw, newline=""), dialect=self._csv_dialect), [])
+        return {h: (values[n] if n < len(values) else "") for n, h in enumerate(self.headers)}
+
+    def row(self, i: int) -> Dict[str, str]:
+        if not 0 <= i < self.row_count:
+            raise IndexError(f"Row {i} out of range (0..{self.row_count - 1})")
+        fields = self.fields
+        if not fields:
+            return {}
+        raw = self._mm[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+        values = next(csv.reader(io.StringIO(raw, newline=""), dialect=self._csv_dialect), [])
+        out = {}
+        for h in fields:
+            n = self._column_index[h]
+            out[h] = values[n] if n < len(values) else ""
+        return out
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
 class MergeManager:
     """
     Lookups by PID (preferred) or by str(csv_path).
+    Sources are any MergeSource (see merge_sources); CSV remains the default.
     Fails silently when sources are missing or exhausted.
+
+    All state is per instance. Exports take a MergeJob (see job()) so their
+    cursors never touch the manager's or another job's.
     """
-    _map: Dict[str, CSVData] = {}
+    def __init__(self):
+        self._map: Dict[str, CSVData] = {}
+        self.last_diffs: Dict[str, MergeDiff] = {}
+        self.last_errors: Dict[str, str] = {}   # key → why add_path could not open it
+        self._store = None  # MergeStore, opened on first query
+        self.bindings = BindingMap()  # template @field analysis, shared with ImportPanel
+        self._lock = threading.RLock()
+        self._jobs: "weakref.WeakSet[MergeJob]" = weakref.WeakSet()
 
-    def add_path(self, path: Union[str, Path], pid: Optional[str] = None) -> None:
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                # Imported here: merge_store builds on CSVData from this module.
+                from prototypyside.services.merge_store import MergeStore
+                self._store = MergeStore()
+            return self._store
+
+    def job(self) -> "MergeJob":
+        """A private view of the current sources for one export; close() it when done."""
+        job = MergeJob(self)
+        with self._lock:
+            self._jobs.add(job)
+        return job
+
+    def _release(self, source) -> None:
+        """Close a replaced source once no running job still reads from it."""
+        with self._lock:
+            if any(s is source for s in self._map.values()):
+                return
+            if any(job.holds(source) for job in self._jobs):
+                return
+        source.close()
+
+    def add_path(self, path: Union[str, Path], pid: Optional[str] = None, **options) -> Optional[CSVData]:
+        """
+        Open and register `path`. Returns the source, or None when it could not
+        be opened; the reason is kept in last_errors[key] for the caller to show.
+        """
+        # Imported here: the adapters build on CSVData from this module.
+        from prototypyside.services.merge_sources import open_merge_source
+        key = pid or str(Path(path))
         try:
-            csv_data = CSVData(path)
+            source = open_merge_source(path, **options)
+        except Exception as e:
+            self.last_errors[key] = str(e) or type(e).__name__
+            print(f"[MERGE] Could not open {path}: {self.last_errors[key]}")
+            return None
+        self.last_errors.pop(key, None)
+        self._replace(key, source)
+        return source
+
+    def _replace(self, key: str, source) -> Optional[MergeDiff]:
+        with self._lock:
+            old = self._map.get(key)
+            diff = None
+            if old is not None and old is not source:
+                # Diff against what was merged before so callers can re-render only what
+                # changed. Digests are only built here, on a reload, never on first import.
+                if old.readable_as_opened:
+                    diff = MergeDiff.between(old.digests, source.digests)
+                else:
+                    diff = MergeDiff.everything(source)
+                source._projection = old._projection
+                self.bindings.forget_source(old)
+            self._map[key] = source
+            if diff is not None:
+                self.last_diffs[key] = diff
+        if old is not None and old is not source:
+            self._release(old)
+        return diff
+
+    def reload(self, key: Union[str, Path], **options) -> Optional[MergeDiff]:
+        """
+        Re-read the source registered under `key` (pid or path) and return what
+        changed per row and @field, or None if nothing was registered.
+        """
+        from prototypyside.services.merge_sources import open_merge_source
+        old = self._map.get(str(key)) or self.lookup_path(key)
+        if old is None:
+            return None
+        old_key = next(k for k, v in self._map.items() if v is old)
+        try:
+            source = open_merge_source(old.path, **options)
         except Exception:
-            # Fail silently per policy
-            return
+            return None
+        return self._replace(old_key, source)
+
+    def set_query(self, path: Union[str, Path], query, per_page: int = 0, pid: Optional[str] = None) -> Optional[CSVData]:
+        """
+        Drive merging of `path` by a MergeQuery (filter/sort/group) instead of file order.
+        The CSV is imported into the local store once; later queries reuse it.
+        `per_page` pads each group to whole pages when the query groups.
+        """
+        from prototypyside.services.merge_store import QueryCursor
+        try:
+            cursor = QueryCursor(path, store=self.store, query=query, per_page=per_page)
+        except (OSError, ValueError) as e:
+            print(f"[MERGE] Query on {path} failed: {e}")
+            return None
         key = pid or str(Path(path))
-        self._map[key] = csv_data
+        with self._lock:
+            old = self._map.get(key)
+            if old is not None:
+                self.bindings.forget_source(old)
+            self._map[key] = cursor
+        if old is not None:
+            self._release(old)
+        return cursor
 
     def lookup(self, comp: Any) -> Optional[CSVData]:
         if hasattr(comp, "csv_path"):
-            key = str(comp.csv_path)
-            # Direct match
-            csvdata_obj = self._map.get(key)
-            if csvdata_obj:
-                return csvdata_obj
-
-            # Try path equivalence
-            path = ValidPath.file(comp.csv_path, must_exist=True)
-            if path:
-                for csvdata_obj in self._map.values():
-                    if Path(csvdata_obj.path) == path:
-                        return csvdata_obj
+            return self.lookup_path(comp.csv_path)
+        return None
+
+    def lookup_path(self, csv_path: Union[str, Path, None]) -> Optional[CSVData]:
+        if not csv_path:
+            return None
+        key = str(csv_path)
+        # Direct match
+        csvdata_obj = self._map.get(key)
+        if csvdata_obj:
+            return csvdata_obj
+
+        # Try path equivalence
+        path = ValidPath.file(csv_path, must_exist=True)
+        if path:
+            for csvdata_obj in self._map.values():
+                if Path(csvdata_obj.path) == path:
+                    return csvdata_obj
         return None
 
     def count_all_rows(self, layout) -> int:
@@ -185,16 +626,42 @@ class MergeManager:
         for slot in items:
             if not slot:
                 continue
-            comp = getattr(slot, "content", None)
-            if not comp:
-                continue
-            csv_data = self.lookup(comp)  # must be an instance method
+            # Peek at the csv path so counting pages never hydrates slot content.
+            if hasattr(slot, "content_csv_path"):
+                csv_data = self.lookup_path(slot.content_csv_path)
+            else:
+                comp = getattr(slot, "content", None)
+                if not comp:
+                    continue
+                csv_data = self.lookup(comp)  # must be an instance method
             if not csv_data:
                 continue
-            # Expecting CSVData to expose row_count (or len(rows))
-            total += getattr(csv_data, "row_count", len(getattr(csv_data, "rows", [])))
+            # Quantity-expanded when the source has a QUANTITY_COLUMN
+            total += getattr(csv_data, "card_count", getattr(csv_data, "row_count", 0))
         return total
 
+    def set_csv_content_for_page(self, layout_page, planner, page_index: int):
+        """
+        Populate the slots of a cloned layout page with the rows `planner` assigns
+        to `page_index`. Uses random access only, so pages can be merged in any order.
+        """
+        for s, slot in enumerate(layout_page.items):
+            source = planner.source(s)
+            if source is None or not slot.content:
+                continue
+            tb = self.bindings.get(slot.content)
+            if source._projection is None:
+                source.project_for(slot.content, tb.tokens if tb else None)
+            bound, row = planner.row_for(page_index, s)
+            if not bound:
+                continue
+            if row is None:
+                # Group padding from a query: this slot stays blank on the page.
+                slot.clear_content()
+                continue
+            slot.content = slot.content.set_csv_content(row, tb.plan(source) if tb else None)
+        return layout_page
+
     def set_csv_content_for_next_page(self, layout_page):
         """
         Populate the slots in a cloned layout page with the next rows of CSV.
@@ -206,11 +673,97 @@ class MergeManager:
                 continue
             comp = slot.content
             csv_data = self.lookup(comp)
-            if csv_data and csv_data.has_next():
+            tb = self.bindings.get(comp) if csv_data else None
+            if csv_data and csv_data._projection is None:
+                csv_data.project_for(comp, tb.tokens if tb else None)
+            if csv_data and self._has_next(csv_data):
                 # No CSV attached to this component; leave content untouched
-                row = csv_data.next_row()  # replace with your actual "get and advance" API
-                updated_comp = comp.set_csv_content(row)
+                row = self._next_row(csv_data)
+                if row is None:
+                    # Group padding from a query: this slot stays blank on the page.
+                    slot.clear_content()
+                    continue
+                updated_comp = comp.set_csv_content(row, tb.plan(csv_data) if tb else None)
                 # set_csv_content returns self; assignment is optional but harmless
                 slot.content = updated_comp
         return layout_page
 
+    # ---------------------------
+    # Cursor (the sources' own; MergeJob keeps private ones)
+    # ---------------------------
+    def _has_next(self, source) -> bool:
+        return source.has_next()
+
+    def _next_row(self, source):
+        return source.next_row()
+
+
+class MergeJob(MergeManager):
+    """
+    One export's view of a MergeManager: the sources registered when the job
+    started, plus cursors of its own. Row data is shared and read-only, so jobs
+    running side by side (in any threads) merge identically and independently.
+    Sources the manager replaces meanwhile stay open until the job is closed.
+    """
+    def __init__(self, manager: MergeManager):
+        self.manager = manager
+        with manager._lock:
+            self._map = dict(manager._map)
+        self.last_diffs = manager.last_diffs
+        self.last_errors = manager.last_errors
+        self.bindings = manager.bindings
+        self._lock = threading.RLock()
+        self._cursors: Dict[int, int] = {}
+        self.closed = False
+
+    @property
+    def store(self):
+        return self.manager.store
+
+    def job(self) -> "MergeJob":
+        return self.manager.job()
+
+    def holds(self, source) -> bool:
+        return not self.closed and any(s is source for s in self._map.values())
+
+    # Every method that registers a source raises before touching the map (or
+    # opening anything): a job never owns _jobs, so nothing it replaced could be released.
+    @staticmethod
+    def _fixed(*_args, **_kwargs):
+        raise RuntimeError("A MergeJob's sources are fixed; add sources to its MergeManager.")
+
+    add_path = _fixed
+    reload = _fixed
+    set_query = _fixed
+    _replace = _fixed
+
+    def _has_next(self, source) -> bool:
+        return self._cursors.get(id(source), 0) < source.card_count
+
+    def _next_row(self, source):
+        key = id(source)
+        with self._lock:
+            idx = self._cursors.get(key, 0)
+            if idx >= source.card_count:
+                raise StopIteration("No remaining CSV rows.")
+            self._cursors[key] = idx + 1
+        return source.row(source.card_row(idx))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cursors.clear()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        sources = list(self._map.values())
+        self._map = {}
+        for source in sources:
+            self.manager._release(source)
+
+    def __enter__(self) -> "MergeJob":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,358 @@
+# prototypyside/services/merge_sources.py
+"""
+Merge source adapters.
+
+Anything MergeManager merges from implements MergeSource. CSVData is the shared
+base: it provides the cursor (has_next/next_row/reset), @-column projection and
+template comparison, so an adapter only has to supply headers, row_count and
+_full_row(i). Every adapter here indexes or streams its source rather than
+loading it whole.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import sqlite3
+import threading
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Protocol, Union, runtime_checkable
+
+from prototypyside.services.merge_manager import (
+    CSVData, StreamingCSVData, STREAMING_THRESHOLD, _validate_path
+)
+
+
+@runtime_checkable
+class MergeSource(Protocol):
+    path: Path
+    headers: List[str]
+    at_headers: List[str]
+
+    @property
+    def row_count(self) -> int: ...
+    @property
+    def remaining(self) -> int: ...
+    def row(self, i: int) -> Optional[Dict[str, str]]: ...
+    def iter_rows(self) -> Iterator[Optional[Dict[str, str]]]: ...
+    def has_next(self) -> bool: ...
+    def next_row(self) -> Optional[Dict[str, str]]: ...
+    def reset(self) -> None: ...
+    def project_for(self, template: Any, tokens: Optional[Iterable[str]] = None) -> None: ...
+    def compare_template_bindings(self, template: Any, tokens: Optional[Iterable[str]] = None) -> Dict[str, str]: ...
+    def close(self) -> None: ...
+
+
+def _cell(value: Any) -> str:
+    """Render a source value the way a CSV cell would read."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _collect_keys(records) -> List[str]:
+    """Every key used by any record, in first-seen order (a key may first appear late)."""
+    keys: Dict[str, None] = {}
+    for rec in records:
+        if isinstance(rec, dict):
+            keys.update(dict.fromkeys(str(k) for k in rec))
+    return list(keys)
+
+
+# ---------------- JSON Lines ---------------- #
+
+@dataclass
+class JSONLData(CSVData):
+    """One JSON object per line; rows are found by a byte-offset index."""
+    reads_on_demand: ClassVar[bool] = True
+
+    _offsets: array = field(init=False, default_factory=lambda: array("Q"))
+    _fh: Any = field(init=False, default=None, repr=False)
+    _mm: Optional[mmap.mmap] = field(init=False, default=None, repr=False)
+
+    def _load_csv(self) -> None:
+        if self.path.stat().st_size == 0:
+            raise ValueError("JSONL file is empty.")
+        self._fh = self.path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        mm, size, pos = self._mm, len(self._mm), 0
+        offsets = array("Q")
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            end = size if nl < 0 else nl + 1
+            if mm[pos:end].strip():
+                offsets.append(pos)
+            pos = end
+        offsets.append(size)
+        self._offsets = offsets
+        self._set_headers(_collect_keys(self._record(i) for i in range(self.row_count)))
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        rec = json.loads(self._mm[self._offsets[i]:self._offsets[i + 1]])
+        return rec if isinstance(rec, dict) else {}
+
+    @property
+    def row_count(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        rec = self._record(i)
+        return {h: _cell(rec.get(h)) for h in self.headers}
+
+    def close(self) -> None:
+        StreamingCSVData.close(self)
+
+
+# ---------------- JSON array ---------------- #
+
+_JSON_STRUCT = re.compile(rb'[\[\]{}"]')
+_JSON_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+@dataclass
+class JSONArrayData(CSVData):
+    """
+    A top-level JSON array of objects. One structural scan records where each
+    element starts and ends, so rows are decoded individually on demand.
+    """
+    reads_on_demand: ClassVar[bool] = True
+
+    _spans: array = field(init=False, default_factory=lambda: array("Q"))
+    _fh: Any = field(init=False, default=None, repr=False)
+    _mm: Optional[mmap.mmap] = field(init=False, default=None, repr=False)
+
+    def _load_csv(self) -> None:
+        if self.path.stat().st_size == 0:
+            raise ValueError("JSON file is empty.")
+        self._fh = self.path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        spans = array("Q")
+        depth, start, pos = 0, 0, 0
+        while True:
+            m = _JSON_STRUCT.search(mm, pos)
+            if m is None:
+                break
+            ch, pos = m.group(), m.end()
+            if ch == b'"':
+                tail = _JSON_STRING_TAIL.match(mm, pos)
+                if tail is None:
+                    raise ValueError("Unterminated string in JSON source.")
+                pos = tail.end()
+                continue
+            if ch in (b"[", b"{"):
+                if depth == 1:
+                    start = m.start()
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1:
+                    spans.extend((start, pos))
+                elif depth == 0:
+                    break
+        if not spans and depth != 0:
+            raise ValueError("JSON source must be an array of objects.")
+        self._spans = spans
+        self._set_headers(_collect_keys(self._record(i) for i in range(self.row_count)))
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        rec = json.loads(self._mm[self._spans[2 * i]:self._spans[2 * i + 1]])
+        return rec if isinstance(rec, dict) else {}
+
+    @property
+    def row_count(self) -> int:
+        return len(self._spans) // 2
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        rec = self._record(i)
+        return {h: _cell(rec.get(h)) for h in self.headers}
+
+    def close(self) -> None:
+        StreamingCSVData.close(self)
+
+
+# ---------------- XLSX ---------------- #
+
+@dataclass
+class XLSXData(CSVData):
+    """
+    First (or named) worksheet of an .xlsx workbook, read with openpyxl's
+    read-only streaming reader. Forward access is O(1) per row; stepping
+    backwards restarts the stream.
+    """
+    reads_on_demand: ClassVar[bool] = True
+
+    sheet: Optional[str] = None
+    _wb: Any = field(init=False, default=None, repr=False)
+    _ws: Any = field(init=False, default=None, repr=False)
+    _iter: Optional[Iterator] = field(init=False, default=None, repr=False)
+    _pos: int = field(init=False, default=0)
+    _count: int = field(init=False, default=0)
+    _last: Optional[tuple] = field(init=False, default=None, repr=False)
+
+    def _load_csv(self) -> None:
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise ValueError("Reading .xlsx sources requires openpyxl.") from e
+        self._wb = load_workbook(str(self.path), read_only=True, data_only=True)
+        self._ws = self._wb[self.sheet] if self.sheet else self._wb.worksheets[0]
+        header = next(self._ws.iter_rows(min_row=1, max_row=1, values_only=True), None)
+        self._set_headers([_cell(h) for h in (header or ())])
+        max_row = self._ws.max_row
+        if max_row is None:
+            # No dimension record: count by streaming once.
+            max_row = sum(1 for _ in self._ws.iter_rows(values_only=True))
+        self._count = max(0, max_row - 1)
+        self._rewind()
+
+    def _rewind(self) -> None:
+        self._iter = self._ws.iter_rows(min_row=2, values_only=True)
+        self._pos = 0
+        self._last = None
+
+    @property
+    def row_count(self) -> int:
+        return self._count
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        # The worksheet stream has one position; concurrent jobs take turns.
+        with self._lock:
+            return self._stream_row(i)
+
+    def _stream_row(self, i: int) -> Dict[str, str]:
+        if self._last is not None and i == self._pos - 1:
+            values = self._last
+        else:
+            if i < self._pos:
+                self._rewind()
+            values = ()
+            while self._pos <= i:
+                values = next(self._iter, ())
+                self._pos += 1
+            self._last = values
+        return {h: _cell(values[n]) if n < len(values) else "" for n, h in enumerate(self.headers)}
+
+    def close(self) -> None:
+        if self._wb is not None:
+            self._wb.close()
+            self._wb = None
+
+
+# ---------------- SQLite ---------------- #
+
+@dataclass
+class SQLiteData(CSVData):
+    """
+    A table (default: the first one) in a SQLite database, fetched by rowid.
+    Each thread reads through its own read-only connection.
+    """
+    reads_on_demand: ClassVar[bool] = True
+
+    table: Optional[str] = None
+    _local: Any = field(init=False, default_factory=threading.local, repr=False, compare=False)
+    _conns: List[Any] = field(init=False, default_factory=list, repr=False)
+    _quoted: str = field(init=False, default="")
+    _rowids: array = field(init=False, default_factory=lambda: array("q"))
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # as_uri() percent-quotes the path, so '?', '#' and '%' in it stay part of the name.
+            uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def _load_csv(self) -> None:
+        # Rows are fetched by rowid, so only rowid tables can be sources (not views
+        # or WITHOUT ROWID tables).
+        if not self.table:
+            row = self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                raise ValueError("SQLite source has no tables.")
+            self.table = row[0]
+        kind = self._conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ?", (self.table,)).fetchone()
+        if kind is None:
+            raise ValueError(f"SQLite source has no table {self.table!r}.")
+        if kind[0] != "table":
+            raise ValueError(f"{self.table!r} is a {kind[0]}; SQLite merge sources must be tables.")
+        self._quoted = '"' + self.table.replace('"', '""') + '"'
+        cur = self._conn.execute(f"SELECT * FROM {self._quoted} LIMIT 0")
+        self._set_headers([d[0] for d in cur.description])
+        # Row ids are 8 bytes each; everything else stays in the database.
+        try:
+            rowids = self._conn.execute(f"SELECT rowid FROM {self._quoted} ORDER BY rowid")
+        except sqlite3.OperationalError:
+            raise ValueError(f"Table {self.table!r} has no rowid (WITHOUT ROWID); it cannot be a merge source.")
+        self._rowids = array("q", (r[0] for r in rowids))
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rowids)
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        cur = self._conn.execute(f"SELECT * FROM {self._quoted} WHERE rowid = ?", (self._rowids[i],))
+        values = cur.fetchone() or ()
+        return {h: _cell(values[n]) if n < len(values) else "" for n, h in enumerate(self.headers)}
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+
+# ---------------- factory ---------------- #
+
+SOURCE_TYPES = {
+    ".csv": "csv", ".tsv": "csv", ".txt": "csv",
+    ".jsonl": "jsonl", ".ndjson": "jsonl",
+    ".json": "json",
+    ".xlsx": "xlsx", ".xlsm": "xlsx",
+    ".sqlite": "sqlite", ".sqlite3": "sqlite", ".db": "sqlite",
+}
+
+SOURCE_FILTER = (
+    "Merge Sources (*.csv *.tsv *.txt *.jsonl *.ndjson *.json *.xlsx *.xlsm *.sqlite *.sqlite3 *.db);;"
+    "CSV Files (*.csv *.tsv *.txt);;JSON (*.json *.jsonl *.ndjson);;Excel (*.xlsx *.xlsm);;"
+    "SQLite (*.sqlite *.sqlite3 *.db);;All Files (*)"
+)
+
+
+def open_merge_source(path: Union[str, Path], **options) -> MergeSource:
+    """
+    Open `path` with the adapter matching its extension. `options` are passed to
+    the adapter (e.g. sheet= for XLSX, table= for SQLite).
+    """
+    p = _validate_path(path)
+    if not p:
+        raise FileNotFoundError(str(path))
+    kind = SOURCE_TYPES.get(p.suffix.lower(), "csv")
+    if kind == "jsonl":
+        return JSONLData(p)
+    if kind == "json":
+        return JSONArrayData(p)
+    if kind == "xlsx":
+        return XLSXData(p, sheet=options.get("sheet"))
+    if kind == "sqlite":
+        return SQLiteData(p, table=options.get("table"))
+    if p.stat().st_size > STREAMING_THRESHOLD:
+        return StreamingCSVData(p)
+    return CSVData(p)
@@ -0,0 +1,399 @@
+# prototypyside/services/merge_store.py
+"""
+SQLite-backed merge data.
+
+A CSV source is imported once into a local table (re-imported only when the
+file's mtime or size changes). Pagination is then driven by a MergeQuery:
+
+    MergeQuery(where='@type = Combat and @power >= 3', order_by='@power desc, @name',
+               group_by='@faction')
+
+Values are stored as text so merged content is byte-for-byte what the CSV had;
+comparisons against numeric literals and sorting treat numeric-looking values
+as numbers.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from math import ceil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from PySide6.QtCore import QStandardPaths
+
+from prototypyside.services.merge_manager import CSVData, StreamingCSVData, _validate_path
+
+
+def default_store_path() -> Path:
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    root = Path(base) if base else Path.home() / ".cache" / "prototypyside"
+    root.mkdir(parents=True, exist_ok=True)
+    return root / "merge_store.sqlite"
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _is_number(text: Any) -> bool:
+    if text is None:
+        return False
+    try:
+        float(text)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _numeric_sort(col: str) -> List[str]:
+    # Numbers first (in numeric order), then everything else as text.
+    return [f"NOT is_num({col})", f"CAST({col} AS REAL)", col]
+
+
+# ---------------- query parsing ---------------- #
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<col>@[\w\-.]+)
+      | (?P<op>!=|<=|>=|=|<|>|~|\bnot\s+in\b|\bin\b)
+      | (?P<bool>\band\b|\bor\b)
+      | (?P<paren>[(),])
+      | "(?P<dq>(?:[^"]|"")*)"
+      | '(?P<sq>(?:[^']|'')*)'
+      | (?P<word>[^\s(),=<>!~]+)
+    )""", re.IGNORECASE | re.VERBOSE)
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str]]:
+    out, pos = [], 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _TOKEN.match(expr, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Cannot parse filter near: {expr[pos:]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        val = m.group(kind)
+        if kind == "dq":
+            kind, val = "str", val.replace('""', '"')
+        elif kind == "sq":
+            kind, val = "str", val.replace("''", "'")
+        elif kind in ("op", "bool"):
+            val = " ".join(val.lower().split())
+        out.append((kind, val))
+    return out
+
+
+def compile_filter(expr: str, columns: Sequence[str]) -> Tuple[str, List[Any], List[str]]:
+    """
+    Turn `@col op value [and|or ...]` into a parameterized WHERE clause.
+    Returns (sql, params, referenced_columns). Bare words and quoted strings are
+    values; ops are = != < <= > >= ~ (contains), in, not in.
+    """
+    tokens = _tokenize(expr or "")
+    if not tokens:
+        return "", [], []
+    known = set(columns)
+    sql: List[str] = []
+    params: List[Any] = []
+    used: List[str] = []
+    i = 0
+
+    def value(tok) -> Tuple[str, bool]:
+        kind, val = tok
+        if kind not in ("word", "str"):
+            raise ValueError(f"Expected a value, got {val!r}")
+        return val, kind == "word" and _is_number(val)
+
+    while i < len(tokens):
+        kind, val = tokens[i]
+        if kind == "bool":
+            if not sql or sql[-1] in ("AND", "OR"):
+                raise ValueError(f"Dangling {val!r} in filter")
+            sql.append(val.upper())
+            i += 1
+            continue
+        if kind != "col":
+            raise ValueError(f"Expected an @column, got {val!r}")
+        if val not in known:
+            raise ValueError(f"Unknown column {val!r}")
+        col = _ident(val)
+        used.append(val)
+        if i + 2 > len(tokens) or tokens[i + 1][0] != "op":
+            raise ValueError(f"Expected an operator after {val}")
+        op = tokens[i + 1][1]
+        i += 2
+        if op in ("in", "not in"):
+            if i >= len(tokens) or tokens[i] != ("paren", "("):
+                raise ValueError(f"Expected '(' after {op}")
+            i += 1
+            vals = []
+            while i < len(tokens) and tokens[i] != ("paren", ")"):
+                if tokens[i] != ("paren", ","):
+                    vals.append(value(tokens[i])[0])
+                i += 1
+            i += 1
+            if not vals:
+                raise ValueError(f"Empty list after {op}")
+            sql.append(f"{col} {op.upper()} ({', '.join('?' * len(vals))})")
+            params.extend(vals)
+            continue
+        if i >= len(tokens):
+            raise ValueError(f"Expected a value after {val} {op}")
+        v, numeric = value(tokens[i])
+        i += 1
+        if op == "~":
+            sql.append(f"{col} LIKE ? ESCAPE '\\'")
+            params.append("%" + v.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        elif numeric:
+            sql.append(f"(is_num({col}) AND CAST({col} AS REAL) {'<>' if op == '!=' else op} ?)")
+            params.append(float(v))
+        else:
+            sql.append(f"{col} {'<>' if op == '!=' else op} ?")
+            params.append(v)
+    if sql and sql[-1] in ("AND", "OR"):
+        raise ValueError("Filter ends with a dangling and/or")
+    return " ".join(sql), params, used
+
+
+def compile_order(expr: str, columns: Sequence[str]) -> Tuple[str, List[str]]:
+    parts, used = [], []
+    for chunk in (expr or "").split(","):
+        words = chunk.split()
+        if not words:
+            continue
+        name = words[0]
+        if name not in columns:
+            raise ValueError(f"Unknown sort column {name!r}")
+        direction = words[1].upper() if len(words) > 1 else "ASC"
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Bad sort direction {words[1]!r}")
+        col = _ident(name)
+        parts.extend(f"{p} {direction}" for p in _numeric_sort(col))
+        used.append(name)
+    return ", ".join(parts), used
+
+
+@dataclass(frozen=True)
+class MergeQuery:
+    where: str = ""
+    order_by: str = ""
+    group_by: str = ""
+
+    @property
+    def is_trivial(self) -> bool:
+        return not (self.where or self.order_by or self.group_by)
+
+
+# ---------------- store ---------------- #
+
+class MergeStore:
+    """
+    One SQLite connection per thread (WAL lets readers run alongside a writer);
+    imports are serialized by a lock.
+    """
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        self.db_path = Path(db_path) if db_path else default_store_path()
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            " path TEXT PRIMARY KEY, mtime REAL, size INTEGER, tbl TEXT, headers TEXT)"
+        )
+        self._conn.commit()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can reach every thread's connection.
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.create_function("is_num", 1, _is_number, deterministic=True)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+    # ---------------------------
+    # Import
+    # ---------------------------
+    def import_csv(self, path: Union[str, Path]) -> str:
+        """Import `path` unless the cached copy is current. Returns the table name."""
+        p = _validate_path(path)
+        if not p:
+            raise FileNotFoundError(str(path))
+        p = p.resolve()
+        with self._lock:
+            return self._import(p)
+
+    def _import(self, p: Path) -> str:
+        st = p.stat()
+        row = self._conn.execute(
+            "SELECT mtime, size, tbl FROM sources WHERE path = ?", (str(p),)
+        ).fetchone()
+        if row and row[0] == st.st_mtime and row[1] == st.st_size:
+            return row[2]
+
+        tbl = "src_" + hashlib.sha1(str(p).encode("utf-8")).hexdigest()[:16]
+        data: CSVData = StreamingCSVData(p)
+        try:
+            cols = ", ".join(f"{_ident(h)} TEXT" for h in data.headers)
+            with self._conn:
+                self._conn.execute(f"DROP TABLE IF EXISTS {tbl}")
+                self._conn.execute(f"CREATE TABLE {tbl} (_row INTEGER PRIMARY KEY, {cols})")
+                marks = ", ".join("?" * (len(data.headers) + 1))
+                self._conn.executemany(
+                    f"INSERT INTO {tbl} VALUES ({marks})",
+                    ((n, *(r[h] for h in data.headers)) for n, r in enumerate(data.iter_full_rows())),
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                    (str(p), st.st_mtime, st.st_size, tbl, "\x1f".join(data.headers)),
+                )
+        finally:
+            data.close()
+        return tbl
+
+    def headers(self, path: Union[str, Path], tbl: Optional[str] = None) -> List[str]:
+        tbl = tbl or self.import_csv(path)
+        row = self._conn.execute("SELECT headers FROM sources WHERE tbl = ?", (tbl,)).fetchone()
+        return row[0].split("\x1f") if row and row[0] else []
+
+    def _ensure_index(self, tbl: str, columns: Sequence[str]) -> None:
+        with self._lock:
+            self._create_indexes(tbl, columns)
+
+    def _create_indexes(self, tbl: str, columns: Sequence[str]) -> None:
+        for name in dict.fromkeys(columns):
+            idx = f"{tbl}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {idx} ON {tbl} ({_ident(name)})")
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _compile(self, path, query: MergeQuery) -> Tuple[str, str, List[Any], str, List[str]]:
+        tbl = self.import_csv(path)
+        headers = self.headers(path, tbl)
+        where, params, used = compile_filter(query.where, headers)
+        order, sort_cols = compile_order(query.order_by, headers)
+        group = query.group_by.strip()
+        if group and group not in headers:
+            raise ValueError(f"Unknown group column {group!r}")
+        self._ensure_index(tbl, used + ([group] if group else []))
+        return tbl, (f"WHERE {where}" if where else ""), params, order, headers
+
+    def count(self, path, query: MergeQuery = MergeQuery()) -> int:
+        tbl, where, params, _order, _ = self._compile(path, query)
+        return self._conn.execute(f"SELECT COUNT(*) FROM {tbl} {where}", params).fetchone()[0]
+
+    def groups(self, path, query: MergeQuery) -> List[Tuple[str, int]]:
+        """(group value, row count) in group order; one entry for ungrouped queries."""
+        tbl, where, params, _order, _ = self._compile(path, query)
+        if not query.group_by:
+            return [("", self._conn.execute(f"SELECT COUNT(*) FROM {tbl} {where}", params).fetchone()[0])]
+        col = _ident(query.group_by.strip())
+        sql = f"SELECT {col}, COUNT(*) FROM {tbl} {where} GROUP BY {col} ORDER BY {', '.join(_numeric_sort(col))}"
+        return [(str(k), n) for k, n in self._conn.execute(sql, params)]
+
+    def padded_count(self, path, query: MergeQuery, per_page: int) -> int:
+        """Slots needed when every group starts on a fresh page."""
+        if not query.group_by or per_page <= 0:
+            return self.count(path, query)
+        return sum(ceil(n / per_page) * per_page for _g, n in self.groups(path, query))
+
+    def row_ids(self, path, query: MergeQuery, per_page: int = 0) -> List[int]:
+        """
+        Row ids in pagination order. With group_by and per_page, each group is
+        padded to a page boundary with -1.
+        """
+        tbl, where, params, order, _ = self._compile(path, query)
+        order_parts = []
+        if query.group_by:
+            order_parts.extend(_numeric_sort(_ident(query.group_by.strip())))
+        if order:
+            order_parts.append(order)
+        order_parts.append("_row")
+        sql = f"SELECT _row{', ' + _ident(query.group_by.strip()) if query.group_by else ''} FROM {tbl} {where} ORDER BY {', '.join(order_parts)}"
+        rows = self._conn.execute(sql, params).fetchall()
+        if not (query.group_by and per_page > 0):
+            return [r[0] for r in rows]
+        out: List[int] = []
+        current = object()
+        for rid, key in rows:
+            if key != current and out and len(out) % per_page:
+                out.extend([-1] * (per_page - len(out) % per_page))
+            current = key
+            out.append(rid)
+        if out and len(out) % per_page:
+            out.extend([-1] * (per_page - len(out) % per_page))
+        return out
+
+    def fetch(self, tbl: str, row_id: int, columns: Sequence[str]) -> Dict[str, str]:
+        """Fetch one row by id from an imported table (see import_csv())."""
+        cols = ", ".join(_ident(c) for c in columns) or "_row"
+        row = self._conn.execute(f"SELECT {cols} FROM {tbl} WHERE _row = ?", (row_id,)).fetchone()
+        if row is None or not columns:
+            return {}
+        return {c: ("" if v is None else str(v)) for c, v in zip(columns, row)}
+
+    def cursor(self, path, query: MergeQuery = MergeQuery(), per_page: int = 0) -> "QueryCursor":
+        return QueryCursor(path, store=self, query=query, per_page=per_page)
+
+
+@dataclass
+class QueryCursor(CSVData):
+    """
+    CSVData view over a MergeStore query, so MergeManager can page through
+    filtered/sorted/grouped rows with the same cursor API. Padding rows (group
+    ends) come back as None.
+    """
+    store: Optional[MergeStore] = None
+    query: MergeQuery = field(default_factory=MergeQuery)
+    per_page: int = 0
+    _tbl: str = field(init=False, default="")
+    _ids: Optional[List[int]] = field(init=False, default=None)
+
+    def _load_csv(self) -> None:
+        self._tbl = self.store.import_csv(self.path)
+        self._set_headers(self.store.headers(self.path, self._tbl))
+
+    @property
+    def ids(self) -> List[int]:
+        # Row ids are only materialized once rows are actually walked.
+        if self._ids is None:
+            with self._lock:
+                if self._ids is None:
+                    self._ids = self.store.row_ids(self.path, self.query, self.per_page)
+        return self._ids
+
+    @property
+    def row_count(self) -> int:
+        if self._ids is None:
+            return self.store.padded_count(self.path, self.query, self.per_page)
+        return len(self._ids)
+
+    def _full_row(self, i: int) -> Dict[str, str]:
+        rid = self.ids[i]
+        return self.store.fetch(self._tbl, rid, self.headers) if rid >= 0 else {}
+
+    def row(self, i: int) -> Optional[Dict[str, str]]:
+        ids = self.ids
+        if not 0 <= i < len(ids):
+            raise IndexError(f"Row {i} out of range (0..{len(ids) - 1})")
+        rid = ids[i]
+        if rid < 0:
+            return None
+        return self.store.fetch(self._tbl, rid, self.fields)
@@ -0,0 +1,151 @@
+# prototypyside/services/orphan_store.py
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def cached_bytes(obj: Any) -> int:
+    """
+    Estimate the raster memory held by an object tree (slot -> component -> elements).
+    Only cached QImages are counted; they are the bulk of what an orphan keeps alive.
+    """
+    total = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if cur is None or id(cur) in seen:
+            continue
+        seen.add(id(cur))
+        img = getattr(cur, "_cache_image", None)
+        if img is not None and hasattr(img, "sizeInBytes"):
+            try:
+                total += int(img.sizeInBytes())
+            except RuntimeError:
+                pass  # underlying C++ object already gone
+        stack.extend(getattr(cur, "items", None) or [])
+        content = getattr(cur, "_content", None)
+        if content is not None and not isinstance(content, str):
+            stack.append(content)
+    return total
+
+
+def release_caches(obj: Any) -> None:
+    """Drop cached rasters on an object tree without touching its model data."""
+    seen = set()
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if cur is None or id(cur) in seen:
+            continue
+        seen.add(id(cur))
+        if hasattr(cur, "_cache_image"):
+            cur._cache_image = None
+        stack.extend(getattr(cur, "items", None) or [])
+        content = getattr(cur, "_content", None)
+        if content is not None and not isinstance(content, str):
+            stack.append(content)
+
+
+class OrphanStore:
+    """
+    Holding area for deregistered objects so undo can reinsert() them.
+
+    Orphans are held strongly for `max_generations` generations (one generation
+    per collect(), which the tabs call once per undo-stack step). After that they
+    are demoted to weak references: the undo commands that parked them still keep
+    them alive, and once those commands are dropped from the stack the objects
+    and their cached images are released.
+    """
+
+    def __init__(self, max_generations: int = 4):
+        self._max_generations = max(0, int(max_generations))
+        self._generation = 0
+        self._strong: Dict[str, Tuple[int, Any]] = {}
+        self._weak: Dict[str, weakref.ref] = {}
+
+    # ---------------------------
+    # Mapping-like access
+    # ---------------------------
+    def add(self, pid: str, obj: Any) -> None:
+        self._weak.pop(pid, None)
+        self._strong[pid] = (self._generation, obj)
+
+    def get(self, pid: str) -> Optional[Any]:
+        entry = self._strong.get(pid)
+        if entry is not None:
+            return entry[1]
+        ref = self._weak.get(pid)
+        return ref() if ref is not None else None
+
+    def pop(self, pid: str) -> Optional[Any]:
+        entry = self._strong.pop(pid, None)
+        if entry is not None:
+            self._weak.pop(pid, None)
+            return entry[1]
+        ref = self._weak.pop(pid, None)
+        return ref() if ref is not None else None
+
+    def clear(self) -> None:
+        self._strong.clear()
+        self._weak.clear()
+
+    def keys(self) -> List[str]:
+        return list(self._strong.keys()) + [k for k, r in self._weak.items() if r() is not None]
+
+    def __contains__(self, pid: str) -> bool:
+        if pid in self._strong:
+            return True
+        ref = self._weak.get(pid)
+        return ref is not None and ref() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    # ---------------------------
+    # Generations & collection
+    # ---------------------------
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def max_generations(self) -> int:
+        return self._max_generations
+
+    @max_generations.setter
+    def max_generations(self, value: int) -> None:
+        self._max_generations = max(0, int(value))
+
+    def collect(self, force: bool = False) -> int:
+        """
+        Advance one generation, demote old orphans to weak references and purge
+        the ones nobody references any more. With force=True every orphan is
+        demoted regardless of age.
+
+        Returns the number of cached-image bytes released.
+        """
+        self._generation += 1
+        cutoff = self._generation - self._max_generations
+        freed = 0
+
+        for pid, (gen, obj) in list(self._strong.items()):
+            if not force and gen > cutoff:
+                continue
+            del self._strong[pid]
+            freed += cached_bytes(obj)
+            release_caches(obj)
+            try:
+                self._weak[pid] = weakref.ref(obj)
+            except TypeError:
+                pass  # not weak-referenceable; dropping it is the release
+
+        for pid, ref in list(self._weak.items()):
+            if ref() is None:
+                del self._weak[pid]
+
+        return freed
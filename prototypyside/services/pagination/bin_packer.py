@@ -0,0 +1,242 @@
+# prototypyside/services/pagination/bin_packer.py
+"""
+Mixed-size sheet packing for non-grid layouts.
+
+Items (component sizes, bleed included) are packed onto as few sheets as
+possible with either a skyline (bottom-left) or a MaxRects (best short side
+fit) packer. Margins are kept clear and `spacing` is left between neighbours
+by packing every item inflated by the spacing into a sheet inflated by the
+same amount. All values are plain floats in one unit (points by convention).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+PACK_ALGORITHMS = ("maxrects", "skyline")
+
+
+@dataclass(frozen=True)
+class PackItem:
+    width: float
+    height: float
+    key: Any = None             # caller's reference (e.g. slot index and merge row)
+    can_rotate: bool = True
+    shape: str = "rect"         # ProtoPaintable.shape; only the hex packer looks at it
+
+
+@dataclass(frozen=True)
+class Placement:
+    index: int                  # position of the item in the packed sequence
+    sheet: int
+    x: float                    # top-left on the sheet, margins included
+    y: float
+    width: float                # as placed (swapped when rotated)
+    height: float
+    rotated: bool = False
+
+
+@dataclass
+class PackResult:
+    sheet_width: float
+    sheet_height: float
+    placements: List[Optional[Placement]] = field(default_factory=list)   # per item; None if unplaced
+    sheet_count: int = 0
+    used_area: float = 0.0
+
+    @property
+    def unplaced(self) -> List[int]:
+        return [i for i, p in enumerate(self.placements) if p is None]
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the printed sheets' area covered by items (0..1)."""
+        total = self.sheet_count * self.sheet_width * self.sheet_height
+        return self.used_area / total if total else 0.0
+
+    def sheet(self, n: int) -> List[Placement]:
+        return [p for p in self.placements if p is not None and p.sheet == n]
+
+    def sheets(self) -> List[List[Placement]]:
+        out: List[List[Placement]] = [[] for _ in range(self.sheet_count)]
+        for p in self.placements:
+            if p is not None:
+                out[p.sheet].append(p)
+        return out
+
+    def summary(self) -> str:
+        text = f"{self.sheet_count} sheet(s), {self.utilization:.0%} used"
+        if self.unplaced:
+            text += f", {len(self.unplaced)} item(s) larger than the sheet"
+        return text
+
+
+# ---------------- skyline ---------------- #
+
+class _Skyline:
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.segments: List[List[float]] = [[0.0, 0.0, width]]    # x, y, w
+
+    def _fit(self, i: int, w: float, h: float) -> Optional[float]:
+        x = self.segments[i][0]
+        if x + w > self.width + 1e-9:
+            return None
+        y, remaining, j = 0.0, w, i
+        while remaining > 1e-9:
+            if j >= len(self.segments):
+                return None
+            y = max(y, self.segments[j][1])
+            if y + h > self.height + 1e-9:
+                return None
+            remaining -= self.segments[j][2]
+            j += 1
+        return y
+
+    def find(self, w: float, h: float, can_rotate: bool) -> Optional[Tuple[float, float, float, float, bool]]:
+        best = None
+        for rotated in ((False, True) if can_rotate and w != h else (False,)):
+            rw, rh = (h, w) if rotated else (w, h)
+            for i in range(len(self.segments)):
+                y = self._fit(i, rw, rh)
+                if y is None:
+                    continue
+                score = (y + rh, self.segments[i][0])
+                if best is None or score < best[0]:
+                    best = (score, (self.segments[i][0], y, rw, rh, rotated))
+        return best[1] if best else None
+
+    def place(self, x: float, y: float, w: float, h: float) -> None:
+        segs = self.segments
+        new = [x, y + h, w]
+        i = next(n for n, s in enumerate(segs) if s[0] >= x - 1e-9)
+        segs.insert(i, new)
+        # Trim the segments the new one covers.
+        j = i + 1
+        while j < len(segs):
+            s, prev_end = segs[j], segs[j - 1][0] + segs[j - 1][2]
+            if s[0] >= prev_end - 1e-9:
+                break
+            shrink = prev_end - s[0]
+            s[0] += shrink
+            s[2] -= shrink
+            if s[2] <= 1e-9:
+                del segs[j]
+            else:
+                break
+        # Merge equal-height neighbours.
+        j = 0
+        while j < len(segs) - 1:
+            if abs(segs[j][1] - segs[j + 1][1]) < 1e-9:
+                segs[j][2] += segs[j + 1][2]
+                del segs[j + 1]
+            else:
+                j += 1
+
+
+# ---------------- MaxRects ---------------- #
+
+class _MaxRects:
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.free: List[Tuple[float, float, float, float]] = [(0.0, 0.0, width, height)]
+
+    def find(self, w: float, h: float, can_rotate: bool) -> Optional[Tuple[float, float, float, float, bool]]:
+        best = None
+        for fx, fy, fw, fh in self.free:
+            for rotated in ((False, True) if can_rotate and w != h else (False,)):
+                rw, rh = (h, w) if rotated else (w, h)
+                if rw <= fw + 1e-9 and rh <= fh + 1e-9:
+                    short, long_ = sorted((fw - rw, fh - rh))
+                    score = (short, long_)
+                    if best is None or score < best[0]:
+                        best = (score, (fx, fy, rw, rh, rotated))
+        return best[1] if best else None
+
+    def place(self, x: float, y: float, w: float, h: float) -> None:
+        out = []
+        for f in self.free:
+            fx, fy, fw, fh = f
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                out.append(f)
+                continue
+            if x > fx:
+                out.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                out.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                out.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                out.append((fx, y + h, fw, fy + fh - y - h))
+        # Drop free rectangles contained in another.
+        out.sort(key=lambda r: r[2] * r[3], reverse=True)
+        kept: List[Tuple[float, float, float, float]] = []
+        for r in out:
+            rx, ry, rw, rh = r
+            if not any(rx >= kx - 1e-9 and ry >= ky - 1e-9 and rx + rw <= kx + kw + 1e-9 and ry + rh <= ky + kh + 1e-9
+                       for kx, ky, kw, kh in kept):
+                kept.append(r)
+        self.free = kept
+
+
+_PACKERS = {"maxrects": _MaxRects, "skyline": _Skyline}
+
+
+def pack(
+    items: Sequence[PackItem],
+    sheet_width: float,
+    sheet_height: float,
+    margins: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0),
+    spacing: Tuple[float, float] = (0.0, 0.0),
+    algorithm: str = "maxrects",
+    allow_rotation: bool = True,
+) -> PackResult:
+    """
+    Pack `items` onto sheets of `sheet_width` x `sheet_height`. `margins` is
+    (top, bottom, left, right) like LayoutTemplate.whitespace; `spacing` is
+    (x, y). Items are placed largest first, each into the first open sheet that
+    fits it. Placements come back in the order of `items`.
+    """
+    top, bottom, left, right = margins
+    sx, sy = spacing
+    bin_w = sheet_width - left - right + sx
+    bin_h = sheet_height - top - bottom + sy
+    result = PackResult(sheet_width, sheet_height, [None] * len(items))
+    factory = _PACKERS[algorithm]
+
+    order = sorted(range(len(items)), key=lambda i: (
+        -max(items[i].width, items[i].height), -items[i].width * items[i].height))
+    bins: List[Any] = []
+    # Sheets that could not take an item of a given size will not take the next
+    # one of that size either; skip them.
+    full_for: dict = {}
+    for i in order:
+        it = items[i]
+        rotate = allow_rotation and it.can_rotate
+        w, h = it.width + sx, it.height + sy
+        size_key = (round(w, 6), round(h, 6), rotate)
+        spot, b = None, full_for.get(size_key, 0)
+        while b < len(bins):
+            spot = bins[b].find(w, h, rotate)
+            if spot is not None:
+                break
+            b += 1
+        full_for[size_key] = b
+        if spot is None:
+            fresh = factory(bin_w, bin_h)
+            spot = fresh.find(w, h, rotate)
+            if spot is None:
+                continue  # larger than an empty sheet
+            bins.append(fresh)
+            b = len(bins) - 1
+        x, y, pw, ph, rotated = spot
+        bins[b].place(x, y, pw, ph)
+        result.placements[i] = Placement(
+            index=i, sheet=b, x=left + x, y=top + y,
+            width=pw - sx, height=ph - sy, rotated=rotated,
+        )
+        result.used_area += it.width * it.height
+    result.sheet_count = len(bins)
+    return result
@@ -0,0 +1,136 @@
+# prototypyside/services/pagination/duplex.py
+"""
+Back sheets for duplex export.
+
+A layout with a back component (LayoutTemplate.back_pid) prints, after every
+front sheet, a back sheet whose slots are the fronts reflected across the
+printer's flip edge (see PageManager.back_placements), so each back lands
+behind its front.
+
+The back is drawn once into a QPicture and replayed into every slot. When no
+slot binds merge fields into the back, the whole back sheet is recorded once
+per set of printed slots (normally one: full sheets; plus one for a partial
+last sheet) and replayed for every back sheet. Merged backs are recorded once
+per source row.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QPainter, QPicture
+
+from prototypyside.services.proto_paint import ProtoPaint
+
+ROW_PICTURES = 256   # merged back pictures kept (rows repeat when printing copies)
+
+
+class BackRenderer:
+    def __init__(self, em, layout, ctx):
+        """`em`: an ExportManager between _begin() and release(); `ctx`: its export context."""
+        self.ctx = ctx
+        self.planner = em.planner
+        back = em.root_registry.global_get(layout.back_pid)
+        if back is None:
+            raise KeyError(f"Back component '{layout.back_pid}' is not registered")
+        self.comp = em._export_registry.clone(back)
+        em.no_autorender_component(self.comp, True)
+        em.normalize_component(self.comp, ctx)
+        self.comp.ctx = ctx
+        size = self.comp.geometry.to("pt", dpi=ctx.dpi).size
+        self.size = (size.width(), size.height())
+
+        # Per slot: (element index, field) pairs to bind, for slots whose source feeds the back.
+        self._plans: Dict[int, List[Tuple[int, str]]] = {}
+        self._defaults: Dict[str, str] = {}
+        tb = em.job.bindings.get(self.comp)
+        for s in range(self.planner.slot_count):
+            source = self.planner.source(s)
+            if tb is None or source is None:
+                continue
+            plan = tb.plan(source)
+            if plan:
+                self._plans[s] = plan
+                self._defaults.update({f: self.comp.items[i].content for i, f in plan})
+
+        self._art: Optional[QPicture] = None
+        self._sheets: Dict[FrozenSet[int], QPicture] = {}
+        self._rows: "OrderedDict[Tuple[int, int], QPicture]" = OrderedDict()
+
+    # ---------------------------
+    # Recording
+    # ---------------------------
+    def _record(self) -> QPicture:
+        picture = QPicture()
+        p = QPainter(picture)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        p.setRenderHint(QPainter.TextAntialiasing, True)
+        ProtoPaint.render_component(self.comp, self.ctx, p)
+        p.end()
+        return picture
+
+    def _static_art(self) -> QPicture:
+        if self._art is None:
+            if self._defaults:
+                self.comp.set_csv_content(self._defaults, [(i, f) for s in self._plans.values() for i, f in s])
+            self._art = self._record()
+        return self._art
+
+    def _row_art(self, s: int, row_index: int) -> Optional[QPicture]:
+        source = self.planner.source(s)
+        key = (id(source), row_index)
+        picture = self._rows.get(key)
+        if picture is not None:
+            self._rows.move_to_end(key)
+            return picture
+        row = source.row(row_index)
+        if row is None:
+            return None
+        self.comp.set_csv_content(row, self._plans[s])
+        picture = self._record()
+        self._rows[key] = picture
+        while len(self._rows) > ROW_PICTURES:
+            self._rows.popitem(last=False)
+        return picture
+
+    # ---------------------------
+    # Painting
+    # ---------------------------
+    def _place(self, painter: QPainter, placement, picture: QPicture) -> None:
+        r = placement.rect_px   # planned at 72 dpi: points
+        w, h = self.size
+        painter.save()
+        if placement.angle:
+            painter.setTransform(placement.transform(), True)
+        painter.drawPicture(QPointF(r.x() + (r.width() - w) / 2, r.y() + (r.height() - h) / 2), picture)
+        painter.restore()
+
+    def paint(self, painter: QPainter, back_page, printed) -> None:
+        """
+        Paint `back_page` (a Page from PageManager.backs) behind the slots in
+        `printed` (front slot indices that carry a card).
+        """
+        printed = set(printed)
+        static = frozenset(s for s in printed if s not in self._plans)
+        if static:
+            sheet = self._sheets.get(static)
+            if sheet is None:
+                art = self._static_art()
+                sheet = QPicture()
+                p = QPainter(sheet)
+                for placement in back_page.slots:
+                    if placement.index in static:
+                        self._place(p, placement, art)
+                p.end()
+                self._sheets[static] = sheet
+            painter.drawPicture(QPointF(0, 0), sheet)
+
+        for placement in back_page.slots:
+            s = placement.index
+            if s not in self._plans or s not in printed:
+                continue
+            row_index = back_page.rows[s] if s < len(back_page.rows) else None
+            picture = self._row_art(s, row_index) if row_index is not None else self._static_art()
+            if picture is not None:
+                self._place(painter, placement, picture)
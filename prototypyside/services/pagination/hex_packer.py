@@ -0,0 +1,136 @@
+# prototypyside/services/pagination/hex_packer.py
+"""
+Close packing for uniform round and hexagonal tokens.
+
+Tokens of one size sit on a lattice whose rows alternate between two counts;
+every position is computed from its index, so a sheet of any size costs one
+lattice and no per-token geometry. By component shape:
+
+  oval/circle: hexagonal close packing, odd rows shifted half a pitch and rows
+               (h + g)·√3/2 apart. Ovals may also use the transposed lattice
+               (columns shifted), whichever fits more.
+  hexagon:     ShapeFactory's pointy-top hexagon tiles its plane: columns
+               w·√3/2 apart, rows 3/4·h apart, odd rows shifted half a column.
+  others:      square grid, as in grid mode.
+
+`gutter` is the clear gap between neighbours. Values are floats in one unit
+(points by convention).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from prototypyside.services.pagination.bin_packer import PackItem, PackResult, Placement
+
+ROUND_SHAPES = ("oval", "circle")
+HEX_SHAPES = ("hexagon",)
+_SIN60 = math.sqrt(3) / 2
+
+
+@dataclass(frozen=True)
+class HexLattice:
+    origin_x: float
+    origin_y: float
+    pitch_x: float           # between neighbours in a row
+    pitch_y: float           # between rows
+    shift: float             # x offset of odd rows
+    even_count: int          # tokens in rows 0, 2, 4, ...
+    odd_count: int           # tokens in rows 1, 3, 5, ...
+    rows: int
+    transposed: bool = False  # rows run down the sheet instead of across
+
+    @property
+    def count(self) -> int:
+        return (self.rows + 1) // 2 * self.even_count + self.rows // 2 * self.odd_count
+
+    def position(self, k: int) -> Tuple[float, float]:
+        """Top-left of token `k` (0 <= k < count)."""
+        pair = self.even_count + self.odd_count
+        row, rest = divmod(k, pair) if pair else (0, k)
+        row *= 2
+        if rest >= self.even_count:
+            row, rest = row + 1, rest - self.even_count
+        u = rest * self.pitch_x + (self.shift if row % 2 else 0.0)
+        v = row * self.pitch_y
+        if self.transposed:
+            u, v = v, u
+        return self.origin_x + u, self.origin_y + v
+
+    def positions(self) -> List[Tuple[float, float]]:
+        return [self.position(k) for k in range(self.count)]
+
+
+def _rows_of(extent: float, size: float, pitch: float) -> int:
+    return int((extent - size) // pitch) + 1 if extent >= size else 0
+
+
+def _lattice(area_w, area_h, w, h, pitch_x, pitch_y, shift, origin, transposed=False) -> HexLattice:
+    if transposed:
+        area_w, area_h, w, h = area_h, area_w, h, w
+    even = _rows_of(area_w, w, pitch_x)
+    odd = _rows_of(area_w - shift, w, pitch_x) if shift else even
+    rows = _rows_of(area_h, h, pitch_y)
+    if rows == 1:
+        odd = 0
+    return HexLattice(origin[0], origin[1], pitch_x, pitch_y, shift, even, odd, rows, transposed)
+
+
+def lattice_for(
+    shape: str,
+    area_width: float,
+    area_height: float,
+    item_width: float,
+    item_height: float,
+    gutter: float = 0.0,
+    origin: Tuple[float, float] = (0.0, 0.0),
+) -> HexLattice:
+    """The densest lattice of `shape` tokens in the area at `origin`."""
+    w, h, g = item_width, item_height, gutter
+    if shape in HEX_SHAPES:
+        # Side vertices sit at ±(w/2)·cos 30°, so the tiled width is w·√3/2.
+        pitch_x = w * _SIN60 + g
+        return _lattice(area_width, area_height, w, h, pitch_x, 0.75 * h + g * _SIN60, pitch_x / 2, origin)
+    if shape in ROUND_SHAPES:
+        across = _lattice(area_width, area_height, w, h, w + g, (h + g) * _SIN60, (w + g) / 2, origin)
+        down = _lattice(area_width, area_height, w, h, h + g, (w + g) * _SIN60, (h + g) / 2, origin, True)
+        return down if down.count > across.count else across
+    return _lattice(area_width, area_height, w, h, w + g, h + g, 0.0, origin)
+
+
+def hex_pack(
+    items: Sequence[PackItem],
+    sheet_width: float,
+    sheet_height: float,
+    margins: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0),
+    gutter: float = 0.0,
+) -> PackResult:
+    """
+    Place `items` on lattices by size and shape: each group fills its own run of
+    sheets, in the order groups first appear. Returns a PackResult like pack().
+    """
+    top, bottom, left, right = margins
+    area_w = sheet_width - left - right
+    area_h = sheet_height - top - bottom
+    result = PackResult(sheet_width, sheet_height, [None] * len(items))
+
+    groups: Dict[Tuple[float, float, str], List[int]] = {}
+    for i, it in enumerate(items):
+        groups.setdefault((round(it.width, 6), round(it.height, 6), it.shape), []).append(i)
+
+    sheet = 0
+    for (w, h, shape), members in groups.items():
+        lattice = lattice_for(shape, area_w, area_h, w, h, gutter, (left, top))
+        per_sheet = lattice.count
+        if not per_sheet:
+            continue  # larger than the printable area
+        for j, i in enumerate(members):
+            n, k = divmod(j, per_sheet)
+            x, y = lattice.position(k)
+            result.placements[i] = Placement(index=i, sheet=sheet + n, x=x, y=y, width=items[i].width,
+                                             height=items[i].height)
+            result.used_area += items[i].width * items[i].height
+        sheet += math.ceil(len(members) / per_sheet)
+    result.sheet_count = sheet
+    return result
@@ -0,0 +1,192 @@
+# prototypyside/services/pagination/imposition.py
+"""
+Gang-run imposition: several layouts in one print job.
+
+Each group (a layout, its merge sources and a copy count) contributes its
+cards, in the order groups were added, as PagePlanner runs them (see
+ExportManager.print_items). When every group is a grid layout with the same
+sheet and slot rects, cards fill the slots in order across group boundaries,
+so only the last sheet of the job can be partial. Otherwise all cards are
+bin-packed onto sheets of the first layout's size and margins.
+
+export() writes one PDF and a JSON manifest recording where every card landed.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from PySide6.QtCore import QMarginsF, QSizeF
+from PySide6.QtGui import QPageLayout, QPageSize, QPainter, QPdfWriter
+
+from prototypyside.services.export_manager import ExportManager
+from prototypyside.services.pagination.bin_packer import PackItem, PackResult, Placement, pack
+from prototypyside.services.pagination.page_planner import PagePlanner
+from prototypyside.services.pagination.print_marks import PrintMarks
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+@dataclass
+class ImpositionGroup:
+    layout: Any
+    copies: int = 1
+    name: str = ""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    sheet: int                  # 1-based, as printed
+    group: str
+    layout_pid: str
+    slot: int
+    row: Optional[int]          # merge source row; None for static content
+    x: float                    # placement on the sheet, points
+    y: float
+    width: float
+    height: float
+    rotated: bool = False
+
+
+class ImpositionJob:
+    def __init__(self, root_registry, merge_manager):
+        self.root_registry = root_registry
+        self.merge_manager = merge_manager
+        self.groups: List[ImpositionGroup] = []
+        self.items: List[PackItem] = []     # keys: (group index, slot index, row or None)
+        self.result: Optional[PackResult] = None
+        self.manifest: List[ManifestEntry] = []
+        self._bleeds = {}   # (group, slot) → printed bleed, points
+
+    def add(self, layout, copies: int = 1, name: Optional[str] = None) -> ImpositionGroup:
+        group = ImpositionGroup(layout, max(1, int(copies)), name or str(getattr(layout, "name", "") or layout.pid))
+        self.groups.append(group)
+        self.result = None
+        return group
+
+    # ---------------------------
+    # Planning
+    # ---------------------------
+    @staticmethod
+    def _slot_rects(layout) -> List[Tuple[float, float, float, float]]:
+        out = []
+        for slot in layout.items:
+            r = slot.geometry.to("pt", dpi=layout.ctx.dpi).rect
+            out.append((round(r.x(), 2), round(r.y(), 2), round(r.width(), 2), round(r.height(), 2)))
+        return out
+
+    def shares_grid(self) -> bool:
+        """True when every group is a grid layout with the first group's sheet and slots."""
+        if not self.groups:
+            return False
+        first = self.groups[0].layout
+        size = first.geometry.pt.size
+        rects = self._slot_rects(first)
+        for g in self.groups:
+            lay = g.layout
+            if getattr(lay, "pagination_mode", "grid") != "grid" or lay.geometry.pt.size != size:
+                return False
+            if self._slot_rects(lay) != rects:
+                return False
+        return True
+
+    def plan(self) -> PackResult:
+        em = ExportManager(self.root_registry, self.merge_manager)
+        self.items = []
+        self._bleeds = {}
+        for n, g in enumerate(self.groups):
+            planner = PagePlanner(g.layout, self.merge_manager, copies=g.copies)
+            for it in em.print_items(g.layout, planner):
+                s, row = it.key
+                if (n, s) not in self._bleeds:
+                    self._bleeds[(n, s)] = em._pack_size(g.layout.items[s].content, g.layout.ctx.dpi)[2]
+                self.items.append(PackItem(it.width, it.height, key=(n, s, row), shape=it.shape))
+
+        first = self.groups[0].layout
+        size = first.geometry.pt.size
+        dpi = first.ctx.dpi
+        if self.shares_grid():
+            self.result = self._fill_slots(first, size)
+        else:
+            ws = [v.to("pt", dpi=dpi).value for v in first.whitespace]
+            self.result = pack(self.items, size.width(), size.height(), margins=tuple(ws[:4]),
+                               spacing=(ws[4], ws[5]), allow_rotation=first.pack_rotation)
+        return self.result
+
+    def _fill_slots(self, layout, size) -> PackResult:
+        """Card k goes to slot k % n of sheet k // n, in the first layout's slot order."""
+        rects = self._slot_rects(layout)
+        per_sheet = len(rects)
+        result = PackResult(size.width(), size.height(), [None] * len(self.items))
+        for k, it in enumerate(self.items):
+            sheet, s = divmod(k, per_sheet)
+            x, y, _w, _h = rects[s]
+            g, slot, _row = it.key
+            bleed = self._bleeds[(g, slot)]   # as in grid export, the card sits at the slot origin
+            result.placements[k] = Placement(index=k, sheet=sheet, x=x - bleed, y=y - bleed,
+                                             width=it.width, height=it.height)
+            result.used_area += it.width * it.height
+        result.sheet_count = -(-len(self.items) // per_sheet) if per_sheet else 0
+        return result
+
+    # ---------------------------
+    # Output
+    # ---------------------------
+    def export(self, pdf_path, manifest_path=None) -> List[ManifestEntry]:
+        """Write every sheet to `pdf_path` and the manifest beside it (or to `manifest_path`)."""
+        result = self.result or self.plan()
+        managers, frames, plans = [], [], []
+        for g in self.groups:
+            em = ExportManager(self.root_registry, self.merge_manager)
+            frame = em.frame(g.layout, copies=g.copies)
+            managers.append(em)
+            frames.append(frame)
+            plans.append(em.bind_plans(frame)[0])
+
+        writer = QPdfWriter(str(pdf_path))
+        writer.setPageSize(QPageSize(QSizeF(result.sheet_width, result.sheet_height), QPageSize.Point))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Point)
+        writer.setResolution(72)  # 1pt = 1/72 in
+
+        painter = QPainter(writer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+
+        marks = PrintMarks.for_layout(self.groups[0].layout, result.sheet_width, result.sheet_height)
+        self.manifest = []
+        try:
+            for n, placements in enumerate(result.sheets()):
+                if n:
+                    writer.newPage()
+                trims = []
+                for pl in placements:
+                    g, s, row = self.items[pl.index].key
+                    em = managers[g]
+                    bleed = self._bleeds.get((g, s), 0.0)
+                    trims.append((pl.x + bleed, pl.y + bleed, pl.width - 2 * bleed, pl.height - 2 * bleed))
+                    if not em.paint_item(painter, frames[g], plans[g], (s, row), pl, frames[g].ctx):
+                        continue
+                    self.manifest.append(ManifestEntry(
+                        sheet=n + 1, group=self.groups[g].name, layout_pid=self.groups[g].layout.pid,
+                        slot=s, row=row, x=pl.x, y=pl.y, width=pl.width, height=pl.height,
+                        rotated=pl.rotated,
+                    ))
+                if marks is not None:
+                    marks.paint(painter, trims)
+        finally:
+            painter.end()
+            for em in managers:
+                em.release()
+
+        manifest_path = Path(manifest_path) if manifest_path else Path(str(pdf_path)).with_suffix(MANIFEST_SUFFIX)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "pdf": Path(str(pdf_path)).name,
+                "sheets": result.sheet_count,
+                "utilization": round(result.utilization, 4),
+                "groups": [{"name": g.name, "layout_pid": g.layout.pid, "copies": g.copies} for g in self.groups],
+                "cards": [asdict(e) for e in self.manifest],
+            }, f, indent=2)
+        return self.manifest
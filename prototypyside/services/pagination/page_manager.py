@@ -1,17 +1,14 @@
-# import re
-# import math
-# import uuid
-# from typing import Dict, List, Tuple, Any, List, Optional, Sequence, TYPE_CHECKING
-# # services/page_manager.py
-# from dataclasses import dataclass
-# from math import ceil
-# from PySide6.QtCore import QRectF, QPointF 
+# services/page_manager.py
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QRectF
 
-# from PySide6.QtWidgets import QGraphicsItem, QGraphicsObject, QGraphicsItemGroup, QGraphicsScene 
 from prototypyside.utils.units.unit_str import UnitStr
 from prototypyside.utils.units.unit_str_geometry import UnitStrGeometry
-# from prototypyside.services.undo_commands import ChangePropertiesCommand
-# from prototypyside.models.page_model import Page
+from prototypyside.models.page_model import Page, SlotPlacement
+from prototypyside.services.pagination.page_planner import PagePlanner
+from prototypyside.services.pagination.print_policy import POLICIES, PRINT_POLICIES, PrintPolicy
 
 # if TYPE_CHECKING:
 #     from prototypyside.models.layout_template import LayoutTemplate
@@ -56,286 +53,183 @@ from prototypyside.utils.units.unit_str_geometry import UnitStrGeometry
 #     "A0 (841x1189 mm)": UnitStrGeometry(width="841mm", height="1189mm", unit="mm"),
 # }
 
-PRINT_POLICIES = {
-    'Letter: 3x3 Standard 2.5"x3.5" Cards': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": False,
-        "rows": 3,
-        "columns": 3,
-        "whitespace": [
-            UnitStr("0.25in", dpi=300),  # top
-            UnitStr("0.25in", dpi=300),  # bottom
-            UnitStr("0.5in", dpi=300),   # left
-            UnitStr("0.5in", dpi=300),   # right
-            UnitStr("0.0in", dpi=300),   # spacing_x
-            UnitStr("0.0in", dpi=300)    # spacing_y
-        ],
-        "duplex_print": False,
-        "oversized": False,
-        "lock_at": 1
-    },
-    'Letter: 2x4 Standard 2.5"x3.5" Cards': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": True,
-        "rows": 2,
-        "columns": 4,
-        "whitespace": [
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.0in", dpi=300),
-            UnitStr("0.0in", dpi=300)
-        ],
-        "duplexed": False # checked by the ExportManager to alternate page rotation
-    },
-    'Letter: 2x4 Standard 2.5"x3.5" Cards (Folded)': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": True,
-        "rows": 2,
-        "columns": 4,
-        "whitespace": [
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.0in", dpi=300),
-            UnitStr("0.0in", dpi=300)
-        ],
-        "item_indicies": {"index": [4, 5, 6, 7], "rotation": 180}
-    },
-    'Letter: 2x4 Standard 2.5"x3.5" Cards': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": True,
-        "rows": 2,
-        "columns": 4,
-        "whitespace": [
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.75in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.0in", dpi=300),
-            UnitStr("0.0in", dpi=300)
-        ],
-        "items": {"index": [0, 1, 2, 3, 4, 5, 6, 7, 8], "rotation": 180},
-        "duplex_print": True 
-    },    
-    'Letter: 10x13 Small 0.5" Tokens': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": False,
-        "rows": 13,
-        "columns": 9,
-        "whitespace": [
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.25in", dpi=300),
-            UnitStr("0.25in", dpi=300)
-        ]
-    },
-    'Letter: 7x10 Medium 0.75" Tokens': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": False,
-        "rows": 10,
-        "columns": 7,
-        "whitespace": [
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.25in", dpi=300),
-            UnitStr("0.25in", dpi=300)
-        ]
-    },
-    'Letter: 6x9 Standard 1.0" Tokens': {
-        "page_size": "Letter (8.5x11 inches)",
-        "geometry": UnitStrGeometry(width="8.5in", height="11in", unit="in", dpi=300),
-        "is_landscape": False,
-        "rows": 8,
-        "columns": 6,
-        "whitespace": [
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.5in", dpi=300),
-            UnitStr("0.125in", dpi=300),
-            UnitStr("0.125in", dpi=300)
-        ]
-    }
-}
-
-
-# class PageManager:
-#     def __init__(self, registry, settings):
-#         self.registry = registry
-#         self.settings = settings
-
-#     # EDITOR: add a live root under the scene and parent the page's slots
-#     def mount(self, layout_template, scene: QGraphicsScene, page_index: int):
-#         # Ensure grid is up-to-date (rows/cols/whitespace)
-#         layout_template.updateGrid()
-
-#         angle = self._page_angle(layout_template, page_index)
-#         rect_px = layout_template.geometry.to(self.unit, dpi=self.settings.dpi).rect
-
-#         root = QGraphicsItemGroup()
-#         root.setRotation(angle)
-#         root.setPos(0, 0)
-#         scene.addItem(root)
-
-#         # Pick the slots that belong to this page (flat list = one page; if pagination == CSV-driven, we still mount visible slots only)
-#         visible_slots = layout_template.items
-#         slot_angles = self._slot_angles(layout_template, page_index, visible_slots)
-
-#         # Parent slots to root for this page view
-#         for sl in visible_slots:
-#             sl.setParentItem(root)
-
-#         page = Page(index=page_index, angle=angle, rect_px=rect_px, slot_angles=slot_angles)
-#         return page, root
-
-#     # EDITOR: remove previously mounted root
-#     def unmount(self, scene: QGraphicsScene, root_item: QGraphicsItem):
-#         if root_item and root_item.scene() is scene:
-#             scene.removeItem(root_item)
-
-#     # EXPORT: build a page graph OFF-scene (mirrors mount semantics)
-#     def snapshot(self, layout_template, page_index: int):
-#         layout_template.updateGrid()
-
-#         angle = self._page_angle(layout_template, page_index)
-#         rect_px = layout_template.geometry.to(self.unit, dpi=self.settings.dpi).rect
-
-#         root = QGraphicsItemGroup()
-#         root.setRotation(angle)
-#         root.setPos(0, 0)
-
-#         visible_slots = []
-#         for sl in layout_template.items:
-#             # Shallow “export clone”: reuse the slot item, but do not attach to the live scene
-#             # If you truly need isolation, clone slots here instead of reusing
-#             sl.setParentItem(root)
-#             visible_slots.append(sl)
-
-#         slot_angles = self._slot_angles(layout_template, page_index, visible_slots)
-#         page = Page(index=page_index, angle=angle, rect_px=rect_px, slot_angles=slot_angles)
-#         return page, root
-
-#     # SHARED: page count is a pure function of rows/cols × CSV rows × copies
-#     def compute_page_count(self, layout_template, csv_rows_count: int | None, copies: int = 1) -> int:
-#         slots_per_page = max(len(layout_template.items), 1)
-#         rows = max(csv_rows_count or 1, 1)
-#         return ceil(rows / slots_per_page) * max(copies, 1)
-
-#     # Helpers (extend later for duplex/landscape/item-rotation per policy)
-#     def _page_angle(self, layout_template, page_index: int) -> float:
-#         return 0.0  # hook up if you support per-page rotation
-
-#     def _slot_angles(self, layout_template, page_index: int, slots: list["LayoutSlot"]) -> list[float]:
-#         # Return absolute per-slot angles (e.g., for item_rotation policy)
-#         return [0.0] * len(slots)
-
-
-# # class PageManager:
-# #     def __init__(self, registry, settings):
-# #         self._registry = registry     # your ProtoRegistry/root
-# #         self._settings = settings     # AppSettings (unit, dpi)
-
-# #     # ---- math helpers -----------------------------------------------------
-# #     @staticmethod
-# #     def _norm(deg: float) -> float:
-# #         d = deg % 360.0
-# #         return d + 360.0 if d < 0 else d
-
-# #     @staticmethod
-# #     def page_rotation_deg(is_landscape: bool, duplex: bool, page_index: int) -> float:
-# #         base = 90.0 if is_landscape else 0.0
-# #         if duplex and (page_index % 2 == 1):
-# #             base += 180.0
-# #         return (base % 360.0)
-
-# #     # ---- compute a Page descriptor ----------------------------------------
-# #     def build_page(self, template, page_index: int) -> Page:
-# #         dpi = self._settings.dpi
-# #         page_rect = template.geometry.to(self.unit, dpi=dpi).rect  # QRectF
-# #         angle = self.page_rotation_deg(template.is_landscape, template.duplex_print, page_index)
-
-# #         # Per-slot final angles
-# #         custom = template.item_rotation if getattr(template, "item_rotation", None) else []
-# #         slot_angles: List[float] = []
-# #         for idx, slot in enumerate(template.slots):  # row-major
-# #             base = getattr(slot, "base_rotation", 0.0) or 0.0
-# #             add  = custom[idx] if idx < len(custom) else 0.0
-# #             slot_angles.append(self._norm(angle + base + add))
-
-# #         return Page(index=page_index, angle=angle, rect_px=page_rect, slot_angles=slot_angles)
-
-# #     # ---- GUI mounting (live) ----------------------------------------------
-# #     def mount(self, template, scene, page_index: int) -> tuple[Page, QGraphicsItemGroup]:
-# #         """
-# #         Returns (Page, page_root).
-# #         page_root is added to the scene; template becomes a child of page_root.
-# #         Slots remain children of template.
-# #         """
-# #         page = self.build_page(template, page_index)
-
-# #         # 1) Create the page root container
-# #         root = QGraphicsItemGroup()
-# #         scene.addItem(root)
-
-# #         # 2) Parent the template under the root (keep slots under template)
-# #         template.setParentItem(root)
-# #         template.setPos(0, 0)  # if your template already lives at (0,0), this is redundant
-
-# #         # 3) Apply per-slot *relative* rotation (exclude page angle!)
-# #         custom = getattr(template, "item_rotation", None) or []
-# #         for idx, slot in enumerate(template.slots):
-# #             # make sure origin is sensible for rotation
-# #             slot.setTransformOriginPoint(slot.boundingRect().center())
-# #             base = getattr(slot, "base_rotation", 0.0) or 0.0
-# #             add  = custom[idx] if idx < len(custom) else 0.0
-# #             slot.setRotation((base + add) % 360.0)
-
-# #         # 4) Set the page rotation on the root *after* children are in place,
-# #         #    and rotate around the page center
-# #         root.setTransformOriginPoint(page.rect_px.center())
-# #         root.setRotation(page.angle)
-
-# #         return page, root
-
-# #     # ---- unmount (GUI cleanup) --------------------------------------------
-# #     def unmount(self, scene, page_root_item: QGraphicsItem) -> None:
-# #         if page_root_item is None:
-# #             return
-# #         scene.removeItem(page_root_item)
-
-# #     # ---- export snapshot (frozen) -----------------------------------------
-# #     def snapshot(self, template, page_index: int):
-# #         """
-# #         For export: deep-clone the needed objects into an off-scene structure.
-# #         Returns (Page, cloned_root_item) that ExportManager can render.
-# #         """
-# #         page = self.build_page(template, page_index)
-
-# #         # Clone a minimal tree (template -> slots -> component templates -> elements)
-# #         # Use your ProtoRegistry/Factory to clone with new PIDs.
-# #         clone_lt = self._registry.clone(template)  # per your existing API
-# #         # Create a dedicated root for the cloned page
-# #         cloned_root = QGraphicsObject()
-# #         cloned_root.setTransformOriginPoint(page.rect_px.center())
-# #         cloned_root.setRotation(page.angle)
-
-# #         # Add cloned slots under cloned_root; apply angles
-# #         for idx, cslot in enumerate(clone_lt.slots):
-# #             cslot.setParentItem(cloned_root)
-# #             cslot.setTransformOriginPoint(cslot.boundingRect().center())
-# #             cslot.setRotation(page.slot_angles[idx])
-
-# #         return page, cloned_root
\ No newline at end of file
+# Print policies live in resources/print_policies.json (plus the user's policy
+# directory); PRINT_POLICIES is kept for callers that index the old dicts.
+
+
+class PageManager:
+    """
+    Turns a LayoutTemplate and its policy into immutable Page descriptors.
+
+    Slot rectangles and content references are read once per plan (the grid is
+    the same on every page); each page then only adds its angle, side and the
+    merge rows from a PagePlanner, so planning never clones graphics items.
+
+    Policy rotation: `item_rotation` on the layout (one angle per slot) and the
+    policy's rotated slots ("rotate_slots": {"index": [...], "rotation": deg})
+    rotate slots on every page, except on duplex policies, where the policy
+    rotation describes the back side. Duplex backs (odd pages) turn 180°.
+
+    Layouts with a back component (back_pid) instead follow every front with a
+    back sheet (see backs()); their fronts are never turned.
+    """
+    def __init__(self, registry=None, settings=None):
+        self.registry = registry
+        self.settings = settings
+
+    @property
+    def dpi(self) -> int:
+        return getattr(self.settings, "dpi", 300)
+
+    # ---- math helpers -----------------------------------------------------
+    @staticmethod
+    def _norm(deg: float) -> float:
+        return float(deg) % 360.0
+
+    @staticmethod
+    def policy_for(layout) -> Optional[PrintPolicy]:
+        return POLICIES.get(getattr(layout, "polkey", None))
+
+    @classmethod
+    def is_duplex(cls, layout) -> bool:
+        pol = cls.policy_for(layout)
+        return bool(getattr(layout, "duplex_print", False) or (pol is not None and pol.duplex_print))
+
+    @staticmethod
+    def has_backs(layout) -> bool:
+        return bool(getattr(layout, "back_pid", None))
+
+    @classmethod
+    def page_angle(cls, layout, page_index: int) -> float:
+        if cls.has_backs(layout):
+            return 0.0
+        return 180.0 if cls.is_duplex(layout) and page_index % 2 == 1 else 0.0
+
+    @staticmethod
+    def mirror_axis(layout) -> str:
+        """
+        "x" to mirror left/right, "y" to mirror top/bottom. Flipping on the long
+        edge mirrors across it: left/right on portrait sheets, top/bottom on
+        landscape ones; the short edge is the other way round.
+        """
+        long_edge = getattr(layout, "flip_edge", "long") != "short"
+        landscape = bool(getattr(layout, "is_landscape", False))
+        return "x" if long_edge != landscape else "y"
+
+    @classmethod
+    def slot_rotations(cls, layout, back: bool = False) -> List[float]:
+        """Per-slot rotation (deg) for one side of the sheet."""
+        n = len(layout.items)
+        custom = list(getattr(layout, "_item_rotation", None) or [])
+        angles = [float(custom[i]) if i < len(custom) else 0.0 for i in range(n)]
+        pol = cls.policy_for(layout)
+        if cls.is_duplex(layout) and not back and not cls.has_backs(layout):
+            return angles
+        if pol is not None:
+            for i in pol.rotated_slots:
+                if 0 <= i < n:
+                    angles[i] += pol.slot_rotation
+        return [cls._norm(a) for a in angles]
+
+    # ---- descriptors ------------------------------------------------------
+    def _placements(self, layout, dpi: int, back: bool) -> Tuple[SlotPlacement, ...]:
+        rotations = self.slot_rotations(layout, back=back)
+        out = []
+        for idx, slot in enumerate(layout.items):
+            out.append(SlotPlacement(
+                index=idx,
+                row=getattr(slot, "row", 0),
+                column=getattr(slot, "column", 0),
+                rect_px=slot.geometry.to("px", dpi=dpi).rect,
+                angle=rotations[idx],
+                content_pid=slot.content_pid,
+                content_tpid=slot.content_tpid,
+            ))
+        return tuple(out)
+
+    def back_placements(self, layout, dpi: int) -> Tuple[SlotPlacement, ...]:
+        """
+        Where each slot's back prints: the slot rect reflected across the page's
+        mirror axis (so asymmetric margins still line up). Index is the front
+        slot; row/column are those of the slot the back lands on in a mirrored grid.
+        """
+        page = layout.geometry.to("px", dpi=dpi).rect
+        axis = self.mirror_axis(layout)
+        rows = getattr(layout, "rows", 0) or 1
+        cols = getattr(layout, "columns", 0) or 1
+        out = []
+        for sl in self._placements(layout, dpi, back=True):
+            r = QRectF(sl.rect_px)
+            if axis == "x":
+                r.moveLeft(page.left() + page.right() - r.right())
+                row, column = sl.row, cols - 1 - sl.column
+            else:
+                r.moveTop(page.top() + page.bottom() - r.bottom())
+                row, column = rows - 1 - sl.row, sl.column
+            # Mirroring reverses the turn, so the back reads the same way up.
+            out.append(replace(sl, rect_px=r, row=row, column=column, angle=self._norm(-sl.angle)))
+        return tuple(out)
+
+    def backs(self, layout, fronts: List[Page], dpi: Optional[int] = None) -> List[Page]:
+        """A back Page for each front Page: mirrored slots, the same merge rows."""
+        dpi = dpi or self.dpi
+        slots = self.back_placements(layout, dpi)
+        return [replace(front, angle=0.0, side="back", slots=slots,
+                        slot_angles=tuple(sl.angle for sl in slots)) for front in fronts]
+
+    def plan(self, layout, merge_manager=None, copies: int = 1, page_range=None, dpi: Optional[int] = None,
+             planner: Optional[PagePlanner] = None) -> List[Page]:
+        """
+        Page descriptors for `layout` (all pages, or those in `page_range`).
+        Pass `planner` to reuse one already built for the same layout and copies.
+        """
+        dpi = dpi or self.dpi
+        if planner is None:
+            planner = PagePlanner(layout, merge_manager, copies=copies) if merge_manager else None
+        count = planner.page_count if planner else max(1, int(copies))
+        page_rect = layout.geometry.to("px", dpi=dpi).rect
+        landscape = bool(getattr(layout, "is_landscape", False))
+
+        duplex = self.is_duplex(layout) and not self.has_backs(layout)
+        sides = {False: self._placements(layout, dpi, back=False)}
+        if duplex:
+            sides[True] = self._placements(layout, dpi, back=True)
+        n = len(sides[False])
+
+        indices = planner.pages(page_range) if planner else (
+            range(count) if page_range is None else
+            (p for r in page_range for p in (r if isinstance(r, range) else (r,)) if 0 <= p < count))
+        pages: List[Page] = []
+        for index in indices:
+            back = duplex and index % 2 == 1
+            angle = 180.0 if back else 0.0
+            slots = sides[back]
+            rows = tuple(planner.row_index(index, s) for s in range(n)) if planner and planner.has_merge else (None,) * n
+            pages.append(Page(
+                index=index,
+                angle=angle,
+                rect_px=page_rect,
+                slot_angles=tuple(self._norm(angle + sl.angle) for sl in slots),
+                slots=slots,
+                rows=rows,
+                side="back" if back else "front",
+                landscape=landscape,
+            ))
+        return pages
+
+    def build_page(self, layout, page_index: int, merge_manager=None, copies: int = 1) -> Page:
+        return self.plan(layout, merge_manager, copies=copies, page_range=[page_index])[0]
+
+    def page_count(self, layout, merge_manager=None, copies: int = 1) -> int:
+        if merge_manager is None:
+            return max(1, int(copies))
+        return PagePlanner(layout, merge_manager, copies=copies).page_count
+
+    # ---- GUI --------------------------------------------------------------
+    def apply(self, layout, page: Page) -> None:
+        """Show `page`'s orientation on the live editor items (no cloning)."""
+        for placement, slot in zip(page.slots, layout.items):
+            slot.setTransformOriginPoint(slot.boundingRect().center())
+            slot.setRotation(placement.angle)
+        layout.setTransformOriginPoint(layout.boundingRect().center())
+        layout.setRotation(page.angle)
@@ -0,0 +1,195 @@
+# prototypyside/services/pagination/page_planner.py
+"""
+Random-access page planning.
+
+Every slot bound to a merge source S takes rows from S in slot order, so with
+k_S slots bound to S per page, slot j (the j-th slot bound to S) of page p
+receives logical card p * k_S + j. With `copies`, the run of n_S cards is
+repeated, so logical card L is card L % n_S of the run while L < copies * n_S.
+Sources with a quantity column count their expanded cards in n_S and map a card
+back to its source row by bisection over the quantity prefix sums.
+
+Nothing here depends on what earlier pages consumed, so any page (or range of
+pages) can be planned, merged and rendered independently.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from math import ceil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class SlotBinding:
+    slot_index: int
+    source_key: int     # id() of the bound source
+    ordinal: int        # j: position among this source's slots on a page
+
+
+@dataclass(frozen=True)
+class SourcePlan:
+    source: Any
+    slots_per_page: int     # k_S
+    rows: int               # n_S: cards in one run (quantity-expanded)
+    copies: int
+
+    @property
+    def total(self) -> int:
+        return self.rows * self.copies
+
+    @property
+    def pages(self) -> int:
+        return ceil(self.total / self.slots_per_page) if self.slots_per_page else 0
+
+
+class PagePlanner:
+    def __init__(self, layout, merge_manager, copies: int = 1):
+        self.copies = max(1, int(copies))
+        self.slot_count = len(getattr(layout, "items", None) or [])
+        self._bindings: List[Optional[SlotBinding]] = []
+        self._sources: Dict[int, SourcePlan] = {}
+
+        per_source: Dict[int, int] = {}
+        found: Dict[int, Any] = {}
+        for index, slot in enumerate(layout.items):
+            source = self._source_for(slot, merge_manager)
+            if source is None:
+                self._bindings.append(None)
+                continue
+            key = id(source)
+            found[key] = source
+            j = per_source.get(key, 0)
+            per_source[key] = j + 1
+            self._bindings.append(SlotBinding(index, key, j))
+
+        for key, k in per_source.items():
+            source = found[key]
+            cards = getattr(source, "card_count", source.row_count)
+            self._sources[key] = SourcePlan(source, k, cards, self.copies)
+
+    @staticmethod
+    def _source_for(slot, merge_manager) -> Optional[Any]:
+        if slot is None:
+            return None
+        # Peek at the path so planning never hydrates slot content.
+        if hasattr(slot, "content_csv_path"):
+            return merge_manager.lookup_path(slot.content_csv_path)
+        comp = getattr(slot, "content", None)
+        return merge_manager.lookup(comp) if comp else None
+
+    # ---------------------------
+    # Sizing
+    # ---------------------------
+    @property
+    def has_merge(self) -> bool:
+        return any(plan.total for plan in self._sources.values())
+
+    @property
+    def page_count(self) -> int:
+        if not self.has_merge:
+            return self.copies
+        return max(1, max(plan.pages for plan in self._sources.values()))
+
+    @property
+    def total_rows(self) -> int:
+        """Rows merged across the whole run (every source, every copy)."""
+        return sum(plan.total for plan in self._sources.values())
+
+    def pages(self, page_range: Optional[Iterable[Union[int, range]]] = None) -> Iterator[int]:
+        """Valid page indices from `page_range` (default: all), in the order given."""
+        count = self.page_count
+        for p in ([range(count)] if page_range is None else page_range):
+            if isinstance(p, range):
+                yield from range(max(0, p.start), min(count, p.stop))
+            elif 0 <= p < count:
+                yield p
+
+    # ---------------------------
+    # Lookups (O(1); O(log n) for quantity-expanded sources)
+    # ---------------------------
+    def binding(self, slot_index: int) -> Optional[SlotBinding]:
+        return self._bindings[slot_index]
+
+    def source(self, slot_index: int) -> Optional[Any]:
+        b = self._bindings[slot_index]
+        return self._sources[b.source_key].source if b else None
+
+    def row_index(self, page: int, slot_index: int) -> Optional[int]:
+        """Source row for slot `slot_index` on `page`, or None if the slot gets no row."""
+        b = self._bindings[slot_index]
+        if b is None:
+            return None
+        plan = self._sources[b.source_key]
+        logical = page * plan.slots_per_page + b.ordinal
+        if logical >= plan.total or plan.rows == 0:
+            return None
+        card = logical % plan.rows
+        card_row = getattr(plan.source, "card_row", None)
+        return card_row(card) if card_row else card
+
+    def run_rows(self, slot_index: int) -> Iterator[int]:
+        """Row of every card in the run (copies included) of the source bound to `slot_index`."""
+        b = self._bindings[slot_index]
+        if b is None:
+            return
+        plan = self._sources[b.source_key]
+        card_row = getattr(plan.source, "card_row", None)
+        for logical in range(plan.total):
+            card = logical % plan.rows
+            yield card_row(card) if card_row else card
+
+    def row_for(self, page: int, slot_index: int) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """
+        (bound, row). `bound` is False when the slot has no source or the run is
+        exhausted; `row` may be None for a bound slot when the source pads (see
+        QueryCursor) and the slot should be blank.
+        """
+        i = self.row_index(page, slot_index)
+        if i is None:
+            return False, None
+        return True, self.source(slot_index).row(i)
+
+    def pages_for_rows(self, source: Any, rows: Iterable[int]) -> List[int]:
+        """Pages on which any of `rows` of `source` lands (for re-exporting a MergeDiff)."""
+        plan = self._sources.get(id(source))
+        if plan is None or not plan.slots_per_page or not plan.rows:
+            return []
+        cards_for = getattr(source, "cards_for", None)
+        pages = set()
+        for r in rows:
+            cards = cards_for(r) if cards_for else range(r, r + 1)
+            for card in cards:
+                for c in range(self.copies):
+                    logical = card + c * plan.rows
+                    if logical < plan.total:
+                        pages.add(logical // plan.slots_per_page)
+        return sorted(pages)
+
+    def plan_page(self, page: int) -> List[Tuple[int, Optional[int]]]:
+        return [(s, self.row_index(page, s)) for s in range(self.slot_count)]
+
+
+def parse_page_range(text: str) -> Optional[List[range]]:
+    """
+    "1-3, 7, 10-" → [range(0, 3), range(6, 7), range(9, ∞)] of 0-based pages, for
+    PagePlanner.pages(), which clips open ends to the page count. Blank → None (all).
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    out: List[range] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, _, hi = part.partition("-")
+            start = int(lo) if lo.strip() else 1
+            stop = int(hi) if hi.strip() else sys.maxsize
+        else:
+            start = stop = int(part)
+        if start < 1 or stop < start:
+            raise ValueError(f"Bad page range {part!r}")
+        out.append(range(start - 1, stop))
+    return out
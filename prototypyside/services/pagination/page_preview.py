@@ -0,0 +1,117 @@
+# prototypyside/services/pagination/page_preview.py
+"""
+On-demand rendering of merged pages for the GUI.
+
+One export clone of the layout serves as a reusable frame: rendering page N
+binds that page's rows into the frame (values that do not change are left
+alone, so their cached renders survive) and paints it into a QImage. Only the
+last few page images are kept; thumbnails are small and kept for every page.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter, QColor
+
+from prototypyside.services.export_manager import ExportManager
+from prototypyside.services.pagination.page_manager import PageManager
+from prototypyside.services.proto_paint import ProtoPaint
+
+
+class PagePreview:
+    def __init__(self, layout, root_registry, merge_manager, dpi: int = 96, keep: int = 3, copies: int = 1):
+        self.layout = layout
+        self.dpi = dpi
+        self.keep = max(1, keep)
+        self._em = ExportManager(root_registry, merge_manager)
+        self._frame = self._em.frame(layout, copies=copies, dpi=dpi)
+        self.planner = self._em.planner
+        self.descriptors = PageManager().plan(layout, planner=self.planner, dpi=72)
+        # Per bound slot: what to assign per row, and the frame's own values to restore.
+        self._plans, self._defaults = self._em.bind_plans(self._frame)
+        self._pages: "OrderedDict[int, QImage]" = OrderedDict()
+        self._thumbs: Dict[Tuple[int, int], QImage] = {}
+
+    # ---------------------------
+    # Pages
+    # ---------------------------
+    @property
+    def page_count(self) -> int:
+        return self.planner.page_count
+
+    def _bind(self, page: int) -> Set[int]:
+        """Bind `page`'s rows into the frame; returns slots to leave blank."""
+        blank: Set[int] = set()
+        for s, plan in self._plans.items():
+            comp = self._frame.items[s].content
+            bound, row = self.planner.row_for(page, s)
+            if not bound:
+                row = self._defaults[s]
+            elif row is None:
+                # Group padding from a query: blank on this page only.
+                blank.add(s)
+                continue
+            comp.set_csv_content(row, plan)
+        return blank
+
+    def _render(self, page: int, dpi: int) -> QImage:
+        blank = self._bind(page)
+        size = self.layout.geometry.to("px", dpi=dpi).size
+        image = QImage(max(1, round(size.width())), max(1, round(size.height())),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.setDotsPerMeterX(round(dpi / 0.0254))
+        image.setDotsPerMeterY(round(dpi / 0.0254))
+        image.fill(QColor(Qt.white))
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        painter.scale(dpi / 72.0, dpi / 72.0)  # the frame is laid out in points
+        desc = self.descriptors[page]
+        painter.setTransform(desc.transform(), True)
+        ProtoPaint.render_page(self._frame, self._frame.ctx, painter, skip=blank,
+                               angles=[sl.angle for sl in desc.slots])
+        painter.end()
+        return image
+
+    def image(self, page: int) -> Optional[QImage]:
+        """Page `page` at the preview dpi; the most recent `keep` pages are cached."""
+        if not 0 <= page < self.page_count:
+            return None
+        image = self._pages.get(page)
+        if image is not None:
+            self._pages.move_to_end(page)
+            return image
+        image = self._render(page, self.dpi)
+        self._pages[page] = image
+        while len(self._pages) > self.keep:
+            self._pages.popitem(last=False)
+        return image
+
+    def has_image(self, page: int) -> bool:
+        return page in self._pages
+
+    def thumbnail(self, page: int, width: int = 120) -> Optional[QImage]:
+        key = (page, width)
+        thumb = self._thumbs.get(key)
+        if thumb is None:
+            if not 0 <= page < self.page_count:
+                return None
+            image = self._pages.get(page)
+            if image is None:
+                # Rendered straight through: thumbnails must not evict the visible pages.
+                image = self._render(page, self.dpi)
+            thumb = image.scaledToWidth(width, Qt.SmoothTransformation)
+            self._thumbs[key] = thumb
+        return thumb
+
+    def has_thumbnail(self, page: int, width: int = 120) -> bool:
+        return (page, width) in self._thumbs
+
+    def close(self) -> None:
+        self._pages.clear()
+        self._thumbs.clear()
+        self._frame = None
+        self._em.release()
@@ -0,0 +1,165 @@
+# prototypyside/services/pagination/print_marks.py
+"""
+Export-time crop marks, cut lines and registration targets.
+
+mark_geometry() turns the trim rects of one sheet into vector marks in a single
+pass: a crop mark in each margin at every distinct trim edge (what a guillotine
+operator lines the blade up with), optional hairline cut lines around each
+trim, and optional registration targets centred in the margins. PrintMarks
+records each distinct geometry into a QPicture once and replays it, so a grid
+export draws the same picture on every page and packed or tiled sheets with the
+same arrangement share theirs. All values are in points.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QLineF, QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPicture
+
+Rect = Tuple[float, float, float, float]     # x, y, width, height
+
+
+@dataclass(frozen=True)
+class MarkOptions:
+    crop_marks: bool = True
+    cut_lines: bool = False
+    registration: bool = False
+    length: float = 12.0        # crop mark length
+    offset: float = 3.0         # gap between the trim edge and the mark
+    weight: float = 0.25        # line width (hairline)
+    target: float = 5.0         # registration target radius
+
+
+@dataclass(frozen=True)
+class MarkGeometry:
+    lines: Tuple[Tuple[float, float, float, float], ...] = ()
+    cuts: Tuple[Rect, ...] = ()
+    targets: Tuple[Tuple[float, float], ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.lines or self.cuts or self.targets)
+
+
+def mark_geometry(
+    trims: Iterable[Rect],
+    sheet_width: float,
+    sheet_height: float,
+    margins: Tuple[float, float, float, float],
+    options: MarkOptions = MarkOptions(),
+) -> MarkGeometry:
+    """
+    Marks for `trims` on a sheet with `margins` (top, bottom, left, right).
+    Edges outside the printable area (e.g. a board edge on another tile) get
+    no crop mark; cut lines are clipped to the printable area.
+    """
+    top, bottom, left, right = margins
+    W, H = sheet_width, sheet_height
+    ax0, ay0, ax1, ay1 = left, top, W - right, H - bottom
+    eps = 0.01
+    xs, ys, cuts = set(), set(), []
+    for x, y, w, h in trims:
+        for ex in (x, x + w):
+            if ax0 - eps <= ex <= ax1 + eps:
+                xs.add(round(ex, 2))
+        for ey in (y, y + h):
+            if ay0 - eps <= ey <= ay1 + eps:
+                ys.add(round(ey, 2))
+        if options.cut_lines:
+            cx0, cy0 = max(x, ax0), max(y, ay0)
+            cx1, cy1 = min(x + w, ax1), min(y + h, ay1)
+            if cx1 > cx0 and cy1 > cy0:
+                cuts.append((cx0, cy0, cx1 - cx0, cy1 - cy0))
+
+    lines = []
+    if options.crop_marks:
+        off, length = options.offset, options.length
+
+        def run(margin):
+            # Marks fit between the offset and the sheet edge, or are skipped.
+            return min(length, margin - off) if margin > off else 0.0
+
+        lt, lb, ll, lr = run(top), run(bottom), run(left), run(right)
+        for x in sorted(xs):
+            if lt:
+                lines.append((x, ay0 - off, x, ay0 - off - lt))
+            if lb:
+                lines.append((x, ay1 + off, x, ay1 + off + lb))
+        for y in sorted(ys):
+            if ll:
+                lines.append((ax0 - off, y, ax0 - off - ll, y))
+            if lr:
+                lines.append((ax1 + off, y, ax1 + off + lr, y))
+
+    targets = []
+    if options.registration:
+        r = options.target
+        if top > 2 * r:
+            targets.append((W / 2, top / 2))
+        if bottom > 2 * r:
+            targets.append((W / 2, H - bottom / 2))
+        if left > 2 * r:
+            targets.append((left / 2, H / 2))
+        if right > 2 * r:
+            targets.append((W - right / 2, H / 2))
+
+    return MarkGeometry(tuple(lines), tuple(cuts), tuple(targets))
+
+
+class PrintMarks:
+    """Mark pictures for one sheet size, recorded once per distinct set of trims."""
+    def __init__(self, sheet_width: float, sheet_height: float,
+                 margins: Tuple[float, float, float, float], options: Optional[MarkOptions] = None):
+        self.sheet_width = sheet_width
+        self.sheet_height = sheet_height
+        self.margins = tuple(margins)
+        self.options = options or MarkOptions()
+        self._pictures: Dict[Tuple[Rect, ...], Optional[QPicture]] = {}
+
+    @classmethod
+    def for_layout(cls, layout, sheet_width: float, sheet_height: float) -> Optional["PrintMarks"]:
+        """PrintMarks from the layout's mark settings; None when it prints no marks."""
+        options = MarkOptions(
+            crop_marks=bool(getattr(layout, "crop_marks", False)),
+            cut_lines=bool(getattr(layout, "cut_lines", False)),
+            registration=bool(getattr(layout, "registration_marks", False)),
+        )
+        if not (options.crop_marks or options.cut_lines or options.registration):
+            return None
+        dpi = layout.ctx.dpi
+        margins = [v.to("pt", dpi=dpi).value for v in layout.whitespace[:4]]
+        return cls(sheet_width, sheet_height, margins, options)
+
+    def picture(self, trims: Iterable[Rect]) -> Optional[QPicture]:
+        key = tuple(tuple(round(v, 2) for v in t) for t in trims)
+        if key not in self._pictures:
+            geometry = mark_geometry(key, self.sheet_width, self.sheet_height, self.margins, self.options)
+            self._pictures[key] = None if geometry.is_empty else self._record(geometry)
+        return self._pictures[key]
+
+    def paint(self, painter: QPainter, trims: Iterable[Rect]) -> None:
+        picture = self.picture(trims)
+        if picture is not None:
+            painter.drawPicture(QPointF(0, 0), picture)
+
+    def _record(self, geometry: MarkGeometry) -> QPicture:
+        picture = QPicture()
+        p = QPainter(picture)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        pen = QPen(QColor(Qt.black))
+        pen.setWidthF(self.options.weight)
+        p.setPen(pen)
+        p.setBrush(Qt.NoBrush)
+        if geometry.lines:
+            p.drawLines([QLineF(*line) for line in geometry.lines])
+        for rect in geometry.cuts:
+            p.drawRect(QRectF(*rect))
+        r = self.options.target
+        for x, y in geometry.targets:
+            p.drawEllipse(QPointF(x, y), r * 0.6, r * 0.6)
+            p.drawLine(QLineF(x - r, y, x + r, y))
+            p.drawLine(QLineF(x, y - r, x, y + r))
+        p.end()
+        return picture
@@ -0,0 +1,300 @@
+# prototypyside/services/pagination/print_policy.py
+"""
+Print policies: named page setups (sheet, grid, whitespace) a layout can adopt.
+
+Policies are read on first use from the bundled resources/print_policies.json,
+then from every *.json file in the user's policy directory (policy_dir()), so
+users can add policies or replace a bundled one by name. Each entry is
+validated into a frozen PrintPolicy; a bad bundled entry is an error, a bad
+user file is reported and skipped. Page and cell rects are computed once per
+policy and dpi (policy_geometry); grid_cells() does the same arithmetic for
+LayoutTemplate.updateGrid.
+
+PRINT_POLICIES is the name → dict view older callers index into.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QStandardPaths
+
+from prototypyside.utils.units.unit_str import UnitStr
+from prototypyside.utils.units.unit_str_geometry import UnitStrGeometry
+
+# "grid": one component per slot; "packed": slot contents and their merged
+# cards bin-packed onto as few sheets as possible (services/pagination/bin_packer);
+# "hex": round/hexagonal tokens close-packed (services/pagination/hex_packer);
+# "tiled": each item is a board split over overlapping pages (services/pagination/tiler).
+PAGINATION_MODES = ("grid", "packed", "hex", "tiled")
+
+BUNDLED_POLICIES = Path(__file__).resolve().parents[2] / "resources" / "print_policies.json"
+CUSTOM_POLICIES = "custom_policies.json"    # file in policy_dir() that add(save=True) writes
+DEFAULT_POLICY = 'Letter: 3x3 Standard 2.5"x3.5" Cards'
+POLICY_DPI = 300    # dpi carried by the UnitStr values a policy hands out
+
+Rect = Tuple[float, float, float, float]     # x, y, width, height
+
+
+def policy_dir() -> Path:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    return Path(base or Path.home() / ".prototypyside") / "print_policies"
+
+
+@lru_cache(maxsize=256)
+def grid_cells(width: float, height: float, rows: int, columns: int,
+               whitespace: Tuple[float, ...]) -> Tuple[float, float, Tuple[Rect, ...]]:
+    """
+    (cell width, cell height, row-major cell rects) for a rows × columns grid on
+    a `width` × `height` page with `whitespace` (top, bottom, left, right,
+    spacing_x, spacing_y). Any unit, as long as it is the same throughout.
+    """
+    top, bottom, left, right, spacing_x, spacing_y = whitespace
+    avail_w = width - left - right - (columns - 1) * spacing_x
+    avail_h = height - top - bottom - (rows - 1) * spacing_y
+    cell_w = max(avail_w / columns, 0.0) if columns else 0.0
+    cell_h = max(avail_h / rows, 0.0) if rows else 0.0
+    cells = tuple((left + c * (cell_w + spacing_x), top + r * (cell_h + spacing_y), cell_w, cell_h)
+                  for r in range(rows) for c in range(columns))
+    return cell_w, cell_h, cells
+
+
+@dataclass(frozen=True)
+class PolicyGeometry:
+    """A policy's page and slots in px at `dpi`."""
+    dpi: int
+    page: Tuple[float, float]
+    cell: Tuple[float, float]
+    cells: Tuple[Rect, ...]
+
+
+@dataclass(frozen=True)
+class PrintPolicy:
+    name: str
+    rows: int
+    columns: int
+    width: str = "8.5in"
+    height: str = "11in"
+    whitespace: Tuple[str, ...] = ("0.25in", "0.25in", "0.5in", "0.5in", "0.0in", "0.0in")
+    page_size: str = "custom"
+    is_landscape: bool = False
+    duplex_print: bool = False
+    pagination_mode: str = "grid"
+    rotated_slots: Tuple[int, ...] = ()     # slots turned on every page (the back side on duplex policies)
+    slot_rotation: float = 0.0
+    source: str = field(default="", compare=False)   # file the policy was read from
+
+    _FIELDS = frozenset(("page_size", "width", "height", "is_landscape", "rows", "columns",
+                         "whitespace", "duplex_print", "pagination_mode", "rotate_slots"))
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any], source: str = "") -> "PrintPolicy":
+        """Validate one policy entry; raises ValueError naming the policy and the problem."""
+        def fail(problem: str):
+            raise ValueError(f"Print policy {name!r}: {problem}")
+
+        if not isinstance(data, dict):
+            fail("expected an object")
+        unknown = set(data) - cls._FIELDS
+        if unknown:
+            fail(f"unknown field(s) {', '.join(sorted(unknown))}")
+        try:
+            rows, columns = int(data["rows"]), int(data["columns"])
+        except (KeyError, TypeError, ValueError):
+            fail("'rows' and 'columns' must be integers")
+        if rows < 1 or columns < 1:
+            fail("'rows' and 'columns' must be at least 1")
+
+        width, height = str(data.get("width", cls.width)), str(data.get("height", cls.height))
+        whitespace = data.get("whitespace", cls.whitespace)
+        if not isinstance(whitespace, (list, tuple)) or len(whitespace) != 6:
+            fail("'whitespace' needs six lengths: top, bottom, left, right, spacing_x, spacing_y")
+        whitespace = tuple(str(v) for v in whitespace)
+        try:
+            w_in, h_in = (UnitStr(v, dpi=POLICY_DPI).to("in", dpi=POLICY_DPI).value for v in (width, height))
+            ws_in = tuple(UnitStr(v, dpi=POLICY_DPI).to("in", dpi=POLICY_DPI).value for v in whitespace)
+        except (TypeError, ValueError) as e:
+            fail(str(e))
+        if w_in <= 0 or h_in <= 0:
+            fail("page width and height must be positive")
+        if any(v < 0 for v in ws_in):
+            fail("whitespace cannot be negative")
+        cell_w, cell_h, _cells = grid_cells(w_in, h_in, rows, columns, ws_in)
+        if cell_w <= 0 or cell_h <= 0:
+            fail("margins and spacing leave no room for the cells")
+
+        mode = data.get("pagination_mode", "grid")
+        if mode not in PAGINATION_MODES:
+            fail(f"'pagination_mode' must be one of {', '.join(PAGINATION_MODES)}")
+        spec = data.get("rotate_slots") or {}
+        try:
+            rotated = tuple(int(i) for i in spec.get("index", ()))
+            rotation = float(spec.get("rotation", 0) or 0)
+        except (AttributeError, TypeError, ValueError):
+            fail("'rotate_slots' must be {\"index\": [slot, ...], \"rotation\": degrees}")
+        if any(not 0 <= i < rows * columns for i in rotated):
+            fail(f"'rotate_slots' indexes must be below {rows * columns}")
+
+        return cls(name=name, rows=rows, columns=columns, width=width, height=height,
+                   whitespace=whitespace, page_size=str(data.get("page_size", "custom")),
+                   is_landscape=bool(data.get("is_landscape", False)),
+                   duplex_print=bool(data.get("duplex_print", False)), pagination_mode=mode,
+                   rotated_slots=rotated, slot_rotation=rotation, source=source)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "page_size": self.page_size,
+            "width": self.width,
+            "height": self.height,
+            "is_landscape": self.is_landscape,
+            "rows": self.rows,
+            "columns": self.columns,
+            "whitespace": list(self.whitespace),
+            "duplex_print": self.duplex_print,
+            "pagination_mode": self.pagination_mode,
+        }
+        if self.rotated_slots:
+            data["rotate_slots"] = {"index": list(self.rotated_slots), "rotation": self.slot_rotation}
+        return data
+
+    # Fresh objects on every call: layouts keep and edit what they are given.
+    def page_geometry(self) -> UnitStrGeometry:
+        return UnitStrGeometry(width=self.width, height=self.height, unit="in", dpi=POLICY_DPI)
+
+    def whitespace_list(self) -> List[UnitStr]:
+        return [UnitStr(v, dpi=POLICY_DPI) for v in self.whitespace]
+
+    def as_legacy_dict(self) -> Dict[str, Any]:
+        """The dict shape PRINT_POLICIES entries had before policies were typed."""
+        data = {
+            "page_size": self.page_size,
+            "geometry": self.page_geometry(),
+            "is_landscape": self.is_landscape,
+            "rows": self.rows,
+            "columns": self.columns,
+            "whitespace": self.whitespace_list(),
+            "duplex_print": self.duplex_print,
+            "pagination_mode": self.pagination_mode,
+        }
+        if self.rotated_slots:
+            data["items"] = {"index": list(self.rotated_slots), "rotation": self.slot_rotation}
+        return data
+
+
+@lru_cache(maxsize=None)
+def policy_geometry(policy: PrintPolicy, dpi: int) -> PolicyGeometry:
+    px = [UnitStr(v, dpi=dpi).to("px", dpi=dpi).value for v in (policy.width, policy.height, *policy.whitespace)]
+    width, height, whitespace = px[0], px[1], tuple(px[2:])
+    cell_w, cell_h, cells = grid_cells(width, height, policy.rows, policy.columns, whitespace)
+    return PolicyGeometry(dpi, (width, height), (cell_w, cell_h), cells)
+
+
+def _unique_keys(pairs):
+    data = {}
+    for key, value in pairs:
+        if key in data:
+            raise ValueError(f"duplicate key {key!r}")
+        data[key] = value
+    return data
+
+
+class PolicyRegistry:
+    """Name → PrintPolicy, loaded lazily from the bundled file and the user directory."""
+    def __init__(self, bundled: Path = BUNDLED_POLICIES, user_dir: Optional[Path] = None):
+        self.bundled = Path(bundled)
+        self.user_dir = Path(user_dir) if user_dir else None
+        self._policies: Optional[Dict[str, PrintPolicy]] = None
+
+    @staticmethod
+    def read(path: Path) -> List[PrintPolicy]:
+        """Policies in one JSON file (an object of name → policy); raises ValueError or OSError."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f, object_pairs_hook=_unique_keys)
+        if not isinstance(data, dict):
+            raise ValueError("expected an object of policy name → policy")
+        return [PrintPolicy.from_dict(name, entry, source=str(path)) for name, entry in data.items()]
+
+    def _load(self) -> Dict[str, PrintPolicy]:
+        if self._policies is None:
+            policies = {p.name: p for p in self.read(self.bundled)}
+            directory = self.user_dir or policy_dir()
+            if directory.is_dir():
+                for path in sorted(directory.glob("*.json")):
+                    try:
+                        policies.update((p.name, p) for p in self.read(path))
+                    except (OSError, ValueError) as e:
+                        print(f"[PRINT_POLICY] skipped {path}: {e}")
+            self._policies = policies
+        return self._policies
+
+    def reload(self) -> None:
+        self._policies = None
+        policy_geometry.cache_clear()
+
+    def names(self) -> List[str]:
+        return list(self._load())
+
+    def get(self, name: Optional[str]) -> Optional[PrintPolicy]:
+        return self._load().get(name)
+
+    def __getitem__(self, name: str) -> PrintPolicy:
+        return self._load()[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._load()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def geometry(self, name: str, dpi: int) -> PolicyGeometry:
+        return policy_geometry(self[name], int(dpi))
+
+    def add(self, name: str, data: Dict[str, Any], save: bool = False) -> PrintPolicy:
+        """
+        Validate and register a custom policy (replacing one of the same name).
+        With `save`, it is also written to the user's CUSTOM_POLICIES file.
+        """
+        policy = PrintPolicy.from_dict(name, data)
+        if save:
+            directory = self.user_dir or policy_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / CUSTOM_POLICIES
+            saved = {}
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+            saved[name] = policy.to_dict()
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(saved, f, indent=2)
+            policy = PrintPolicy.from_dict(name, data, source=str(path))
+        self._load()[name] = policy
+        return policy
+
+
+class _LegacyPolicies(Mapping):
+    """Read-only name → dict view of a PolicyRegistry (the old PRINT_POLICIES shape)."""
+    def __init__(self, registry: PolicyRegistry):
+        self._registry = registry
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._registry[name].as_legacy_dict()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._registry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry)
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+
+POLICIES = PolicyRegistry()
+PRINT_POLICIES = _LegacyPolicies(POLICIES)
@@ -0,0 +1,100 @@
+# prototypyside/services/pagination/tiler.py
+"""
+Oversized boards split into overlapping page-sized tiles.
+
+A board W wide on pages whose printable area is A wide, with at least `overlap`
+shared between neighbours, needs n = ceil((W - overlap) / (A - overlap))
+columns. Tiles are spread evenly (step (W - A) / (n - 1)), so every tile is a
+full printable area and every seam overlaps by the same amount, at least the
+one asked for. Rows work the same way. Values are floats in points.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import ceil
+from typing import Iterator, List, Tuple
+
+
+@dataclass(frozen=True)
+class Tile:
+    index: int
+    row: int
+    column: int
+    x: float            # board region this tile prints
+    y: float
+    width: float
+    height: float
+
+    @property
+    def rect(self) -> Tuple[float, float, float, float]:
+        return (self.x, self.y, self.width, self.height)
+
+
+def _axis(board: float, area: float, overlap: float) -> Tuple[int, float, float]:
+    """(count, step, tile extent) along one axis."""
+    if board <= area:
+        return 1, 0.0, board
+    if overlap >= area:
+        raise ValueError(f"Tile overlap ({overlap}pt) must be smaller than the printable area ({area}pt)")
+    n = ceil((board - overlap) / (area - overlap))
+    return n, (board - area) / (n - 1), area
+
+
+@dataclass(frozen=True)
+class TilePlan:
+    board_width: float
+    board_height: float
+    columns: int
+    rows: int
+    step_x: float
+    step_y: float
+    tile_width: float
+    tile_height: float
+
+    @classmethod
+    def for_board(cls, board_width: float, board_height: float, area_width: float, area_height: float,
+                  overlap: float = 0.0) -> "TilePlan":
+        cols, sx, tw = _axis(board_width, area_width, overlap)
+        rows, sy, th = _axis(board_height, area_height, overlap)
+        return cls(board_width, board_height, cols, rows, sx, sy, tw, th)
+
+    @property
+    def count(self) -> int:
+        return self.rows * self.columns
+
+    @property
+    def overlap_x(self) -> float:
+        return self.tile_width - self.step_x if self.columns > 1 else 0.0
+
+    @property
+    def overlap_y(self) -> float:
+        return self.tile_height - self.step_y if self.rows > 1 else 0.0
+
+    def tile(self, index: int) -> Tile:
+        """Tiles run left to right, then top to bottom."""
+        r, c = divmod(index, self.columns)
+        return Tile(index, r, c, c * self.step_x, r * self.step_y, self.tile_width, self.tile_height)
+
+    def tiles(self) -> Iterator[Tile]:
+        for n in range(self.count):
+            yield self.tile(n)
+
+    def registration_points(self, tile: Tile) -> List[Tuple[float, float]]:
+        """
+        Board points for registration targets on `tile`: two in the middle of each
+        overlap band it shares with a neighbour. The neighbour prints the same
+        points, so overlaying the targets aligns the sheets.
+        """
+        points = []
+        ox, oy = self.overlap_x, self.overlap_y
+        ys = (tile.y + tile.height * 0.25, tile.y + tile.height * 0.75)
+        xs = (tile.x + tile.width * 0.25, tile.x + tile.width * 0.75)
+        if tile.column > 0:
+            points.extend((tile.x + ox / 2, y) for y in ys)
+        if tile.column < self.columns - 1:
+            points.extend((tile.x + tile.width - ox / 2, y) for y in ys)
+        if tile.row > 0:
+            points.extend((x, tile.y + oy / 2) for x in xs)
+        if tile.row < self.rows - 1:
+            points.extend((x, tile.y + tile.height - oy / 2) for x in xs)
+        return points
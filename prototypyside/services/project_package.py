@@ -0,0 +1,486 @@
+# prototypyside/services/project_package.py
+"""Single-file project container.
+
+A project package is a zip archive holding templates, their CSV sources,
+fonts and pre-scaled image assets, plus a manifest that indexes all of it:
+
+    manifest.json
+    templates/<pid>.json          (deflated; asset paths rewritten to "asset:<sha>")
+    assets/<sha><suffix>          (stored, so it can be served from the memory map)
+    scaled/<sha>_<w>x<h>@<dpi>.png
+
+Assets are addressed by the sha256 of their bytes. On open only the manifest is
+read; templates and assets are pulled out of the memory-mapped archive on demand,
+and assets are materialized once into a content-addressed cache directory, so
+moving a project between machines never re-resolves or re-scales anything.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import tempfile
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QStandardPaths
+from PySide6.QtGui import QFontDatabase, QImage
+
+from prototypyside.services.proto_class import ProtoClass
+from prototypyside.services.proto_paint import ProtoPaint, ImageScaleMode
+from prototypyside.utils.render_context import RenderContext, RenderMode, RenderRoute, TabMode
+from prototypyside.utils.units.unit_str_geometry import UnitStrGeometry
+from prototypyside.utils.valid_path import ValidPath
+
+pc = ProtoClass
+
+FORMAT_VERSION = 1
+PROJECT_SUFFIX = ".ptproj"
+ASSET_SCHEME = "asset:"
+MANIFEST = "manifest.json"
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")  # zip local file header (30 bytes)
+_FONT_EXTS = {".ttf", ".otf", ".ttc"}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def asset_cache_dir() -> Path:
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    root = Path(base) if base else Path(tempfile.gettempdir()) / "prototypyside"
+    path = root / "assets"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# ---------------------------
+# Fonts used by templates
+# ---------------------------
+BUNDLED_FONTS = Path(__file__).resolve().parents[1] / "resources" / "fonts"
+
+
+def _sfnt_families(fh, offset: int) -> Set[str]:
+    """Family names (name IDs 1 and 16) of the sfnt font starting at `offset`."""
+    fh.seek(offset)
+    num_tables = struct.unpack(">H", fh.read(12)[4:6])[0]
+    directory = fh.read(16 * num_tables)
+    for i in range(num_tables):
+        tag, _checksum, table_offset, length = struct.unpack(">4sLLL", directory[16 * i:16 * (i + 1)])
+        if tag == b"name":
+            break
+    else:
+        return set()
+    fh.seek(table_offset)
+    table = fh.read(length)
+    _fmt, count, strings = struct.unpack(">HHH", table[:6])
+    names = set()
+    for i in range(count):
+        platform, _enc, _lang, name_id, size, at = struct.unpack(">6H", table[6 + 12 * i:18 + 12 * i])
+        if name_id not in (1, 16):
+            continue
+        raw = table[strings + at:strings + at + size]
+        if platform in (0, 3):
+            names.add(raw.decode("utf-16-be", "ignore"))
+        elif platform == 1:
+            names.add(raw.decode("mac_roman", "ignore"))
+    return names
+
+
+def font_families(path: Union[str, Path]) -> Set[str]:
+    """Family names declared by a TTF/OTF file, or every face of a TTC collection."""
+    with open(path, "rb") as fh:
+        head = fh.read(12)
+        if head[:4] == b"ttcf":
+            n = struct.unpack(">L", head[8:12])[0]
+            offsets = struct.unpack(f">{n}L", fh.read(4 * n))
+        else:
+            offsets = (0,)
+        names: Set[str] = set()
+        for offset in offsets:
+            names |= _sfnt_families(fh, offset)
+    return names
+
+
+@lru_cache(maxsize=1)
+def _font_index() -> Dict[str, List[Path]]:
+    """Lower-cased family → font files, over the bundled and system font directories."""
+    dirs = [BUNDLED_FONTS] + [Path(d) for d in QStandardPaths.standardLocations(QStandardPaths.FontsLocation)]
+    index: Dict[str, List[Path]] = {}
+    seen = set()
+    for d in dirs:
+        if not d.is_dir():
+            continue
+        for f in d.rglob("*"):
+            if f.suffix.lower() not in _FONT_EXTS or f in seen:
+                continue
+            seen.add(f)
+            try:
+                families = font_families(f)
+            except (OSError, struct.error):
+                continue
+            for family in families:
+                index.setdefault(family.strip().lower(), []).append(f)
+    return index
+
+
+def template_font_families(templates: Iterable) -> Set[str]:
+    """Font families (and fallbacks) named by any element of `templates`."""
+    families: Set[str] = set()
+
+    def walk(node):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            font = node.get("font")
+            if isinstance(font, dict) and font.get("family"):
+                families.add(str(font["family"]))
+                families.update(str(f) for f in font.get("fallbacks") or ())
+            for child in node.values():
+                if isinstance(child, (list, dict)):
+                    walk(child)
+
+    for template in templates:
+        walk(template.registry.to_dict(template))
+    return families
+
+
+def font_files(families: Iterable[str]) -> List[Path]:
+    """Font files (every style) for `families`; families with no file found are skipped."""
+    index = _font_index()
+    out: List[Path] = []
+    for family in sorted(set(families)):
+        for f in index.get(family.strip().lower(), ()):
+            if f not in out:
+                out.append(f)
+    return out
+
+
+def _export_ctx(dpi: int) -> RenderContext:
+    # Matches the context ExportManager renders with, so seeded cache keys line up.
+    return RenderContext(
+        route=RenderRoute.COMPOSITE,
+        tab_mode=TabMode.LAYOUT,
+        mode=RenderMode.EXPORT,
+        dpi=dpi,
+        unit="pt",
+    )
+
+
+class ProjectPackageWriter:
+    """Collects templates and their assets, then writes one package file."""
+
+    def __init__(self, scaled_dpi: Optional[int] = 300):
+        self._scaled_dpi = scaled_dpi
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._assets: Dict[str, Dict[str, Any]] = {}
+        self._asset_bytes: Dict[str, bytes] = {}
+        self._scaled: Dict[str, Dict[str, Any]] = {}
+        self._scaled_bytes: Dict[str, bytes] = {}
+        self._by_path: Dict[str, str] = {}
+        self._scratch: Optional[tempfile.TemporaryDirectory] = None   # source files for pre-scaling
+
+    # ---------------------------
+    # Collection
+    # ---------------------------
+    def add_asset(self, path: Union[str, Path], kind: str) -> Optional[str]:
+        p = ValidPath.file(path, must_exist=True, normalize=True)
+        if not p:
+            return None
+        known = self._by_path.get(str(p))
+        if known:
+            return known
+        data = p.read_bytes()
+        sha = _sha256(data)
+        self._by_path[str(p)] = sha
+        if sha not in self._assets:
+            self._assets[sha] = {
+                "entry": f"assets/{sha}{p.suffix.lower()}",
+                "name": p.name,
+                "kind": kind,
+                "size": len(data),
+            }
+            self._asset_bytes[sha] = data
+        return sha
+
+    def add_font(self, path: Union[str, Path]) -> Optional[str]:
+        p = ValidPath.file(path, must_exist=True, ext=sorted(_FONT_EXTS))
+        return self.add_asset(p, "font") if p else None
+
+    def add_template(self, template, registry=None) -> str:
+        registry = registry or template.registry
+        data = registry.to_dict(template)
+        refs: List[str] = []
+        self._embed(data, refs)
+        pid = data.get("pid")
+        self._templates[pid] = {
+            "entry": f"templates/{pid}.json",
+            "name": str(data.get("name")),
+            "proto": pc.get_prefix(pid),
+            "assets": sorted(set(refs)),
+            "data": data,
+        }
+        return pid
+
+    def _embed(self, node: Any, refs: List[str]) -> None:
+        """Rewrite file references in a serialized tree to content-hash references."""
+        if isinstance(node, list):
+            for child in node:
+                self._embed(child, refs)
+            return
+        if not isinstance(node, dict):
+            return
+
+        # The template's own location is machine specific; it is not carried along.
+        if "file_path" in node:
+            node["file_path"] = None
+
+        csv_path = node.get("csv_path")
+        if csv_path and csv_path != "None":
+            sha = self.add_asset(csv_path, "csv")
+            node["csv_path"] = f"{ASSET_SCHEME}{sha}" if sha else None
+            if sha:
+                refs.append(sha)
+
+        if pc.from_prefix(node.get("pid")) == pc.IE and isinstance(node.get("content"), str):
+            source = node["content"]
+            sha = self.add_asset(source, "image") if source else None
+            if sha:
+                node["content"] = f"{ASSET_SCHEME}{sha}"
+                refs.append(sha)
+                self._prescale(sha, node)
+
+        for key in ("items", "content"):
+            child = node.get(key)
+            if isinstance(child, (list, dict)):
+                self._embed(child, refs)
+
+    def _prescale(self, sha: str, element: Dict[str, Any]) -> None:
+        if not self._scaled_dpi or not element.get("geometry"):
+            return
+        ctx = _export_ctx(self._scaled_dpi)
+        geom = UnitStrGeometry.from_dict(element["geometry"])
+        w_px, h_px = ProtoPaint._target_size_px(geom, ctx)
+        key = f"{sha}_{w_px}x{h_px}@{self._scaled_dpi}"
+        if key in self._scaled:
+            return
+        aspect, xform = "fit", "smooth"
+        if self._scratch is None:
+            self._scratch = tempfile.TemporaryDirectory(prefix="ptproj-")
+        source = Path(self._scratch.name) / f"{sha}{Path(self._assets[sha]['name']).suffix}"
+        if not source.exists():
+            source.write_bytes(self._asset_bytes[sha])
+        img = ProtoPaint.image_with_mode(source, geom, ctx, aspect, xform, cache=None)
+        if img is None:
+            return
+        if not isinstance(img, QImage):
+            img = img.toImage()
+        buf = QByteArray()
+        dev = QBuffer(buf)
+        dev.open(QIODevice.WriteOnly)
+        img.save(dev, "PNG")
+        dev.close()
+        self._scaled[key] = {
+            "entry": f"scaled/{key}.png",
+            "source": sha,
+            "width": w_px,
+            "height": h_px,
+            "aspect": aspect,
+            "transform": xform,
+            "ctx": ctx.to_dict(),
+        }
+        self._scaled_bytes[key] = bytes(buf.data())
+
+    # ---------------------------
+    # Output
+    # ---------------------------
+    def write(self, path: Union[str, Path]) -> Path:
+        out = Path(path)
+        if out.suffix.lower() != PROJECT_SUFFIX:
+            out = out.with_suffix(PROJECT_SUFFIX)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "templates": {pid: {k: v for k, v in t.items() if k != "data"}
+                          for pid, t in self._templates.items()},
+            "assets": self._assets,
+            "scaled": self._scaled,
+        }
+        tmp = out.with_suffix(out.suffix + ".part")
+        with zipfile.ZipFile(tmp, "w") as zf:
+            zf.writestr(MANIFEST, json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+            for t in self._templates.values():
+                zf.writestr(t["entry"], json.dumps(t["data"]), compress_type=zipfile.ZIP_DEFLATED)
+            # Assets are stored uncompressed so readers can slice them from the mmap.
+            for sha, meta in self._assets.items():
+                zf.writestr(meta["entry"], self._asset_bytes[sha], compress_type=zipfile.ZIP_STORED)
+            for key, meta in self._scaled.items():
+                zf.writestr(meta["entry"], self._scaled_bytes[key], compress_type=zipfile.ZIP_STORED)
+        tmp.replace(out)
+        return out
+
+    def close(self) -> None:
+        if self._scratch is not None:
+            self._scratch.cleanup()
+            self._scratch = None
+
+
+class ProjectPackage:
+    """Read side of a project package: manifest first, everything else on demand."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = ValidPath.file(path, must_exist=True, normalize=True)
+        if not self.path:
+            raise FileNotFoundError(str(path))
+        self._fh = self.path.open("rb")
+        self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._zip = zipfile.ZipFile(self._fh)
+        self.manifest: Dict[str, Any] = json.loads(self._zip.read(MANIFEST))
+        if self.manifest.get("format", 0) > FORMAT_VERSION:
+            raise ValueError(f"Unsupported project format {self.manifest.get('format')}")
+        self._cache_dir = asset_cache_dir()
+
+    @classmethod
+    def write(cls, path, templates: Iterable, fonts: Iterable = (), scaled_dpi: Optional[int] = 300) -> Path:
+        writer = ProjectPackageWriter(scaled_dpi=scaled_dpi)
+        try:
+            for font in fonts:
+                writer.add_font(font)
+            for template in templates:
+                writer.add_template(template)
+            return writer.write(path)
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        self._zip.close()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # a caller still holds an asset view; the map goes with it
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------------------
+    # Index
+    # ---------------------------
+    @property
+    def templates(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest.get("templates", {})
+
+    @property
+    def assets(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest.get("assets", {})
+
+    def template_pids(self, proto: Optional[ProtoClass] = None) -> List[str]:
+        return [pid for pid, meta in self.templates.items()
+                if proto is None or meta.get("proto") == proto.prefix]
+
+    # ---------------------------
+    # Raw access
+    # ---------------------------
+    def _entry_view(self, name: str) -> memoryview:
+        info = self._zip.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return memoryview(self._zip.read(name))
+        header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        name_len, extra_len = header[-2], header[-1]
+        start = info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+        return memoryview(self._map)[start:start + info.file_size]
+
+    def asset_bytes(self, sha: str) -> memoryview:
+        meta = self.assets.get(sha)
+        if not meta:
+            raise KeyError(f"Asset {sha} is not in {self.path.name}")
+        return self._entry_view(meta["entry"])
+
+    def asset_path(self, sha: str) -> Path:
+        """Materialize an asset once into the content-addressed cache and return its path."""
+        meta = self.assets.get(sha)
+        if not meta:
+            raise KeyError(f"Asset {sha} is not in {self.path.name}")
+        target = self._cache_dir / Path(meta["entry"]).name
+        if not target.exists() or target.stat().st_size != meta.get("size"):
+            part = target.with_suffix(target.suffix + ".part")
+            part.write_bytes(self.asset_bytes(sha))
+            part.replace(target)
+        return target
+
+    # ---------------------------
+    # Templates
+    # ---------------------------
+    def template_data(self, pid: str) -> Dict[str, Any]:
+        meta = self.templates.get(pid)
+        if not meta:
+            raise KeyError(f"Template {pid} is not in {self.path.name}")
+        data = json.loads(bytes(self._entry_view(meta["entry"])))
+        self._resolve(data)
+        return data
+
+    def _resolve(self, node: Any) -> None:
+        if isinstance(node, list):
+            for child in node:
+                self._resolve(child)
+            return
+        if not isinstance(node, dict):
+            return
+        for key in ("csv_path", "content"):
+            val = node.get(key)
+            if isinstance(val, str) and val.startswith(ASSET_SCHEME):
+                node[key] = str(self.asset_path(val[len(ASSET_SCHEME):]))
+        for key in ("items", "content"):
+            child = node.get(key)
+            if isinstance(child, (list, dict)):
+                self._resolve(child)
+
+    def csv_paths(self, pid: str) -> List[Path]:
+        meta = self.templates.get(pid, {})
+        return [self.asset_path(sha) for sha in meta.get("assets", [])
+                if self.assets.get(sha, {}).get("kind") == "csv"]
+
+    # ---------------------------
+    # Fonts & render cache
+    # ---------------------------
+    def register_fonts(self) -> List[int]:
+        ids = []
+        for sha, meta in self.assets.items():
+            if meta.get("kind") != "font":
+                continue
+            font_id = QFontDatabase.addApplicationFontFromData(QByteArray(bytes(self.asset_bytes(sha))))
+            if font_id >= 0:
+                ids.append(font_id)
+        return ids
+
+    def seed_render_cache(self, cache, ctx: RenderContext) -> int:
+        """
+        Insert the pre-scaled rasters that were produced for `ctx` into `cache`.
+        Returns the number of entries seeded.
+        """
+        seeded = 0
+        want = ctx.to_dict()
+        for key, meta in self.manifest.get("scaled", {}).items():
+            if meta.get("ctx") != want:
+                continue
+            img = QImage.fromData(bytes(self._entry_view(meta["entry"])), "PNG")
+            if img.isNull():
+                continue
+            aspect, xform = ImageScaleMode.resolve(meta.get("aspect", "fit"), meta.get("transform"))
+            cache_key = cache.image_key(
+                source=self.asset_path(meta["source"]),
+                target_size=(meta["width"], meta["height"]),
+                aspect_mode=aspect,
+                transform_mode=xform,
+                ctx=ctx,
+            )
+            cache.image(cache_key, lambda img=img: img)
+            seeded += 1
+        return seeded
@@ -601,13 +601,19 @@ class ProtoPaint:
                         "Drop Image\nor Double Click to Set")
         painter.restore()
 
-    def render_page(page, ctx, painter):
+    def render_page(page, ctx, painter, skip=(), angles=None):
         # Assumes: ItemHasNoContents=True on all items (so Qt doesn't auto-paint),
         #          normalize_positions(..., unit="pt") already run,
         #          and your item renderers draw in local (0,0,w,h) without translating.
+        # `skip`: slot indices left blank (e.g. query padding on a reused page).
+        # `angles`: per-slot rotation (deg) about the slot centre, e.g. from a Page descriptor.
 
         # Draw slots in Z order (optional but usually desired)
-        for slot in sorted(page.items, key=lambda s: s.zValue()):
+        order = sorted(range(len(page.items)), key=lambda n: page.items[n].zValue())
+        for n in order:
+            if n in skip:
+                continue
+            slot = page.items[n]
             comp = slot.content
             if comp is None:
                 continue
@@ -616,22 +622,30 @@ class ProtoPaint:
             slot_pos = slot.pos()  # already in pt if you normalized positions for export
             painter.translate(slot_pos.x(), slot_pos.y())
 
-            # If you support per-slot rotation/scaling, do it here:
-            # if getattr(slot, "rotation", 0):
-            #     painter.rotate(slot.rotation)
+            angle = angles[n] if angles and n < len(angles) else 0.0
+            if angle:
+                size = slot.geometry.to(ctx.unit, dpi=ctx.dpi).size
+                painter.translate(size.width() / 2, size.height() / 2)
+                painter.rotate(angle)
+                painter.translate(-size.width() / 2, -size.height() / 2)
 
             print(f"Painting component at page pos: ({slot_pos.x():.2f}, {slot_pos.y():.2f})")
-            comp.render(ctx, painter)  # component draws at its own local origin (0,0)
+            ProtoPaint.render_component(comp, ctx, painter)
+
+            painter.restore()
 
-            # Elements relative to component origin
-            for item in sorted(comp.items, key=lambda i: i.zValue()):
-                painter.save()
-                ipos = item.pos()  # also in pt if normalized
-                painter.translate(ipos.x(), ipos.y())
-                print(f"  Painting element at page pos: ({slot_pos.x()+ipos.x():.2f}, {slot_pos.y()+ipos.y():.2f})")
-                item.render(ctx, painter)
-                painter.restore()
+    def render_component(comp, ctx, painter, elements=None):
+        # The component at the painter's origin, then its elements relative to it.
+        # `elements`: a subset to paint, already in z order (e.g. one tile's).
+        comp.render(ctx, painter)  # component draws at its own local origin (0,0)
 
+        if elements is None:
+            elements = sorted(comp.items, key=lambda i: i.zValue())
+        for item in elements:
+            painter.save()
+            ipos = item.pos()  # also in pt if normalized
+            painter.translate(ipos.x(), ipos.y())
+            item.render(ctx, painter)
             painter.restore()
 
     @classmethod
@@ -10,6 +10,7 @@ from PySide6.QtCore import QObject, Signal
 from prototypyside.utils.valid_path import ValidPath
 from prototypyside.services.proto_factory import ProtoFactory
 from prototypyside.services.proto_class import ProtoClass
+from prototypyside.services.orphan_store import OrphanStore
 
 if TYPE_CHECKING:
     from prototypyside.services.app_settings import AppSettings
@@ -41,7 +42,7 @@ class ProtoRegistry(QObject):
         self.root = self if self._is_root else root
         self._template = None
         self._store: Dict[str, Any] = {}
-        self._orphans: Dict[str, Any] = {}
+        self._orphans = OrphanStore()
         # self._unique_names = set()
         self._name_map = {v:1 for v in BASE_NAMES.values()}
 
@@ -109,7 +110,14 @@ class ProtoRegistry(QObject):
         raise RuntimeError("No RootRegistry found in parent chain.")
 
     def orphans(self):
-        return [o for o in self._orphans]
+        return self._orphans.keys()
+
+    def collect(self, force: bool = False) -> int:
+        """
+        Release orphans no longer referenced by the undo stack.
+        Returns the number of cached-image bytes freed.
+        """
+        return self._orphans.collect(force=force)
 
     def find(self, pid):
         return pid in self._store.get("pid", self.global_get("pid"))
@@ -217,7 +225,7 @@ class ProtoRegistry(QObject):
         if not obj:
             print(f"Warning: cannot deregister missing PID '{pid}'")
             return
-        self._orphans[pid] = obj
+        self._orphans.add(pid, obj)
         self.object_deregistered.emit(obj.pid)
 
     def to_dict(self, obj) -> object:
@@ -253,7 +261,10 @@ class ProtoRegistry(QObject):
         # 4) Rehydrate 'content' if present (e.g., LayoutSlot.content)
         #    Support both embedded object dict and pid reference (if you ever add that).
         content_data = data.get("content", None)
-        if content_data is not None and hasattr(obj, "content"):
+        if isinstance(content_data, dict) and hasattr(obj, "set_pending_content"):
+            # Slots keep their component dict and hydrate it on first use.
+            obj.set_pending_content(content_data)
+        elif content_data is not None and hasattr(obj, "content"):
             if isinstance(content_data, dict):
                 content_obj = self.from_dict(content_data)
             else:
@@ -388,7 +399,7 @@ class RootRegistry(ProtoRegistry):
         new = ProtoRegistry(root=self, settings=self.settings)
         template = new.from_dict(data)
         new._template = template
-        self.add_child(new)
+        self.add_child(new, template)
         self.register(template)
         return new, template
 
@@ -407,12 +418,17 @@ class RootRegistry(ProtoRegistry):
                 child.deregister(key)
 
             # Clean up orphans safely
-            for key in list(child._orphans.keys()):
-                del child._orphans[key]
+            child._orphans.clear()
 
             child.root = None
             self._children.remove(child)
 
+    def collect(self, force: bool = False) -> int:
+        freed = super().collect(force=force)
+        for child in self._children:
+            freed += child.collect(force=force)
+        return freed
+
     def has(self, pid):
         if pid in self._store:
             return True
@@ -102,6 +102,9 @@ class RenderCache:
     # ------------------------------------------------------------------
     # cache accessors
     # ------------------------------------------------------------------
+    def has_image(self, key: Tuple) -> bool:
+        return key in self._image_cache
+
     def image(self, key: Tuple, factory: Callable[[], Optional[ImageType]]) -> Optional[ImageType]:
         cached = self._image_cache.get(key)
         if cached is not None:
@@ -0,0 +1,90 @@
+# prototypyside/services/template_saver.py
+"""
+Off-thread template saving.
+
+The GUI thread only takes a TemplateSnapshot (the registry's to_dict() payload,
+which is plain data). Encoding, optional gzip compression and the atomic
+QSaveFile commit run on a QThreadPool worker, reporting through SaveSignals.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Union
+
+from PySide6.QtCore import QObject, QRunnable, QSaveFile, QIODevice, Signal
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    pid: str
+    name: str
+    path: Path
+    data: Dict[str, Any] = field(repr=False)
+    compress: bool = False
+
+    @classmethod
+    def take(cls, template, registry, path: Union[str, Path], compress: bool = None) -> "TemplateSnapshot":
+        p = Path(path)
+        if compress is None:
+            compress = p.suffix.lower() == ".gz"
+        return cls(
+            pid=template.pid,
+            name=str(template.name),
+            path=p,
+            data=registry.to_dict(template),
+            compress=compress,
+        )
+
+    def encode(self) -> bytes:
+        payload = json.dumps(self.data, indent=None if self.compress else 2).encode("utf-8")
+        return gzip.compress(payload, compresslevel=6) if self.compress else payload
+
+
+class SaveSignals(QObject):
+    progress = Signal(str, int)     # path, percent
+    finished = Signal(str, str)     # pid, path
+    failed = Signal(str, str)       # path, message
+
+
+class SaveTask(QRunnable):
+    def __init__(self, snapshot: TemplateSnapshot):
+        super().__init__()
+        self.snapshot = snapshot
+        self.signals = SaveSignals()
+
+    def run(self):
+        snap = self.snapshot
+        path = str(snap.path)
+        try:
+            self.signals.progress.emit(path, 5)
+            payload = snap.encode()
+            self.signals.progress.emit(path, 60)
+
+            saver = QSaveFile(path)
+            mode = QIODevice.WriteOnly if snap.compress else QIODevice.WriteOnly | QIODevice.Text
+            if not saver.open(mode):
+                raise IOError(f"Cannot open {path} for writing")
+            if saver.write(payload) != len(payload):
+                saver.cancelWriting()
+                raise IOError(f"Short write to {path}")
+            self.signals.progress.emit(path, 90)
+            if not saver.commit():
+                raise IOError(f"Could not commit save to {path}")
+        except (IOError, OSError, TypeError, ValueError) as e:
+            self.signals.failed.emit(path, str(e))
+            return
+        self.signals.progress.emit(path, 100)
+        self.signals.finished.emit(snap.pid, path)
+
+
+def read_template_data(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a template file, transparently handling gzip-compressed saves."""
+    raw = Path(path).read_bytes()
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    return json.loads(raw.decode("utf-8"))
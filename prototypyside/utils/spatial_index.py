@@ -0,0 +1,104 @@
+# prototypyside/utils/spatial_index.py
+"""
+Uniform-grid spatial index over axis-aligned rectangles.
+
+Rectangles are bucketed into square cells of `cell` units; a query visits only
+the cells its rectangle covers and returns keys in insertion order, so callers
+that insert in paint order get paint order back. Plain floats, any unit.
+"""
+from __future__ import annotations
+
+from math import floor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]   # x, y, width, height
+
+
+class SpatialIndex:
+    def __init__(self, cell: float):
+        if cell <= 0:
+            raise ValueError(f"SpatialIndex cell size must be positive, got {cell!r}")
+        self.cell = float(cell)
+        self._cells: Dict[Tuple[int, int], List[Hashable]] = {}
+        self._rects: Dict[Hashable, Rect] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._serial = 0
+
+    @classmethod
+    def build(cls, rects: Iterable[Tuple[Hashable, Rect]], cell: Optional[float] = None) -> "SpatialIndex":
+        """Index `(key, rect)` pairs; `cell` defaults to the mean rect size."""
+        rects = list(rects)
+        if cell is None:
+            sizes = [max(r[2], r[3]) for _k, r in rects if max(r[2], r[3]) > 0]
+            cell = sum(sizes) / len(sizes) if sizes else 1.0
+        index = cls(cell)
+        for key, rect in rects:
+            index.insert(key, rect)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rects
+
+    def _span(self, rect: Rect):
+        x, y, w, h = rect
+        c = self.cell
+        for i in range(floor(x / c), floor((x + max(w, 0.0)) / c) + 1):
+            for j in range(floor(y / c), floor((y + max(h, 0.0)) / c) + 1):
+                yield i, j
+
+    def insert(self, key: Hashable, rect: Rect) -> None:
+        if key in self._rects:
+            self.remove(key)
+        self._rects[key] = tuple(rect)
+        self._order[key] = self._serial
+        self._serial += 1
+        for cell in self._span(rect):
+            self._cells.setdefault(cell, []).append(key)
+
+    def remove(self, key: Hashable) -> None:
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        del self._order[key]
+        for cell in self._span(rect):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.remove(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def move(self, key: Hashable, rect: Rect) -> None:
+        """Re-bucket `key`, keeping its place in insertion order."""
+        order = self._order.get(key)
+        self.insert(key, rect)
+        if order is not None:
+            self._order[key] = order
+
+    def rect(self, key: Hashable) -> Optional[Rect]:
+        return self._rects.get(key)
+
+    def query(self, rect: Rect) -> List[Any]:
+        """Keys whose rects intersect `rect` (touching edges do not count)."""
+        x, y, w, h = rect
+        found = set()
+        for cell in self._span(rect):
+            for key in self._cells.get(cell, ()):
+                if key in found:
+                    continue
+                kx, ky, kw, kh = self._rects[key]
+                if kx < x + w and x < kx + kw and ky < y + h and y < ky + kh:
+                    found.add(key)
+        return sorted(found, key=self._order.__getitem__)
+
+    def at(self, x: float, y: float) -> List[Any]:
+        """Keys whose rects contain the point, in insertion order."""
+        c = self.cell
+        out = []
+        for key in self._cells.get((floor(x / c), floor(y / c)), ()):
+            kx, ky, kw, kh = self._rects[key]
+            if kx <= x < kx + kw and ky <= y < ky + kh:
+                out.append(key)
+        return sorted(out, key=self._order.__getitem__)
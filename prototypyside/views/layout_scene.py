@@ -36,6 +36,7 @@ class LayoutScene(QGraphicsScene):
         self._dpi = self.settings.dpi
         self.unit = self.settings.unit
         self.template  = template  
+        self._drop_slot = None      # slot highlighted under a component drag
         self.inc_grid = IncrementalGrid(self.settings, template=self.template,
                              snap_enabled=True, enforce_enabled=True,
                              default_snap_level=4)
@@ -83,13 +84,29 @@ class LayoutScene(QGraphicsScene):
         else:
             super().dragEnterEvent(event)
 
+    def _set_drop_slot(self, slot):
+        # Only the previous and new slots repaint, whatever the slot count.
+        if slot is self._drop_slot:
+            return
+        if self._drop_slot is not None:
+            self._drop_slot.drop_target = False
+        self._drop_slot = slot
+        if slot is not None:
+            slot.drop_target = True
+
     def dragMoveEvent(self, event: QGraphicsSceneDragDropEvent):
         if event.mimeData().hasFormat("application/x-component-pid"):
+            self._set_drop_slot(self.template.get_item_at_position(event.scenePos()))
             event.acceptProposedAction()
         else:
             super().dragMoveEvent(event)
 
+    def dragLeaveEvent(self, event: QGraphicsSceneDragDropEvent):
+        self._set_drop_slot(None)
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event: QGraphicsSceneDragDropEvent):
+        self._set_drop_slot(None)
         if event.mimeData().hasFormat("application/x-component-pid"):
             pid = event.mimeData().data("application/x-component-pid").data().decode("utf-8")
             scene_pos = event.scenePos()
@@ -7,8 +7,9 @@ from typing import Optional, List, Dict, Any
 import gc
 from PySide6.QtWidgets import (QMainWindow, QDockWidget, QTabWidget, QWidget, QStackedWidget,
                                QVBoxLayout, QLabel, QFileDialog, QMessageBox,
-                               QToolBar, QPushButton, QHBoxLayout, QSizePolicy, QCheckBox, QTabBar) # Added QPushButton, QHBoxLayout for temporary property panel layout
-from PySide6.QtCore import Qt, Signal, Slot, QTimer, QStandardPaths, QSaveFile, QIODevice
+                               QToolBar, QPushButton, QHBoxLayout, QSizePolicy, QCheckBox, QTabBar,
+                               QInputDialog) # Added QPushButton, QHBoxLayout for temporary property panel layout
+from PySide6.QtCore import Qt, Signal, Slot, QTimer, QStandardPaths, QSaveFile, QIODevice, QThreadPool
 from PySide6.QtGui import QIcon, QAction, QKeySequence, QShortcut, QUndoStack, QUndoGroup, QUndoCommand, QPainter
 
 
@@ -21,8 +22,16 @@ from prototypyside.utils.render_context import RenderContext, RenderMode, Render
 
  
 from prototypyside.services.merge_manager import MergeManager
+from prototypyside.services.merge_sources import SOURCE_FILTER
 from prototypyside.views.panels.import_panel import ImportPanel
 from prototypyside.services.export_manager import ExportManager
+from prototypyside.services.pagination.page_planner import parse_page_range
+from prototypyside.services.pagination.imposition import ImpositionJob
+from prototypyside.services.project_package import (
+    ProjectPackage, PROJECT_SUFFIX, font_files, template_font_families
+)
+from prototypyside.services.autosave_journal import AutosaveJournal, JournalWriter
+from prototypyside.services.template_saver import TemplateSnapshot, SaveTask, read_template_data
 
 from prototypyside.utils.qt_helpers import find_unit_str_like_fields
 from prototypyside.services.proto_class import ProtoClass
@@ -54,21 +63,35 @@ class MainDesignerWindow(QMainWindow):
         self.setMinimumSize(800, 600)
         self.tab_widget: Optional[QTabWidget] = None
         self.merge_manager = MergeManager()
+        self.project_package: Optional[ProjectPackage] = None
+        # One writer at a time so repeated saves of a path land in order.
+        self.save_pool = QThreadPool(self)
+        self.save_pool.setMaxThreadCount(1)
+        self._pending_saves = set()
 
         self._is_headless = is_headless
 
-        # Autosave every 5 minutes (300 000 ms):
-        # self._autosave_timer = QTimer(self)
-        # self._autosave_timer.setInterval(5 * 60 * 1000)
-        # self._autosave_timer.timeout.connect(self._auto_save_current_tab)
-        # self._autosave_timer.start()
+        # Undo steps are journaled as they happen; every 5 minutes dirty journals
+        # are compacted to a full snapshot.
+        self.autosave_writer: Optional[JournalWriter] = None
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setInterval(5 * 60 * 1000)
+        self._autosave_timer.timeout.connect(self._compact_autosaves)
+        if not is_headless:
+            self.autosave_writer = JournalWriter()
+            recoverable = self.autosave_writer.recoverable()
+            self._autosave_timer.start()
+        else:
+            recoverable = []
 
         self.setup_ui()
         self.setup_status_bar()
         self.setup_actions_and_menus()
 
         self.on_unit_changed(self.settings.unit)
-        if not init_tabs:
+        if recoverable:
+            self.recover_autosaves(recoverable)
+        if not init_tabs and not (self.tab_widget and self.tab_widget.count()):
             # Initialize with new tabs
             self.add_new_tab(ProtoClass.LT)
             self.add_new_tab(ProtoClass.CT)
@@ -217,10 +240,18 @@ class MainDesignerWindow(QMainWindow):
         save_as_act.setShortcut(QKeySequence.SaveAs)
         save_as_act.triggered.connect(self.save_as_template)
 
+        file_menu.addSeparator()
+
+        open_project_act = file_menu.addAction("Open &Project…")
+        open_project_act.triggered.connect(self.open_project)
+
+        save_project_act = file_menu.addAction("Save P&roject…")
+        save_project_act.triggered.connect(self.save_project)
+
 
         import_menu = self.menuBar().addMenu("&Import")
 
-        self.import_data_action = file_menu.addAction("Import &Data (CSV)")
+        self.import_data_action = file_menu.addAction("Import &Data…")
         self.import_data_action.triggered.connect(self.import_csv_to_merge_manager)
 
         self.export_png_action = file_menu.addAction("&Export Current Tab as PNG...")
@@ -229,6 +260,9 @@ class MainDesignerWindow(QMainWindow):
         self.export_pdf_action = file_menu.addAction("&Export Current Tab as PDF...")
         self.export_pdf_action.triggered.connect(self.export_to_pdf)
 
+        self.export_run_action = file_menu.addAction("Export Print &Run as PDF...")
+        self.export_run_action.triggered.connect(self.export_print_run)
+
         file_menu.addSeparator()
 
         exit_action = file_menu.addAction("E&xit")
@@ -374,7 +408,7 @@ class MainDesignerWindow(QMainWindow):
         if self.is_headless:
             raise RuntimeError("Dialog not available in headless mode.")
         path_str, _ = QFileDialog.getOpenFileName(
-            self, "Open Template…", "", "JSON Files (*.json)"
+            self, "Open Template…", "", "Templates (*.json *.json.gz)"
         )
         return Path(path_str)
 
@@ -399,7 +433,7 @@ class MainDesignerWindow(QMainWindow):
         if not path.exists():
             raise FileNotFoundError(str(path))
 
-        data = json.load(path.open(mode='r', encoding='utf-8'))
+        data = read_template_data(path)
         registry, obj = self.registry.load_with_template(data)
 
         csvp = hasattr(obj, "csv_path") and getattr(obj, "csv_path", None)
@@ -457,6 +491,10 @@ class MainDesignerWindow(QMainWindow):
             self.right_stack.addWidget(new_tab.right_dock)
 
         self.undo_group.addStack(new_tab.undo_stack)
+        # One orphan generation per undo step; older orphans survive only via the stack.
+        new_tab.undo_stack.indexChanged.connect(lambda _idx, reg=registry: reg.collect())
+        if self.autosave_writer is not None:
+            new_tab.autosave = AutosaveJournal(self.autosave_writer, template, new_tab.undo_stack, parent=new_tab)
         new_tab.status_message_signal.connect(self.show_status_message)
 
         index = self.tab_widget.addTab(new_tab, template.name)
@@ -487,8 +525,13 @@ class MainDesignerWindow(QMainWindow):
             scene = tab_to_close.scene
             if template in scene.items():  # or however your scene stores items
                 scene.removeItem(template)
+            journal = getattr(tab_to_close, "autosave", None)
+            if journal is not None:
+                journal.detach()
+                journal.discard()
             tab_to_close.undo_stack.clear()
             tab_to_close.deleteLater()
+            registry.collect(force=True)
             gc.collect()      
             self.registry.remove_child(registry)
 
@@ -518,7 +561,6 @@ class MainDesignerWindow(QMainWindow):
             return
 
         self.write_template_to_path(tab.template, tab.registry, path)
-        self.show_status_message(f"Saved to {path}", "success")
 
         idx = self.tab_widget.indexOf(tab)
         self.tab_widget.setTabText(idx, Path(path).stem)
@@ -532,7 +574,9 @@ class MainDesignerWindow(QMainWindow):
         template = tab.template
         old_name = template.name
 
-        path_str, _ = QFileDialog.getSaveFileName(self, "Save Template As", "", "JSON Files (*.json)")
+        path_str, _ = QFileDialog.getSaveFileName(
+            self, "Save Template As", "", "JSON Files (*.json);;Compressed JSON (*.json.gz)"
+        )
         if not path_str:
             self.show_status_message("Save cancelled", "info")
             return
@@ -540,23 +584,145 @@ class MainDesignerWindow(QMainWindow):
         self.write_template_to_path(template, tab.registry, path_str)
         template.file_path = Path(path_str)  # store as Path
 
-        self.show_status_message(f"Saved to {path_str}", "success")
         idx = self.tab_widget.indexOf(tab)
         new_name = Path(path_str).stem
         tab.on_property_changed(template, "name", new_name, old_name)
         self.tab_widget.setTabText(idx, new_name)
 
-    def write_template_to_path(self, template, registry, path):
-        p = Path(path)  # accept str|Path
-        data = registry.to_dict(template)
+    def write_template_to_path(self, template, registry, path, compress: bool = None):
+        # Only the snapshot is taken here; encoding and the commit run on save_pool.
+        snapshot = TemplateSnapshot.take(template, registry, path, compress=compress)
+        task = SaveTask(snapshot)
+        tab = self._tab_for_pid(template.pid)
+        journal = getattr(tab, "autosave", None)
+        # The autosave journal is only dropped once the file is committed, and
+        # only if nothing was edited while the save ran.
+        task.journal_seq = journal.seq if journal is not None else None
+        if self.is_headless:
+            errors = []
+            task.signals.failed.connect(lambda p, msg: errors.append(msg))
+            task.run()
+            if errors:
+                raise IOError(errors[0])
+            if tab is not None:
+                self._discard_autosave(tab)
+            return
+
+        task.setAutoDelete(False)
+        self._pending_saves.add(task)
+        task.signals.progress.connect(self.on_save_progress)
+        task.signals.finished.connect(lambda pid, p, t=task: self.on_save_finished(t, pid, p))
+        task.signals.failed.connect(lambda p, msg, t=task: self.on_save_failed(t, p, msg))
+        self.save_pool.start(task)
+
+    @Slot(str, int)
+    def on_save_progress(self, path: str, percent: int):
+        self.show_status_message(f"Saving {Path(path).name}… {percent}%", "info")
+
+    def on_save_finished(self, task, pid: str, path: str):
+        self._pending_saves.discard(task)
+        tab = self._tab_for_pid(pid)
+        journal = getattr(tab, "autosave", None)
+        if journal is not None and journal.seq == task.journal_seq:
+            self._discard_autosave(tab)
+        self.show_status_message(f"Saved to {path}", "success")
+
+    def on_save_failed(self, task, path: str, message: str):
+        self._pending_saves.discard(task)
+        self.show_status_message(f"Save failed: {message}", "error", 10000)
+        QMessageBox.critical(self, "Save Failed", f"Could not save {path}:\n{message}")
+
+    # ———— Autosave ———— #
+    @Slot()
+    def _compact_autosaves(self):
+        for tab in self.tab_list:
+            journal = getattr(tab, "autosave", None)
+            if journal is not None and journal.dirty:
+                journal.compact()
 
-        saver = QSaveFile(str(p), self)
-        if not saver.open(QIODevice.WriteOnly | QIODevice.Text):
-            raise IOError(f"Cannot open {p} for writing")
+    def _tab_for_pid(self, pid: str):
+        for tab in self.tab_list:
+            if getattr(getattr(tab, "template", None), "pid", None) == pid:
+                return tab
+        return None
+
+    def _discard_autosave(self, tab):
+        journal = getattr(tab, "autosave", None)
+        if journal is not None:
+            journal.discard()
+
+    def recover_autosaves(self, pids: List[str]):
+        reply = QMessageBox.question(
+            self, "Recover Unsaved Work",
+            f"{len(pids)} template(s) were not saved before the last session ended. Recover them?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        for pid in pids:
+            data = self.autosave_writer.recover(pid) if reply == QMessageBox.Yes else None
+            self.autosave_writer.discard(pid)
+            if not data:
+                continue
+            try:
+                registry, obj = self.registry.load_with_template(data)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"[AUTOSAVE] Could not recover {pid}: {e}")
+                continue
+            self.add_new_tab(obj, loaded=[registry, obj])
 
-        saver.write(json.dumps(data, indent=2).encode("utf-8"))
-        if not saver.commit():
-            raise IOError(f"Could not commit save to {p}")
+    def closeEvent(self, event):
+        # Let in-flight saves commit before the process goes away.
+        self.save_pool.waitForDone()
+        if self.autosave_writer is not None:
+            # Unsaved journals are kept and offered for recovery on the next launch.
+            self.autosave_writer.close()
+        super().closeEvent(event)
+
+    @Slot()
+    def save_project(self):
+        templates = [tab.template for tab in self.tab_list if getattr(tab, "template", None)]
+        if not templates:
+            self.show_status_message("Nothing to save", "info")
+            return
+        path_str, _ = QFileDialog.getSaveFileName(
+            self, "Save Project", "", f"Prototypyside Projects (*{PROJECT_SUFFIX})"
+        )
+        if not path_str:
+            self.show_status_message("Save cancelled", "info")
+            return
+        try:
+            fonts = font_files(template_font_families(templates))
+            out = ProjectPackage.write(path_str, templates, fonts=fonts)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Save Project", f"Could not save project:\n{e}")
+            return
+        self.show_status_message(f"Project saved to {out}", "success")
+
+    @Slot()
+    def open_project(self, path: Path | str = None, *_):
+        if not path:
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Open Project…", "", f"Prototypyside Projects (*{PROJECT_SUFFIX})"
+            )
+            if not path:
+                return
+        if self.project_package is not None:
+            self.project_package.close()
+        package = ProjectPackage(path)
+        package.register_fonts()
+        self.project_package = package
+
+        # Component templates first so layouts that reference them find them registered.
+        pids = package.template_pids(pc.CT) + package.template_pids(pc.LT)
+        for pid in pids:
+            registry, obj = self.registry.load_with_template(package.template_data(pid))
+            # Keyed by path: components look their source up by the resolved csv_path.
+            for csv_path in package.csv_paths(pid):
+                if self.merge_manager.add_path(csv_path) is None:
+                    self.show_status_message(
+                        f"Merge source {Path(csv_path).name} could not be opened: "
+                        f"{self.merge_manager.last_errors.get(str(Path(csv_path)), '')}", "error", 10000)
+            self.add_new_tab(obj, loaded=[registry, obj])
+        self.show_status_message(f"Opened project {Path(path).name}", "success")
 
     @Slot()
     def save_current_tab_template(self):
@@ -663,7 +829,7 @@ class MainDesignerWindow(QMainWindow):
             return
 
         # Create file dialog
-        dialog = QFileDialog(self, "Import CSV for Template", "", "CSV Files (*.csv);;All Files (*)")
+        dialog = QFileDialog(self, "Import Merge Data for Template", "", SOURCE_FILTER)
         dialog.setOption(QFileDialog.DontUseNativeDialog, True)
 
         # Execute dialog
@@ -672,7 +838,15 @@ class MainDesignerWindow(QMainWindow):
 
         csv_path = ValidPath.file(dialog.selectedFiles()[0], must_exist=True)
         tmpl = active_tab.template
-        self.merge_manager.add_path(csv_path, pid=tmpl.pid)
+        self.merge_manager.last_diffs.pop(tmpl.pid, None)
+        if self.merge_manager.add_path(csv_path, pid=tmpl.pid) is None:
+            QMessageBox.warning(self, "Import Failed",
+                                f"Could not open {csv_path}:\n{self.merge_manager.last_errors.get(tmpl.pid, '')}")
+            return
+        diff = self.merge_manager.last_diffs.get(tmpl.pid)
+        if diff is not None:
+            self.show_status_message(
+                f"{len(diff.rows)} row(s) changed since the last import", "info")
         self.import_panel.set_template(active_tab.template)
      
     @Slot()
@@ -698,6 +872,7 @@ class MainDesignerWindow(QMainWindow):
         active_tab = self.tab_widget.currentWidget()
         template = active_tab.template
         em = ExportManager(self.registry, self.merge_manager)
+        em.project = self.project_package
         if pc.isproto(active_tab, pc.LTAB):
             output_path, _ = QFileDialog.getSaveFileName(
                 self,
@@ -710,7 +885,58 @@ class MainDesignerWindow(QMainWindow):
 
             if not output_path.lower().endswith(".pdf"):
                 output_path += ".pdf"
-            em.export_pdf(template, output_path)
+            text, ok = QInputDialog.getText(
+                self, "Export to PDF", "Pages (e.g. 1-3, 7; blank for all):"
+            )
+            if not ok:
+                return
+            try:
+                page_range = parse_page_range(text)
+            except ValueError as e:
+                QMessageBox.warning(self, "Export to PDF", str(e))
+                return
+            done = em.export_pdf(template, output_path, page_range=page_range,
+                                 confirm_missing=self._confirm_missing_images)
+            if done and em.pack_report is not None:
+                self.show_status_message(f"Exported {em.pack_report.summary()}", "success")
+            elif done and em.tile_plans:
+                tiles = sum(plan.count for plan in em.tile_plans)
+                self.show_status_message(
+                    f"Exported {len(em.tile_plans)} board(s) as {tiles} tile page(s)", "success")
+
+    @Slot()
+    def export_print_run(self):
+        """Impose every open layout, in tab order, into one PDF with a manifest."""
+        layouts = [self.tab_widget.widget(i).template for i in range(self.tab_widget.count())
+                   if pc.isproto(self.tab_widget.widget(i), pc.LTAB)]
+        if not layouts:
+            QMessageBox.information(self, "Export Print Run", "Open at least one layout to export a print run.")
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Print Run", "", "PDF Files (*.pdf);;All Files (*)")
+        if not output_path:
+            return
+        if not output_path.lower().endswith(".pdf"):
+            output_path += ".pdf"
+        job = ImpositionJob(self.registry, self.merge_manager)
+        for layout in layouts:
+            job.add(layout)
+        manifest = job.export(output_path)
+        self.show_status_message(
+            f"Print run: {len(manifest)} card(s) from {len(layouts)} layout(s) on "
+            f"{job.result.sheet_count} sheet(s)", "success")
+
+    def _confirm_missing_images(self, report) -> bool:
+        count = len(report.missing) + len(report.failed)
+        reply = QMessageBox.warning(
+            self,
+            "Export to PDF",
+            f"{count} image(s) could not be loaded and will be left blank:\n\n"
+            f"{report.summary()}\n\nExport anyway?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+        return reply == QMessageBox.Yes
 
     # If a layout has an older copy of the ComponentTemplate, ask if they want to update the registered ComponentTemplate
     def show_update_prompt(layout_template, original_template):
@@ -0,0 +1,153 @@
+# prototypyside/views/page_navigator.py
+from typing import List, Optional
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpinBox,
+    QScrollArea, QListWidget, QListWidgetItem, QListView)
+from PySide6.QtCore import Qt, QSize, QTimer, Signal, Slot
+from PySide6.QtGui import QPixmap, QIcon, QColor
+
+THUMB_WIDTH = 96
+
+
+class PageNavigator(QWidget):
+    """
+    Steps through merged pages of a PagePreview. The current page is rendered
+    on demand; its neighbours and the thumbnail strip are filled in one page per
+    idle tick so paging never waits on pages that are not shown.
+    """
+    page_changed = Signal(int)
+    refresh_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.preview = None
+        self._page = 0
+        self._queue: List[int] = []
+
+        self.prev_btn = QPushButton("◀", self)
+        self.next_btn = QPushButton("▶", self)
+        self.page_spin = QSpinBox(self)
+        self.page_spin.setMinimum(1)
+        self.count_label = QLabel("of 0", self)
+        self.refresh_btn = QPushButton("Refresh", self)
+
+        bar = QHBoxLayout()
+        bar.setContentsMargins(0, 0, 0, 0)
+        bar.addWidget(self.prev_btn)
+        bar.addWidget(QLabel("Page", self))
+        bar.addWidget(self.page_spin)
+        bar.addWidget(self.count_label)
+        bar.addWidget(self.next_btn)
+        bar.addStretch(1)
+        bar.addWidget(self.refresh_btn)
+
+        self.page_label = QLabel(self)
+        self.page_label.setAlignment(Qt.AlignCenter)
+        self.scroll = QScrollArea(self)
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setAlignment(Qt.AlignCenter)
+        self.scroll.setWidget(self.page_label)
+
+        self.thumbs = QListWidget(self)
+        self.thumbs.setViewMode(QListView.IconMode)
+        self.thumbs.setFlow(QListView.LeftToRight)
+        self.thumbs.setWrapping(False)
+        self.thumbs.setMovement(QListView.Static)
+        self.thumbs.setUniformItemSizes(True)
+        self.thumbs.setIconSize(QSize(THUMB_WIDTH, int(THUMB_WIDTH * 1.3)))
+        self.thumbs.setFixedHeight(int(THUMB_WIDTH * 1.3) + 40)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.addLayout(bar)
+        layout.addWidget(self.scroll, 1)
+        layout.addWidget(self.thumbs)
+
+        self._idle = QTimer(self)
+        self._idle.setSingleShot(True)
+        self._idle.setInterval(0)
+        self._idle.timeout.connect(self._work)
+
+        self.prev_btn.clicked.connect(lambda: self.show_page(self._page - 1))
+        self.next_btn.clicked.connect(lambda: self.show_page(self._page + 1))
+        self.page_spin.valueChanged.connect(lambda v: self.show_page(v - 1))
+        self.thumbs.currentRowChanged.connect(self.show_page)
+        self.refresh_btn.clicked.connect(self.refresh_requested)
+
+    # --- Public API ----------------------------------------------------------
+
+    def set_preview(self, preview) -> None:
+        """Show `preview` (a PagePreview, or None to clear) starting at its first page."""
+        self._idle.stop()
+        self.preview = preview
+        count = preview.page_count if preview else 0
+        for w in (self.page_spin, self.thumbs):
+            w.blockSignals(True)
+        self.page_spin.setMaximum(max(1, count))
+        self.count_label.setText(f"of {count}")
+        self.thumbs.clear()
+        blank = QPixmap(THUMB_WIDTH, int(THUMB_WIDTH * 1.3))
+        blank.fill(QColor(235, 235, 235))
+        for n in range(count):
+            QListWidgetItem(QIcon(blank), str(n + 1), self.thumbs)
+        for w in (self.page_spin, self.thumbs):
+            w.blockSignals(False)
+        self._page = -1
+        if count:
+            self.show_page(0)
+        else:
+            self.page_label.clear()
+
+    @Slot(int)
+    def show_page(self, page: int) -> None:
+        if self.preview is None or page == self._page:
+            return
+        count = self.preview.page_count
+        if not 0 <= page < count:
+            return
+        self._page = page
+        image = self.preview.image(page)
+        if image is not None:
+            self.page_label.setPixmap(QPixmap.fromImage(image))
+        for w, value in ((self.page_spin, page + 1), (self.thumbs, page)):
+            w.blockSignals(True)
+            if w is self.page_spin:
+                w.setValue(value)
+            else:
+                w.setCurrentRow(value)
+            w.blockSignals(False)
+        self.prev_btn.setEnabled(page > 0)
+        self.next_btn.setEnabled(page < count - 1)
+        self._schedule(page)
+        self.page_changed.emit(page)
+
+    # --- Idle work -----------------------------------------------------------
+
+    def _schedule(self, page: int) -> None:
+        """Neighbours first (so the next step is a cache hit), then thumbnails outward."""
+        count = self.preview.page_count
+        order = [page + 1, page - 1]
+        for d in range(count):
+            order.extend((page + d, page - d - 1))
+        seen = set()
+        self._queue = [p for p in order if 0 <= p < count and not (p in seen or seen.add(p))]
+        self._idle.start()
+
+    def _work(self) -> None:
+        preview = self.preview
+        if preview is None:
+            return
+        page = self._page
+        while self._queue:
+            p = self._queue.pop(0)
+            if abs(p - page) == 1 and not preview.has_image(p):
+                preview.image(p)
+            if not preview.has_thumbnail(p, THUMB_WIDTH):
+                item = self.thumbs.item(p)
+                thumb = preview.thumbnail(p, THUMB_WIDTH)
+                if item is not None and thumb is not None:
+                    item.setIcon(QIcon(QPixmap.fromImage(thumb)))
+                break
+        if self._queue:
+            self._idle.start()
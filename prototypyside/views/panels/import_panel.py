@@ -13,7 +13,7 @@ pc = ProtoClass
 
 class ImportPanel(QWidget):
     """
-    Displays CSV import/merge status for the selected component template.
+    Displays merge source status for the selected component template.
     Reacts to template changes, element edits, and MergeManager events.
     """
     def __init__(self, merge_manager, parent=None):
@@ -24,7 +24,7 @@ class ImportPanel(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(4, 4, 4, 4)
 
-        self.label = QLabel("CSV Import Sources", self)
+        self.label = QLabel("Merge Sources", self)
         self.csv_list = QListWidget(self)
         self.csv_list.setMaximumHeight(100)
 
@@ -64,12 +64,14 @@ class ImportPanel(QWidget):
         
         # Use the new, correct method to get data
         data = self.merge_manager.lookup(template)
-        
+        # Cached per template; renames update it incrementally
+        bindings = self.merge_manager.bindings.get(real)
+
         if data:
             self.csv_list.addItem(Path(getattr(data, "path", "")).name)
             
-            # The validation logic is now centralized in CSVData
-            validation = compare_template_bindings(real)
+            # The validation logic is now centralized in the merge source
+            validation = bindings.compare(data)
             
             # Sort the items for a consistent display order
             sorted_items = sorted(validation.items())
@@ -77,12 +79,11 @@ class ImportPanel(QWidget):
             for el_name, status in sorted_items:
                 self._add_field_row(el_name, status)
         else:
-            self.csv_list.addItem("No CSV loaded")
+            self.csv_list.addItem("No merge source loaded")
             # Show missing elements from the template even if no CSV is loaded
             # print(template.items)
             if template.items != []:
-                at_elements = [el.name for el in template.items if el.name.startswith("@")]
-                for el_name in sorted(at_elements):
+                for el_name in sorted(bindings.fields):
                     self._add_field_row(el_name, "missing")
 
     # --- Helpers -------------------------------------------------------------
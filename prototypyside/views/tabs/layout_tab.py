@@ -2,7 +2,7 @@
 from typing import Optional, List
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QGraphicsView, QGraphicsScene)
+    QGraphicsView, QGraphicsScene, QStackedWidget)
 from PySide6.QtCore import Qt, Signal, QRectF, QPointF, Slot, QTimer
 from PySide6.QtGui import QKeySequence, QShortcut, QUndoStack, QPainter
 
@@ -15,10 +15,13 @@ from prototypyside.widgets.unit_str_field import UnitStrField
 from prototypyside.widgets.unit_strings_field import UnitStringsField
 from prototypyside.views.layout_scene import LayoutScene
 from prototypyside.views.layout_view import LayoutView
+from prototypyside.views.page_navigator import PageNavigator
+from prototypyside.services.pagination.page_preview import PagePreview
+from prototypyside.services.export_manager import ExportManager
 from prototypyside.services.proto_registry import ProtoRegistry
 from prototypyside.services.undo_commands import (ChangePropertyCommand, 
         CloneComponentTemplateToSlotCommand, CloneComponentToEmptySlotsCommand)
-# # from prototypyside.services.pagination.page_manager import PageManager
+from prototypyside.services.pagination.page_manager import PageManager
 
 pc = ProtoClass
 
@@ -42,7 +45,7 @@ class LayoutTab(QWidget):
         self.undo_stack = QUndoStack()
         self._page_root = None
         self._page_index = 0
-        # self._page_manager = PageManager(self.registry, self.settings)
+        self._page_manager = PageManager(self.registry, self.settings)
 
         
         self._show_grid   = True
@@ -73,11 +76,21 @@ class LayoutTab(QWidget):
         # Connect signals to handler methods
         self.scene.component_dropped.connect(self.on_component_dropped)
         self.scene.selectionChanged.connect(self.on_selection_changed)
+        self.template.policyChanged.connect(lambda: self.show_page(self._page_index))
         self.update_grid()
+        self.show_page(0)
+        # Merged output, shown in place of the editor view when toggled on
+        self.preview = None
+        self.navigator = PageNavigator(self)
+        self.navigator.refresh_requested.connect(self.refresh_merged_preview)
+        self.stack = QStackedWidget(self)
+        self.stack.addWidget(self.view)
+        self.stack.addWidget(self.navigator)
+
         # --- 3. Set the simple, single layout for the tab itself ---
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.addWidget(self.view)
+        main_layout.addWidget(self.stack)
 
     def _create_right_dock(self) -> QWidget:
         """Create panel with margin and spacing controls"""
@@ -203,6 +216,27 @@ class LayoutTab(QWidget):
         old = self.template.polkey
         self.on_property_changed(template, "polkey", new, old)
 
+    def on_pagination_mode_changed(self, mode):
+        old = self.template.pagination_mode
+        if mode == old:
+            return
+        self.on_property_changed(self.template, "pagination_mode", mode, old)
+        if mode != "grid":
+            self.report_packing()
+
+    def report_packing(self):
+        """Plan the current layout's sheets (nothing is rendered) and show how many it takes."""
+        mw = self.main_window
+        em = ExportManager(mw.registry, mw.merge_manager)
+        if self.template.pagination_mode == "tiled":
+            _items, plans = em.tile(self.template)
+            tiles = sum(plan.count for plan in plans)
+            self.show_status_message(f"Tiled: {len(plans)} board(s), {tiles} page(s)", "info")
+            return plans
+        _items, result = em.pack(self.template)
+        self.show_status_message(f"Packed: {result.summary()}", "info")
+        return result
+
     def update_grid(self, rows=None, columns=None):
         """Refresh the scene grid based on template settings."""
         if rows and columns:
@@ -218,7 +252,35 @@ class LayoutTab(QWidget):
         self.scene.update()
         pass
 
+    # --- Merged Preview ---
+    @Slot(bool)
+    def show_merged_preview(self, on: bool):
+        if on:
+            self.refresh_merged_preview()
+            self.stack.setCurrentWidget(self.navigator)
+        else:
+            self.stack.setCurrentWidget(self.view)
+            self._close_preview()
+
+    @Slot()
+    def refresh_merged_preview(self):
+        """Rebuild the preview frame from the current layout and merge sources."""
+        page = max(0, self.navigator.page_spin.value() - 1)
+        self._close_preview()
+        mw = self.main_window
+        self.preview = PagePreview(self.template, mw.registry, mw.merge_manager)
+        self.navigator.set_preview(self.preview)
+        self.navigator.show_page(min(page, self.preview.page_count - 1))
+        self.show_status_message(f"Merged preview: {self.preview.page_count} page(s)", "info")
+
+    def _close_preview(self):
+        if self.preview is not None:
+            self.navigator.set_preview(None)
+            self.preview.close()
+            self.preview = None
+
     def cleanup(self):
+        self._close_preview()
         self.scene.clear()  # Clears all graphics items
         self.template = None  # Drop reference to ComponentTemplate
         
@@ -354,6 +416,13 @@ class LayoutTab(QWidget):
         rect_px = self.template.geometry.to("px", dpi=self.settings.dpi).rect
         self.scene.setSceneRect(rect_px)
 
+    def show_page(self, page_index: int = 0):
+        """Show the editor's page as a descriptor would place it (slot rotations, duplex backs)."""
+        page = self._page_manager.build_page(self.template, page_index)
+        self._page_manager.apply(self.template, page)
+        self._page_index = page_index
+        return page
+
     # def _remount_page(self):
     #     if self._page_root:
     #         self._page_manager.unmount(self.scene, self._page_root)
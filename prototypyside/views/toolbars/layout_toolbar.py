@@ -1,6 +1,7 @@
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QLabel, QCheckBox
-from PySide6.QtCore import Slot
-from prototypyside.services.pagination.page_manager import PRINT_POLICIES
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QLabel, QCheckBox, QToolButton, QMenu
+from PySide6.QtCore import Qt, Slot
+from shiboken6 import isValid
+from prototypyside.services.pagination.print_policy import PAGINATION_MODES, POLICIES
 from prototypyside.config import VALID_MEASURES
 
 class LayoutToolbar(QWidget):
@@ -20,10 +21,42 @@ class LayoutToolbar(QWidget):
         for u in VALID_MEASURES:
             self.unit_selector.addItem(u, u)
         self.grid_checkbox = QCheckBox(parent=self)
+        self.preview_checkbox = QCheckBox(parent=self)
+        self.preview_checkbox.setToolTip("Page through the merged output")
         self.policy_combo_box = QComboBox(parent=self)
         self.policy_combo_box.setToolTip("Pagination mode")
-        for name in PRINT_POLICIES:
+        for name in POLICIES:
             self.policy_combo_box.addItem(name, name)
+            policy, geo = POLICIES[name], POLICIES.geometry(name, 72)   # 72 dpi: points
+            self.policy_combo_box.setItemData(
+                self.policy_combo_box.count() - 1,
+                f"{policy.rows} x {policy.columns} slots, {geo.cell[0] / 72:.2f}\" x {geo.cell[1] / 72:.2f}\" each",
+                Qt.ToolTipRole)
+        self.mode_combo_box = QComboBox(parent=self)
+        self.mode_combo_box.setToolTip("Grid: one card per slot. Packed: fit mixed sizes onto the fewest sheets. "
+                                       "Hex: close-pack round and hexagonal tokens. "
+                                       "Tiled: split oversized boards over overlapping pages")
+        for mode in PAGINATION_MODES:
+            self.mode_combo_box.addItem(mode.capitalize(), mode)
+        self.back_combo_box = QComboBox(parent=self)
+        self.back_combo_box.setToolTip("Component printed on the back of every card (duplex)")
+        self.flip_combo_box = QComboBox(parent=self)
+        self.flip_combo_box.setToolTip("Edge the printer flips the sheet on")
+        self.flip_combo_box.addItem("Long edge", "long")
+        self.flip_combo_box.addItem("Short edge", "short")
+        self.marks_button = QToolButton(parent=self)
+        self.marks_button.setText("Marks")
+        self.marks_button.setToolTip("Marks added to exported sheets")
+        self.marks_button.setPopupMode(QToolButton.InstantPopup)
+        marks_menu = QMenu(self.marks_button)
+        self.mark_actions = {}
+        for prop, label in (("crop_marks", "Crop Marks"), ("cut_lines", "Cut Lines"),
+                            ("registration_marks", "Registration Marks")):
+            action = marks_menu.addAction(label)
+            action.setCheckable(True)
+            action.toggled.connect(lambda on, prop=prop: self._mark_toggled(prop, on))
+            self.mark_actions[prop] = action
+        self.marks_button.setMenu(marks_menu)
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -34,11 +67,28 @@ class LayoutToolbar(QWidget):
         layout.addWidget(self.grid_checkbox)
         layout.addWidget(QLabel("Policy:"))
         layout.addWidget(self.policy_combo_box)
+        layout.addWidget(QLabel("Mode:"))
+        layout.addWidget(self.mode_combo_box)
+        layout.addWidget(QLabel("Backs:"))
+        layout.addWidget(self.back_combo_box)
+        layout.addWidget(self.flip_combo_box)
+        layout.addWidget(self.marks_button)
+        layout.addWidget(QLabel("Merged Preview:"))
+        layout.addWidget(self.preview_checkbox)
 
         # Signals
         self.unit_selector.currentTextChanged.connect(self._unit_changed)
         self.grid_checkbox.toggled.connect(self._grid_toggled)
         self.policy_combo_box.currentTextChanged.connect(self._policy_changed)
+        self.mode_combo_box.currentIndexChanged.connect(self._mode_changed)
+        self.back_combo_box.currentIndexChanged.connect(self._back_changed)
+        self.flip_combo_box.currentIndexChanged.connect(self._flip_changed)
+        root = self.tab.main_window.registry
+        root.object_registered.connect(self._refresh_backs)
+        root.object_deregistered.connect(self._refresh_backs)
+        self.preview_checkbox.toggled.connect(self.tab.show_merged_preview)
+        # Policies may carry their own mode (e.g. token sheets default to hex).
+        self.template.policyChanged.connect(self._sync_mode)
 
         self.set_initial_values()
 
@@ -47,6 +97,7 @@ class LayoutToolbar(QWidget):
         u_block = self.unit_selector.blockSignals(True)
         p_block = self.policy_combo_box.blockSignals(True)
         g_block = self.grid_checkbox.blockSignals(True)
+        m_block = self.mode_combo_box.blockSignals(True)
 
         # all units in the list are guaranteed to exist.
         unit = self.tab.settings.display_unit
@@ -57,11 +108,16 @@ class LayoutToolbar(QWidget):
 
         policy = self.tab.template.polkey
         self.policy_combo_box.setCurrentText(policy)
+        self.mode_combo_box.setCurrentIndex(
+            max(0, self.mode_combo_box.findData(self.tab.template.pagination_mode)))
+        self._refresh_backs()
+        self._sync_marks()
 
         # Restore signal delivery
         self.unit_selector.blockSignals(u_block)
         self.policy_combo_box.blockSignals(p_block)
         self.grid_checkbox.blockSignals(g_block)
+        self.mode_combo_box.blockSignals(m_block)
 
     @Slot(bool)
     def _grid_toggled(self, state: bool):
@@ -74,3 +130,53 @@ class LayoutToolbar(QWidget):
     @Slot(str)
     def _policy_changed(self, policy):
         self.tab.on_policy_changed(policy)
+
+    @Slot(int)
+    def _mode_changed(self, index):
+        self.tab.on_pagination_mode_changed(self.mode_combo_box.itemData(index))
+
+    @Slot()
+    def _sync_mode(self):
+        block = self.mode_combo_box.blockSignals(True)
+        self.mode_combo_box.setCurrentIndex(max(0, self.mode_combo_box.findData(self.template.pagination_mode)))
+        self.mode_combo_box.blockSignals(block)
+        self._refresh_backs()
+        self._sync_marks()
+
+    def _sync_marks(self):
+        for prop, action in self.mark_actions.items():
+            block = action.blockSignals(True)
+            action.setChecked(bool(getattr(self.template, prop)))
+            action.blockSignals(block)
+
+    def _mark_toggled(self, prop, on):
+        self.tab.on_property_changed(self.template, prop, on, getattr(self.template, prop))
+
+    @Slot()
+    def _refresh_backs(self, pid=None):
+        if isinstance(pid, str) and not pid.lower().startswith("ct_"):
+            return  # only component templates can be backs
+        block = self.back_combo_box.blockSignals(True)
+        f_block = self.flip_combo_box.blockSignals(True)
+        self.back_combo_box.clear()
+        self.back_combo_box.addItem("None", None)
+        seen = set()
+        for obj in self.tab.main_window.registry.global_get_by_prefix("ct"):
+            if isValid(obj) and obj.pid not in seen:
+                seen.add(obj.pid)
+                self.back_combo_box.addItem(obj.name, obj.pid)
+        self.back_combo_box.setCurrentIndex(max(0, self.back_combo_box.findData(self.template.back_pid)))
+        self.flip_combo_box.setCurrentIndex(max(0, self.flip_combo_box.findData(self.template.flip_edge)))
+        self.flip_combo_box.setEnabled(self.template.back_pid is not None)
+        self.back_combo_box.blockSignals(block)
+        self.flip_combo_box.blockSignals(f_block)
+
+    @Slot(int)
+    def _back_changed(self, index):
+        self.tab.on_property_changed(self.template, "back_pid", self.back_combo_box.itemData(index),
+                                     self.template.back_pid)
+
+    @Slot(int)
+    def _flip_changed(self, index):
+        self.tab.on_property_changed(self.template, "flip_edge", self.flip_combo_box.itemData(index),
+                                     self.template.flip_edge)